@@ -1,9 +1,10 @@
 import streamlit as st
 import re
 import pandas as pd
-from src.orcid_data import fetch_orcid_data, format_timestamp
-from src.references_matching import extract_and_process_references, prepare_orcid_works, match_references_to_orcid
+from src.orcid_data import fetch_orcid_data_many, format_timestamp
+from src.references_matching import iter_extract_and_process_references, iter_scored_references, iter_openalex_candidates, prepare_orcid_works, score_references, partition_matches, content_hash, warm_up_ner_models
 import importlib.util
+import time
 # TODO: Use gettext for localization
 # The user locale is available at st.context.locale
 
@@ -11,6 +12,18 @@ def reset_session_state():
     for key in list(st.session_state.keys()):
         st.session_state.pop(key)
 
+# Load the reference extraction models once per server process, shared by all sessions and reruns
+@st.cache_resource(show_spinner="Chargement du modèle d'extraction des références...")
+def load_reference_models():
+    warm_up_ner_models()
+    return True
+
+# Minimum delay in seconds between two refreshes of the live results while references are extracted
+LIVE_RESULTS_INTERVAL = 0.5
+
+# Scoring engine used to match references with ORCID works, see match_references_to_orcid
+MATCH_ENGINE = "cdist"
+
 st.set_page_config(page_title="Boîte à outils ORCID", page_icon=":toolbox:", layout="wide", initial_sidebar_state="expanded")
 
 with st.sidebar:
@@ -117,8 +130,9 @@ if "orcid_list" not in st.session_state:
                 st.error(f"Format d'ORCID incorrect pour: {', '.join(invalid_orcids)}. Le format doit être XXXX-XXXX-XXXX-XXXX.")
                 st.stop()
             
-            # Store in session state once validated
+            # Store in session state once validated, giving the profiles that failed to load another try
             st.session_state.orcid_list = orcid_list
+            st.session_state.pop('orcid_errors', None)
             st.rerun()
         
         st.stop()
@@ -129,65 +143,107 @@ orcid_list = st.session_state.orcid_list
 # Initialize storage for ORCID data if not exists
 if 'orcid_data' not in st.session_state:
     st.session_state.orcid_data = {}
-
-# Process each ORCID and store data
-progress_text = "Récupération des données ORCID..."
-multifile_progress = st.progress(0, text=progress_text)
-for idx, orcid_input in enumerate(orcid_list):     
-    # Skip if already loaded
-    if orcid_input not in st.session_state.orcid_data:
-        with st.spinner(f'Chargement de {orcid_input}...'):
-            df, raw, orcid_output, person_name = fetch_orcid_data(orcid_input)
-            works_count = len(df)
-
-            summary_works = {
-                "count": works_count,
-                "last_modified": format_timestamp(raw.get('activities-summary', {}).get('works', {}). get('last-modified-date', {}).get('value'),True)
-                } if raw.get('activities-summary', {}).get('works', {}).get('last-modified-date') else None
-        
-            summary_employments = {
-                "count": raw.get('activities-summary', {}).get('employments').get('affiliation-group', []).__len__(),
-                "last_modified": format_timestamp(raw.get('activities-summary', {}).get('employments', {}). get('last-modified-date', {}).get('value'))
-                } if raw.get('activities-summary', {}).get('employments', {}).get('last-modified-date') else None
-            
-            summary_educations = {
-                "count": raw.get('activities-summary', {}).get('educations').get('affiliation-group', []).__len__(),
-                "last_modified": format_timestamp(raw.get('activities-summary', {}).get('educations', {}). get('last-modified-date', {}).get('value'))
-                } if raw.get('activities-summary', {}).get('educations', {}).get('last-modified-date') else None
-            
-            summary_fundings = {
-                "count": raw.get('activities-summary', {}).get('fundings').get('affiliation-group', []).__len__(),
-                "last_modified": format_timestamp(raw.get('activities-summary', {}).get('fundings', {}). get('last-modified-date', {}).get('value'),True)
-                } if raw.get('activities-summary', {}).get('fundings', {}).get('last-modified-date') else None
-            
-            try:
-                updated_person = raw.get('person', {}).get('last-modified-date', {}).get('value')
-            except Exception:
-                updated_person = None
-
-            # Store data in session state
-            st.session_state.orcid_data[orcid_input] = {
-                'df': df,
-                'raw': raw,
-                'person_name': person_name,
-                'works_count': works_count,
-                'summary_works': summary_works,
-                'summary_employments': summary_employments,
-                'summary_educations': summary_educations,
-                'summary_fundings': summary_fundings,
-                'updated_person': updated_person
-            }
-            multifile_progress.progress((idx + 1) / len(orcid_list), text=progress_text + f" ({idx + 1}/{len(orcid_list)})")
+# Error message of each ORCID that could not be loaded, so that it is not fetched again on every rerun
+if 'orcid_errors' not in st.session_state:
+    st.session_state.orcid_errors = {}
+
+# Summarize the sections of an ORCID record shown in the summary tab
+def summarize_orcid_record(df, raw, person_name):
+    works_count = len(df)
+
+    summary_works = {
+        "count": works_count,
+        "last_modified": format_timestamp(raw.get('activities-summary', {}).get('works', {}). get('last-modified-date', {}).get('value'),True)
+        } if raw.get('activities-summary', {}).get('works', {}).get('last-modified-date') else None
+
+    summary_employments = {
+        "count": raw.get('activities-summary', {}).get('employments').get('affiliation-group', []).__len__(),
+        "last_modified": format_timestamp(raw.get('activities-summary', {}).get('employments', {}). get('last-modified-date', {}).get('value'))
+        } if raw.get('activities-summary', {}).get('employments', {}).get('last-modified-date') else None
+    
+    summary_educations = {
+        "count": raw.get('activities-summary', {}).get('educations').get('affiliation-group', []).__len__(),
+        "last_modified": format_timestamp(raw.get('activities-summary', {}).get('educations', {}). get('last-modified-date', {}).get('value'))
+        } if raw.get('activities-summary', {}).get('educations', {}).get('last-modified-date') else None
     
-    # Show status in sidebar
-    if st.session_state.orcid_data[orcid_input]['works_count'] > 0:
+    summary_fundings = {
+        "count": raw.get('activities-summary', {}).get('fundings').get('affiliation-group', []).__len__(),
+        "last_modified": format_timestamp(raw.get('activities-summary', {}).get('fundings', {}). get('last-modified-date', {}).get('value'),True)
+        } if raw.get('activities-summary', {}).get('fundings', {}).get('last-modified-date') else None
+    
+    try:
+        updated_person = raw.get('person', {}).get('last-modified-date', {}).get('value')
+    except Exception:
+        updated_person = None
+
+    return {
+        'df': df,
+        'raw': raw,
+        'person_name': person_name,
+        'works_count': works_count,
+        'summary_works': summary_works,
+        'summary_employments': summary_employments,
+        'summary_educations': summary_educations,
+        'summary_fundings': summary_fundings,
+        'updated_person': updated_person
+    }
+
+# Show the loading status of an ORCID in the sidebar
+def show_orcid_status(orcid_id):
+    if st.session_state.orcid_data[orcid_id]['works_count'] > 0:
         with st.sidebar:
-            st.success(f"Données ORCID OK {orcid_input}")
+            st.success(f"Données ORCID OK {orcid_id}")
     else:
         with st.sidebar:
-            st.info(f"Profil ORCID chargé {orcid_input} (0 travaux)")
+            st.info(f"Profil ORCID chargé {orcid_id} (0 travaux)")
+
+# Process each ORCID and store data
+progress_text = "Récupération des données ORCID..."
+multifile_progress = st.progress(0, text=progress_text)
+
+# Show the error of an ORCID that could not be loaded in the sidebar
+def show_orcid_error(orcid_id):
+    with st.sidebar:
+        st.error(f"Impossible de charger le profil ORCID {orcid_id}" + st.session_state.orcid_errors[orcid_id])
+
+# Profiles already loaded, or that failed to load, in a previous run are skipped
+pending_orcids = [
+    orcid_id for orcid_id in orcid_list
+    if orcid_id not in st.session_state.orcid_data and orcid_id not in st.session_state.orcid_errors
+]
+loaded_count = len(orcid_list) - len(pending_orcids)
+failed_orcids = []
+for orcid_id in orcid_list:
+    if orcid_id in st.session_state.orcid_data:
+        show_orcid_status(orcid_id)
+    elif orcid_id in st.session_state.orcid_errors:
+        failed_orcids.append(orcid_id)
+        show_orcid_error(orcid_id)
+
+# Fetch the remaining profiles concurrently, storing each one as soon as it arrives
+if pending_orcids:
+    with st.spinner(f'Chargement de {len(pending_orcids)} profil(s) ORCID...'):
+        for orcid_id, result, error in fetch_orcid_data_many(pending_orcids, incremental=True):
+            loaded_count += 1
+            if error is None and result[1] is not None:
+                df, raw, orcid_output, person_name = result
+                # Store data in session state
+                st.session_state.orcid_data[orcid_id] = summarize_orcid_record(df, raw, person_name)
+                show_orcid_status(orcid_id)
+            else:
+                failed_orcids.append(orcid_id)
+                st.session_state.orcid_errors[orcid_id] = f" : {error}" if error else " (profil introuvable)"
+                show_orcid_error(orcid_id)
+            multifile_progress.progress(loaded_count / len(orcid_list), text=progress_text + f" ({loaded_count}/{len(orcid_list)})")
 
 multifile_progress.empty()
+
+# Only keep the profiles that could be loaded
+orcid_list = [orcid_id for orcid_id in orcid_list if orcid_id in st.session_state.orcid_data]
+if not orcid_list:
+    st.error("Aucun profil ORCID n'a pu être chargé.")
+    st.stop()
+
 # For backward compatibility with single ORCID code
 if len(orcid_list) == 1:
     orcid_input = orcid_list[0]
@@ -370,6 +426,9 @@ with tab_compare:
         st.warning("Cette fonctionalité nécessite la présence d'une bibliothèque pour l'extraction des références, telle que 'transformers' ou 'references_tractor'. Veuillez installer au moins l'une de ces bibliothèques.")
         st.stop()
 
+    # Pre-warm the extraction models so the first comparison is fast
+    load_reference_models()
+
     col_file, col_controls = st.columns(2)
 
     with col_file:
@@ -382,22 +441,7 @@ with tab_compare:
         
         if refs_file:
             source_refs = refs_file.read().decode("utf-8")
-            
-            # Create progress bar for reference extraction
-            extraction_progress = st.progress(0, text="Extraction des références en cours...")
-            
-            def update_progress(current, total):
-                progress_value = current / total if total > 0 else 0
-                extraction_progress.progress(progress_value, text=f"Traitement des références... ({current}/{total})")
-            
-            # Extract and process references
-            screened_refs, invalid_refs = extract_and_process_references(source_refs, progress_callback=update_progress)
-            
-            # Clear progress bar when done
-            extraction_progress.empty()
-
-            with st.sidebar:
-                st.success(f"{len(screened_refs)} références valides extraites, {len(invalid_refs)} références invalides ignorées.")
+            source_hash = content_hash(source_refs)
 
     with col_controls:
         
@@ -408,9 +452,88 @@ with tab_compare:
             # Configure matching thresholds
             confidence_interval = st.slider("Seuil de confiance (%)", 50, 100, (60, 90), 1)
             
-            # Prepare ORCID works and match references
-            orcid_works = prepare_orcid_works(df)
-            matched_refs, unmatched_refs = match_references_to_orcid(screened_refs, orcid_works, confidence_interval[1])
+            # Prepare ORCID works once per loaded profile
+            orcid_record = st.session_state.orcid_data[orcid_input]
+            if 'orcid_works' not in orcid_record:
+                orcid_record['orcid_works'] = prepare_orcid_works(df)
+                orcid_record['orcid_works_hash'] = content_hash(orcid_record['orcid_works'])
+
+    with col_file:
+
+        if refs_file:
+            # References are only extracted again when the uploaded text changes, not on every rerun.
+            # They flow through extraction and matching as a stream, and are listed as soon as they are scored.
+            if st.session_state.get('extracted_refs', {}).get('source_hash') != source_hash:
+                extraction_status = st.empty()
+                live_results = st.empty()
+                screened_refs = []
+                invalid_refs = []
+                scored_refs = []
+
+                # Keep the extracted references on their way to the matching stage
+                def collect_refs(refs):
+                    for ref in refs:
+                        screened_refs.append(ref)
+                        yield ref
+
+                def show_live_results():
+                    extraction_status.caption(f"Traitement des références... ({len(screened_refs)} extraites, {len(scored_refs)} comparées)")
+                    live_results.dataframe([{
+                        "N°": ref['ref_number'],
+                        "Référence": ref['ref_orig_title'],
+                        "Travail ORCID": ref['orcid_title'],
+                        "Confiance": round(ref['confidence']),
+                        "Statut": "✅" if ref['confidence'] > 0 and ref['confidence'] >= confidence_interval[1] else "⚠️" if ref['confidence'] >= confidence_interval[0] else "❌"
+                    } for ref in scored_refs], hide_index=True)
+
+                # Extract, process and match references, counting the references of this text served by the NER cache
+                ner_counts = {'hits': 0, 'misses': 0}
+                extracted = collect_refs(iter_extract_and_process_references(source_refs, invalid_refs=invalid_refs, ner_counts=ner_counts))
+                last_update = time.monotonic()
+                for scored_ref in iter_scored_references(extracted, orcid_record['orcid_works'], engine=MATCH_ENGINE):
+                    scored_refs.append(scored_ref)
+                    if time.monotonic() - last_update >= LIVE_RESULTS_INTERVAL:
+                        show_live_results()
+                        last_update = time.monotonic()
+                refs_hash = content_hash(screened_refs)
+                st.session_state.extracted_refs = {
+                    'source_hash': source_hash,
+                    'refs_hash': refs_hash,
+                    'screened_refs': screened_refs,
+                    'invalid_refs': invalid_refs,
+                    # Best ORCID match of each reference, by (references hash, prepared works hash, engine)
+                    'scores': {(refs_hash, orcid_record['orcid_works_hash'], MATCH_ENGINE): scored_refs},
+                    'ner_cache_hits': ner_counts['hits'],
+                    'ner_cache_misses': ner_counts['misses']
+                }
+                
+                # Clear the live results when done, the full results are shown below
+                extraction_status.empty()
+                live_results.empty()
+
+            screened_refs = st.session_state.extracted_refs['screened_refs']
+            invalid_refs = st.session_state.extracted_refs['invalid_refs']
+
+            with st.sidebar:
+                st.success(f"{len(screened_refs)} références valides extraites, {len(invalid_refs)} références invalides ignorées.")
+                rules_count = sum(1 for ref in screened_refs if ref.get('extraction') == 'rules')
+                st.caption(f"Extraction : {rules_count} référence(s) analysée(s) par règles, "
+                           f"{st.session_state.extracted_refs['ner_cache_hits']} déjà connue(s) du cache, "
+                           f"{st.session_state.extracted_refs['ner_cache_misses']} analysée(s) par le modèle.")
+
+    with col_controls:
+        
+        if refs_file:
+            # Match references: scores are kept in session state by content hash of the references and of the works,
+            # so moving the confidence slider only partitions them again, and they are computed again
+            # if the works of the profile changed since the references were extracted
+            extracted_refs = st.session_state.extracted_refs
+            score_key = (extracted_refs['refs_hash'], orcid_record['orcid_works_hash'], MATCH_ENGINE)
+            if score_key not in extracted_refs['scores']:
+                with st.spinner("Comparaison avec les travaux ORCID..."):
+                    extracted_refs['scores'][score_key] = score_references(screened_refs, orcid_record['orcid_works'], engine=MATCH_ENGINE)
+            scored_refs = extracted_refs['scores'][score_key]
+            matched_refs, unmatched_refs = partition_matches(scored_refs, confidence_interval[1])
             
             # Display statistics
             col_a, col_b, col_c = st.columns(3)
@@ -521,4 +644,48 @@ with tab_compare:
             
 
 with tab_suggest:
-    st.warning("Cette section n'est pas encore implémentée.")
+    if not unmatched_refs:
+        st.info("Téléversez une liste de références dans l'onglet 'Comparateur' pour obtenir des suggestions de travaux à ajouter au profil ORCID.")
+    else:
+        # OpenAlex candidates of the references missing from ORCID, kept across reruns for the uploaded file:
+        # changing the confidence threshold only looks up the references that were not looked up yet,
+        # or whose lookup failed
+        suggestions = st.session_state.get('openalex_suggestions')
+        if not suggestions or suggestions['source_hash'] != source_hash:
+            suggestions = st.session_state.openalex_suggestions = {'source_hash': source_hash, 'candidates': {}}
+        candidates = suggestions['candidates']
+        pending_refs = [
+            ref for ref in unmatched_refs
+            if ref['ref_number'] not in candidates or candidates[ref['ref_number']]['openalex_error']
+        ]
+
+        st.subheader("Travaux à ajouter à ORCID")
+        st.markdown(f"{len(unmatched_refs)} références n'ont pas été trouvées dans ORCID. Elles peuvent être recherchées dans [OpenAlex](https://openalex.org) pour proposer les travaux correspondants.")
+        if pending_refs and st.button(f"Rechercher {len(pending_refs)} référence(s) dans OpenAlex", type="primary"):
+            progress = st.progress(0.0, text="Recherche dans OpenAlex...")
+            for i, ref in enumerate(iter_openalex_candidates(pending_refs), 1):
+                candidates[ref['ref_number']] = ref
+                progress.progress(i / len(pending_refs), text=f"Recherche dans OpenAlex... ({i}/{len(pending_refs)})")
+            progress.empty()
+
+        looked_up = [candidates[ref['ref_number']] for ref in unmatched_refs if ref['ref_number'] in candidates]
+        found = sorted((ref for ref in looked_up if ref['openalex']), key=lambda ref: ref['openalex']['confidence'], reverse=True)
+        failed = [ref for ref in looked_up if ref['openalex_error']]
+        if looked_up:
+            st.caption(f"{len(found)} travaux trouvés dans OpenAlex pour {len(looked_up)} références recherchées.")
+        if failed:
+            st.warning(f"La recherche a échoué pour {len(failed)} référence(s), relancez-la plus tard avec le bouton ci-dessus.")
+        if found:
+            st.dataframe([{
+                "N°": ref['ref_number'],
+                "Référence": ref['ref_orig_title'],
+                "Travail OpenAlex": ref['openalex']['title'],
+                "Année": ref['openalex']['year'],
+                "Revue": ref['openalex']['journal'],
+                "Auteurs": ", ".join(author for author in ref['openalex']['authors'] if author),
+                "DOI": f"https://doi.org/{ref['openalex']['doi']}" if ref['openalex']['doi'] else None,
+                "Confiance": round(ref['openalex']['confidence'])
+            } for ref in found], column_config={
+                "DOI": st.column_config.LinkColumn("DOI", display_text="https://doi.org/(.*)"),
+                "Confiance": st.column_config.ProgressColumn("Confiance", min_value=0, max_value=100, format="%d%%")
+            }, hide_index=True)
@@ -0,0 +1,144 @@
+# Load test of the ORCID and OpenAlex clients of the app against the mock server of benchmarks/mock_server.py
+# (started in a child process, so that it does not compete with the clients for the GIL, or already running with --url).
+# - orcid: fetches --profiles distinct ORCID records with fetch_orcid_data in --concurrency threads (as
+#   fetch_orcid_data_many does), through a dedicated ORCIDClient;
+# - openalex: runs --lookups title lookups with get_openalex_data in --concurrency threads.
+# With --cache, each scenario runs twice with the persistent caches in a temporary directory, cold then warm.
+# Reports the throughput, the p50/p95/p99 latencies of each operation (retries and backoff included), the failed
+# operations, and the requests and 429/5xx responses served by the mock server.
+#
+# Run from the repository root:
+#   python -m benchmarks.load_test [--target orcid,openalex] [--profiles 200] [--lookups 500] [--concurrency 8]
+#       [--record-size 100] [--latency 0.05] [--jitter 0.02] [--error-rate 0.02] [--burst-every 5 --burst-duration 0.5] [--cache]
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+import requests
+from src import disk_cache, openalex_data
+from src.disk_cache import DiskCache
+from src.http_utils import RateLimiter
+from src.orcid_data import ORCIDClient, fetch_orcid_data
+from benchmarks.ner_backends import percentile
+
+
+# Start the mock server in a child process, returning the process and the base URL it serves
+def start_mock_server(args) -> Tuple[subprocess.Popen, str]:
+    command = [
+        sys.executable, "-m", "benchmarks.mock_server", "--port", "0",
+        "--record-size", str(args.record_size), "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate), "--burst-every", str(args.burst_every), "--burst-duration", str(args.burst_duration),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Serving on "):
+        process.kill()
+        raise SystemExit("The mock server did not start")
+    return process, line[len("Serving on "):].strip()
+
+
+# Row of the report for a run of operations: wall time, latency of each successful operation, number of failures,
+# and the requests served by the mock server since the previous row
+def report(label: str, elapsed: float, latencies: List[float], failures: int, base_url: str) -> None:
+    count = len(latencies) + failures
+    line = f"{label:<18} {count:>6} {count / elapsed:>9.1f}"
+    if latencies:
+        line += "".join(f" {percentile(latencies, q) * 1000:>8.1f}" for q in (0.5, 0.95, 0.99))
+    else:
+        line += f" {'-':>8} {'-':>8} {'-':>8}"
+    line += f" {failures:>7}"
+    stats = requests.get(f"{base_url}/_stats", params={"reset": "1"}, timeout=10).json()
+    statuses = {int(status): n for status, n in stats["statuses"].items()}
+    line += f" {stats['requests']:>9} {statuses.get(429, 0):>6} {sum(n for status, n in statuses.items() if status >= 500):>6}"
+    print(line)
+
+
+# Run operations in threads, returning the wall time, the latencies of the successful ones and the number of failures
+def run_threads(operation: Callable[[Any], Any], values: List[Any], concurrency: int) -> Tuple[float, List[float], int]:
+    def timed(value):
+        started = time.perf_counter()
+        try:
+            operation(value)
+        except Exception:
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, values))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for latency in results if latency is not None]
+    return elapsed, latencies, len(results) - len(latencies)
+
+
+def orcid_scenario(args, base_url: str, cache: Optional[DiskCache]) -> Tuple[float, List[float], int]:
+    orcids = [f"0000-0000-{i // 10000:04d}-{i % 10000:04d}" for i in range(args.profiles)]
+    client = ORCIDClient(
+        base_url=base_url,
+        rate_limiter=RateLimiter(args.rate_limit, args.rate_limit) if args.rate_limit else RateLimiter(1e6, 1000000),
+        pool_size=args.concurrency * 2,
+        cache=cache,
+        max_backoff=5.0,
+    )
+    return run_threads(lambda orcid: fetch_orcid_data(orcid, client=client), orcids, args.concurrency)
+
+
+def openalex_scenario(args, use_cache: bool) -> Tuple[float, List[float], int]:
+    titles = [f"Synthetic title number {i}" for i in range(args.lookups)]
+    return run_threads(lambda title: openalex_data.get_openalex_data(title=title, use_cache=use_cache), titles, args.concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="Base URL of an already running mock server, instead of starting one")
+    parser.add_argument("--target", default="orcid,openalex", help="Comma-separated list of scenarios: orcid, openalex")
+    parser.add_argument("--profiles", type=int, default=200, help="Number of ORCID records fetched")
+    parser.add_argument("--lookups", type=int, default=500, help="Number of OpenAlex title lookups")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of operations in flight at once")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Requests per second allowed by the clients (0: no limit)")
+    parser.add_argument("--cache", action="store_true", help="Run each scenario twice with the persistent caches, cold then warm")
+    # Settings of the mock server started by this process
+    parser.add_argument("--record-size", type=int, default=100, help="Number of works of each ORCID record")
+    parser.add_argument("--latency", type=float, default=0.05, help="Delay before each response, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Maximum random delay added to the latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="Period of the bursts of 429 responses, in seconds")
+    parser.add_argument("--burst-duration", type=float, default=0.0, help="Duration of each burst of 429 responses, in seconds")
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        process, base_url = start_mock_server(args)
+    # Keep the caches filled by the mock server away from the real ones
+    disk_cache.CACHE_DIR = tempfile.mkdtemp(prefix="load-test-")
+    openalex_data.OPENALEX_API_URL = base_url
+    openalex_data.OPENALEX_RATE_LIMIT = openalex_data.OPENALEX_RATE_BURST = args.rate_limit or 1000000
+
+    print(f"Mock server at {base_url}, concurrency {args.concurrency}")
+    print(f"{'scenario':<18} {'ops':>6} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'failed':>7} {'requests':>9} {'429':>6} {'5xx':>6}")
+    requests.get(f"{base_url}/_stats", params={"reset": "1"}, timeout=10)
+    runs = [("cold", True), ("warm", True)] if args.cache else [("", False)]
+    for target in args.target.split(","):
+        orcid_cache = DiskCache(disk_cache.default_cache_path("orcid_records")) if args.cache else None
+        for run_label, use_cache in runs:
+            label = f"{target} {run_label}".strip()
+            if target == "orcid":
+                elapsed, latencies, failures = orcid_scenario(args, f"{base_url}/v3.0", orcid_cache)
+            elif target == "openalex":
+                elapsed, latencies, failures = openalex_scenario(args, use_cache)
+            else:
+                raise SystemExit(f"Unknown scenario '{target}'")
+            report(label, elapsed, latencies, failures, base_url)
+    if process is not None:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Benchmark of match_references_to_orcid in src/references_matching.py on synthetic profiles and references.
+# Compares the exhaustive loop engine with the vectorized cdist engine at several sizes, and reports how often the
+# cdist engine finds the same best match as the loop engine, among the references whose best match scores at least
+# --recall-floor (the lowest threshold offered by the app).
+#
+# Run from the repository root:
+#   python -m benchmarks.matching [--sizes 200x100,2000x600]
+
+import argparse
+import time
+from src.orcid_data import parse_orcid_record
+from src.references_matching import match_references_to_orcid, prepare_orcid_works
+from benchmarks.synthetic import synth_orcid_record, synth_references
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+# Best match per reference number, from the matched and unmatched lists
+def best_matches(result):
+    matched, unmatched = result
+    return {entry["ref_number"]: (entry["orcid_title"], round(entry["confidence"], 6)) for entry in matched + unmatched}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="200x100,1000x300,2000x600", help="Comma-separated list of WORKSxREFERENCES")
+    parser.add_argument("--min-confidence", type=float, default=70.0)
+    parser.add_argument("--recall-floor", type=float, default=50.0)
+    args = parser.parse_args()
+
+    print(f"{'works':>6} {'refs':>5} {'mode':<12} {'time (s)':>9} {'recall':>10} {'matched':>8}")
+    for size in args.sizes.split(","):
+        works_count, refs_count = (int(n) for n in size.split("x"))
+        record = synth_orcid_record("0000-0000-0000-0000", works=works_count)
+        df, _ = parse_orcid_record(record)
+        orcid_works = prepare_orcid_works(df)
+        refs = synth_references(record, refs_count)
+
+        exhaustive, exhaustive_time = timed(match_references_to_orcid, refs, orcid_works, args.min_confidence)
+        expected = best_matches(exhaustive)
+        print(f"{works_count:>6} {refs_count:>5} {'exhaustive':<12} {exhaustive_time:>9.2f} {'':>10} {len(exhaustive[0]):>8}")
+
+        relevant = {number: match for number, match in expected.items() if match[1] >= args.recall_floor}
+        modes = [("cdist", {"engine": "cdist"})]
+        for label, options in modes:
+            result, elapsed = timed(match_references_to_orcid, refs, orcid_works, args.min_confidence, **options)
+            actual = best_matches(result)
+            same = sum(1 for number, match in relevant.items() if actual.get(number) == match) / max(1, len(relevant))
+            print(f"{'':>6} {'':>5} {label:<12} {elapsed:>9.2f} {same:>10.1%} {len(result[0]):>8}")
+
+
+if __name__ == "__main__":
+    main()
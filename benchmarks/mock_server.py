@@ -0,0 +1,298 @@
+# Local stand-in for the ORCID and OpenAlex APIs, serving synthetic payloads (see benchmarks/synthetic.py),
+# to benchmark fetch concurrency, retries and caching without touching the live services.
+# Serves:
+# - /v3.0/{orcid}/record and the sections fetched by the incremental sync (/v3.0/{orcid}/works, /person, ...),
+#   with an ETag so that conditional requests get a 304;
+# - the OpenAlex /works endpoints used by src/openalex_data.py: search (with page or cursor pagination),
+#   OR-filter on DOIs and lookup by DOI, reduced to the requested fields when the query has a select parameter.
+# Latency, the rate of server errors and bursts of 429 responses can be configured.
+# GET /_stats returns the number of requests, bytes and responses by status served so far (and resets them with ?reset=1).
+#
+# Provided functions:
+# - MockServer(...): Threaded HTTP server, see start() to run it in the background.
+#
+# Run from the repository root, then point the app at it with the base-URL settings:
+#   python -m benchmarks.mock_server [--port 8080] [--record-size 100] [--latency 0.05] [--error-rate 0.01] [--burst-every 10 --burst-duration 1]
+#   ORCID_TOOLBOX_ORCID_API_URL=http://127.0.0.1:8080/v3.0 ORCID_TOOLBOX_OPENALEX_API_URL=http://127.0.0.1:8080 streamlit run app.py
+
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from benchmarks.synthetic import synth_openalex_work, synth_orcid_record
+
+_RECORD_PATH_RE = re.compile(r"^/v3\.0/(?P<orcid>\d{4}-\d{4}-\d{4}-\d{3}[\dX])/(?P<section>[a-z-]+)$")
+_ACTIVITY_SECTIONS = ("works", "employments", "educations", "fundings", "peer-reviews")
+
+# Number of distinct synthetic records: each ORCID iD is served one of them, with its own iD in place of the
+# template's one, so that serving a record does not cost more than copying it
+RECORD_TEMPLATES = 16
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    # record_size: number of works of each ORCID record
+    # results: number of results of each OpenAlex search
+    # latency, jitter: delay before each response, in seconds, plus a uniform random delay of up to jitter seconds
+    # error_rate: share of the requests answered with a 503
+    # burst_every, burst_duration: every burst_every seconds, all requests are answered with a 429 for burst_duration seconds
+    # missing_every: one in missing_every DOIs is not found in OpenAlex
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        record_size: int = 100,
+        results: int = 300,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        burst_every: float = 0.0,
+        burst_duration: float = 0.0,
+        missing_every: int = 10,
+        seed: int = 0,
+    ):
+        super().__init__((host, port), _MockHandler)
+        self.record_size = record_size
+        self.results = results
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_duration = burst_duration
+        self.missing_every = missing_every
+        self.seed = seed
+        self.started = time.monotonic()
+        self.requests = 0
+        self.bytes = 0
+        self.statuses: Counter = Counter()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._templates: Dict[Tuple[int, str], Optional[bytes]] = {}
+        self._works: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Base URLs to use as ORCID_API_URL and OPENALEX_API_URL
+    @property
+    def orcid_url(self) -> str:
+        return f"{self.url}/v3.0"
+
+    @property
+    def openalex_url(self) -> str:
+        return self.url
+
+    # Serve requests in a background thread
+    def start(self) -> "MockServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    # JSON payload of a section of the record of an ORCID iD ("record" for the full record), or None if unknown
+    def record_payload(self, orcid: str, section: str) -> Optional[bytes]:
+        template = sum(orcid.encode("utf-8")) % RECORD_TEMPLATES
+        key = (template, section)
+        template_orcid = f"0000-0000-0000-{template:04d}"
+        with self._lock:
+            cached = key in self._templates
+            payload = self._templates.get(key)
+        if not cached:
+            record = synth_orcid_record(template_orcid, works=self.record_size, seed=self.seed)
+            if section == "record":
+                body = record
+            elif section == "person":
+                body = record["person"]
+            elif section in _ACTIVITY_SECTIONS:
+                body = record["activities-summary"][section]
+            else:
+                body = None
+            payload = json.dumps(body).encode("utf-8") if body is not None else None
+            with self._lock:
+                self._templates[key] = payload
+        return payload.replace(template_orcid.encode("utf-8"), orcid.encode("utf-8")) if payload is not None else None
+
+    def work(self, index: int) -> Dict[str, Any]:
+        if index not in self._works:
+            self._works[index] = synth_openalex_work(index, seed=self.seed)
+        return self._works[index]
+
+    # Work with a given DOI, or None for one in missing_every DOIs
+    def work_by_doi(self, doi: str) -> Optional[Dict[str, Any]]:
+        index = sum(doi.encode("utf-8"))
+        if self.missing_every and index % self.missing_every == 0:
+            return None
+        return dict(self.work(index % 1000), doi=f"https://doi.org/{doi}")
+
+    # Status and Retry-After delay of the injected failure for the next request, or None
+    def fault(self) -> Optional[tuple]:
+        if self.burst_every and self.burst_duration:
+            in_cycle = (time.monotonic() - self.started) % self.burst_every
+            if in_cycle < self.burst_duration:
+                return 429, max(1, math.ceil(self.burst_duration - in_cycle))
+        with self._lock:
+            failed = self.error_rate and self._random.random() < self.error_rate
+        return (503, None) if failed else None
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def count(self, status: int, size: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes += size
+            self.statuses[status] += 1
+
+    def reset(self) -> None:
+        self.stats(reset=True)
+
+    def stats(self, reset: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            stats = {"requests": self.requests, "bytes": self.bytes, "statuses": dict(self.statuses)}
+            if reset:
+                self.requests = self.bytes = 0
+                self.statuses.clear()
+        return stats
+
+    # Clients may close a kept-alive connection at any time, e.g. after a response they retry
+    def handle_error(self, request, client_address) -> None:
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    server: MockServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent in separate writes: without this, delayed ACKs add 40 ms to kept-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/_stats":
+            self._send(200, self.server.stats(reset=params.get("reset") == "1"), count=False)
+            return
+
+        time.sleep(self.server.delay())
+        fault = self.server.fault()
+        if fault is not None:
+            status, retry_after = fault
+            self._send(status, {"error": "Too Many Requests" if status == 429 else "Service Unavailable"},
+                       {"Retry-After": str(retry_after)} if retry_after else None)
+            return
+
+        if url.path.startswith("/v3.0/"):
+            self._orcid(url.path)
+        elif url.path == "/works" or url.path.startswith("/works/"):
+            self._openalex(url.path, params)
+        else:
+            self._send(404, {"error": "Not Found"})
+
+    def _orcid(self, path: str) -> None:
+        match = _RECORD_PATH_RE.match(path)
+        if match is None:
+            self._send(404, {"error": "Not Found"})
+            return
+        orcid, section = match.group("orcid"), match.group("section")
+        payload = self.server.record_payload(orcid, section)
+        if payload is None:
+            self._send(404, {"error": "Not Found"})
+            return
+        etag = f'"{orcid}-{section}-{self.server.record_size}-{self.server.seed}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, None, {"ETag": etag})
+            return
+        self._send(200, payload, {"ETag": etag})
+
+    def _openalex(self, path: str, params: Dict[str, str]) -> None:
+        select = params["select"].split(",") if "select" in params else None
+        if path.startswith("/works/doi:"):
+            work = self.server.work_by_doi(unquote(path[len("/works/doi:"):]).lower())
+            if work is None:
+                self._send(404, {"error": "Not Found"})
+                return
+            body = _select(work, select)
+        elif path == "/works" and params.get("filter", "").startswith("doi:"):
+            works = [self.server.work_by_doi(doi.lower()) for doi in params["filter"][len("doi:"):].split("|")]
+            results = [_select(work, select) for work in works if work is not None]
+            body = {"meta": {"count": len(results), "per_page": int(params.get("per-page", 25))}, "results": results}
+        elif path == "/works":
+            per_page = int(params.get("per-page", 25))
+            if "cursor" in params:
+                start = 0 if params["cursor"] == "*" else int(params["cursor"])
+            else:
+                start = (int(params.get("page", 1)) - 1) * per_page
+            results = self.server.results
+            next_cursor = str(start + per_page) if "cursor" in params and start + per_page < results else None
+            body = {
+                "meta": {"count": results, "per_page": per_page, "next_cursor": next_cursor},
+                "results": [_select(self.server.work(i), select) for i in range(start, min(start + per_page, results))],
+            }
+        else:
+            self._send(404, {"error": "Not Found"})
+            return
+        self._send(200, body)
+
+    # Send a response, body being either a JSON-serializable value or an already serialized payload
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None, count: bool = True) -> None:
+        if isinstance(body, bytes):
+            payload = body
+        else:
+            payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        if count:
+            self.server.count(status, len(payload))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _select(work: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    return {field: work.get(field) for field in fields} if fields else work
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on, 0 for any free port")
+    parser.add_argument("--record-size", type=int, default=100, help="Number of works of each ORCID record")
+    parser.add_argument("--results", type=int, default=300, help="Number of results of each OpenAlex search")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay before each response, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random delay added to the latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="Period of the bursts of 429 responses, in seconds")
+    parser.add_argument("--burst-duration", type=float, default=0.0, help="Duration of each burst of 429 responses, in seconds")
+    args = parser.parse_args()
+
+    server = MockServer(
+        args.host, args.port, record_size=args.record_size, results=args.results, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, burst_every=args.burst_every, burst_duration=args.burst_duration,
+    )
+    print(f"Serving on {server.url}")
+    print(f"  ORCID_TOOLBOX_ORCID_API_URL={server.orcid_url}")
+    print(f"  ORCID_TOOLBOX_OPENALEX_API_URL={server.openalex_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Accuracy and latency of the NER inference backends of src/references_matching.py (see NER_INFERENCE_BACKENDS)
+# on the fixed set of references in benchmarks/data/references.txt.
+# For each backend, reports the model loading time, the batched latency per reference, the p50/p95 latency of a
+# single reference, and the entity F1 against the first backend of the list (the full-precision model by default):
+# entities are compared as (label, lowercased value) pairs, micro-averaged over all references.
+#
+# Run from the repository root (needs transformers and torch, and optimum[onnxruntime] for the onnx backend):
+#   python -m benchmarks.ner_backends [--backends transformers,quantized,onnx] [--repeat 3]
+
+import argparse
+import os
+import statistics
+import time
+from typing import Dict, List, Set, Tuple
+from src.references_matching import NER_BATCH_SIZE, extract_ner_entities, extract_ner_entities_batch, extract_references_from_text, get_ner_pipeline
+
+REFERENCES_PATH = os.path.join(os.path.dirname(__file__), "data", "references.txt")
+
+
+# Entities of a reference as a set of (label, normalized value) pairs
+def entity_pairs(entities: Dict[str, List[str]]) -> Set[Tuple[str, str]]:
+    return {(label, " ".join(str(value).lower().split())) for label, values in entities.items() for value in values if value}
+
+
+# Micro-averaged precision, recall and F1 of predicted entities against expected ones
+def entity_f1(expected: List[Dict[str, List[str]]], predicted: List[Dict[str, List[str]]]) -> Tuple[float, float, float]:
+    true_positives = predicted_count = expected_count = 0
+    for expected_entities, predicted_entities in zip(expected, predicted):
+        expected_pairs = entity_pairs(expected_entities)
+        predicted_pairs = entity_pairs(predicted_entities)
+        true_positives += len(expected_pairs & predicted_pairs)
+        predicted_count += len(predicted_pairs)
+        expected_count += len(expected_pairs)
+    precision = true_positives / predicted_count if predicted_count else 1.0
+    recall = true_positives / expected_count if expected_count else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", default="transformers,quantized,onnx", help="Comma-separated list of backends, the first one is the reference for F1")
+    parser.add_argument("--references", default=REFERENCES_PATH, help="Text file of references, split as in the app")
+    parser.add_argument("--batch-size", type=int, default=NER_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed batched runs")
+    args = parser.parse_args()
+
+    with open(args.references, encoding="utf-8") as f:
+        texts = [ref["text"] for ref in extract_references_from_text(f.read())]
+    print(f"{len(texts)} references from {args.references}")
+
+    print(f"{'backend':<13} {'load (s)':>9} {'batch ms/ref':>13} {'single p50':>11} {'single p95':>11} {'precision':>10} {'recall':>7} {'F1':>7}")
+    baseline = None
+    for backend in args.backends.split(","):
+        started = time.perf_counter()
+        get_ner_pipeline(backend=backend)
+        load_time = time.perf_counter() - started
+
+        # Warm-up run, also used for accuracy
+        entities = extract_ner_entities_batch(texts, args.batch_size, backend=backend)
+        batch_times = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            extract_ner_entities_batch(texts, args.batch_size, backend=backend)
+            batch_times.append((time.perf_counter() - started) / len(texts))
+        single_times = []
+        for text in texts:
+            started = time.perf_counter()
+            extract_ner_entities(text, backend=backend)
+            single_times.append(time.perf_counter() - started)
+
+        if baseline is None:
+            baseline = entities
+        precision, recall, f1 = entity_f1(baseline, entities)
+        print(
+            f"{backend:<13} {load_time:>9.2f} {statistics.median(batch_times) * 1000:>13.1f} "
+            f"{percentile(single_times, 0.5) * 1000:>11.1f} {percentile(single_times, 0.95) * 1000:>11.1f} "
+            f"{precision:>10.3f} {recall:>7.3f} {f1:>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
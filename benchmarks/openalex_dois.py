@@ -0,0 +1,51 @@
+# Benchmark of resolve_openalex_dois in src/openalex_data.py against the local OpenAlex stand-in of
+# benchmarks/mock_server.py: resolves the DOIs of a profile one request per DOI with get_openalex_data, then with
+# OR-filter batches, reports the number of requests and the time taken, and checks that both give the same works.
+# The batches are then run twice with the cache of lookups (see get_openalex_cache), starting empty.
+# The mock server applies a fixed latency to every request; the polite pool rate limit can be kept with --rate-limit.
+#
+# Run from the repository root:
+#   python -m benchmarks.openalex_dois [--dois 1500] [--latency 0.05] [--workers 4] [--rate-limit]
+
+import argparse
+import time
+from src import openalex_data
+from benchmarks.openalex_search import start_stub
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dois", type=int, default=1500, help="Number of DOIs of the profile")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latency of the mock server per request, in seconds")
+    parser.add_argument("--workers", type=int, default=openalex_data.OPENALEX_MAX_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=openalex_data.OPENALEX_DOI_BATCH_SIZE)
+    parser.add_argument("--rate-limit", action="store_true", help="Apply the polite pool rate limit to the mock server")
+    args = parser.parse_args()
+
+    stub = start_stub(latency=args.latency)
+    if args.rate_limit:
+        openalex_data.OPENALEX_RATE_LIMIT = openalex_data.OPENALEX_RATE_BURST = 10
+    # Mixed forms, as found in ORCID profiles
+    dois = [f"https://doi.org/10.{1000 + i % 50}/synth.{i}" if i % 3 == 0 else f"10.{1000 + i % 50}/SYNTH.{i}" for i in range(args.dois)]
+
+    print(f"{args.dois} DOIs, {args.latency * 1000:.0f} ms latency per request")
+    print(f"{'mode':<24} {'requests':>9} {'time (s)':>9} {'found':>6}")
+
+    stub.reset()
+    started = time.perf_counter()
+    single = {doi: openalex_data.get_openalex_data(doi=doi, use_cache=False) for doi in dois}
+    print(f"{'one request per DOI':<24} {stub.requests:>9} {time.perf_counter() - started:>9.2f} {sum(w is not None for w in single.values()):>6}")
+
+    same = True
+    for label, use_cache in (("batched", False), ("batched, cold cache", True), ("batched, warm cache", True)):
+        stub.reset()
+        started = time.perf_counter()
+        batched = openalex_data.resolve_openalex_dois(dois, batch_size=args.batch_size, max_workers=args.workers, use_cache=use_cache)
+        print(f"{label:<24} {stub.requests:>9} {time.perf_counter() - started:>9.2f} {sum(w is not None for w in batched.values()):>6}")
+        same = same and all((single[doi] or {}).get("id") == (batched[doi] or {}).get("id") for doi in dois)
+    print(f"same works: {same}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
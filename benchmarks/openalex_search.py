@@ -0,0 +1,81 @@
+# Benchmark of the OpenAlex title search of get_openalex_data in src/openalex_data.py, against the local stand-in
+# of the OpenAlex API of benchmarks/mock_server.py serving synthetic works, so that it needs no network access.
+# Compares the bounded lookup (first result only, selected fields) with the previous behaviour, which went through
+# every page of the full results of the search before keeping the first one, and reports the number of requests
+# and the number of bytes downloaded per lookup. DOI lookups are compared with and without the field selection.
+# The last line repeats the bounded title lookups with a warm cache of lookups (see get_openalex_cache).
+#
+# Run from the repository root:
+#   python -m benchmarks.openalex_search [--lookups 20] [--results 300] [--latency 0.02]
+
+from typing import Any, Dict, List, Optional
+import argparse
+import tempfile
+import time
+from src import disk_cache, openalex_data
+from benchmarks.mock_server import MockServer
+
+
+# Previous title search: every page of the full works, as list(query) did, then the first result
+def legacy_search(title: str) -> Optional[Dict[str, Any]]:
+    query = openalex_data.Works().search(title)
+    results = []
+    cursor: Optional[str] = "*"
+    while cursor:
+        data = openalex_data._get_json(openalex_data._query_path(query), params={"per-page": 25, "cursor": cursor})
+        results.extend(data["results"])
+        cursor = data["meta"]["next_cursor"]
+    return results[0] if results else None
+
+
+# Previous DOI lookup: the full work
+def legacy_doi(doi: str) -> Optional[Dict[str, Any]]:
+    return openalex_data._get_json(f"works/doi:{doi}")
+
+
+# Start a mock server in a background thread and point the OpenAlex lookups at it,
+# with the persistent caches in a temporary directory so that works of the mock server are not cached with real ones
+def start_stub(**kwargs) -> MockServer:
+    stub = MockServer(**kwargs).start()
+    openalex_data.OPENALEX_API_URL = stub.openalex_url
+    # The polite pool quota does not apply to the mock server
+    openalex_data.OPENALEX_RATE_LIMIT = openalex_data.OPENALEX_RATE_BURST = 10000
+    disk_cache.CACHE_DIR = tempfile.mkdtemp(prefix="openalex-stub-")
+    return stub
+
+
+def run(stub: MockServer, label: str, lookup, args_list: List[Any]) -> None:
+    stub.reset()
+    started = time.perf_counter()
+    for value in args_list:
+        lookup(value)
+    elapsed = time.perf_counter() - started
+    count = len(args_list)
+    print(f"{label:<22} {stub.requests / count:>13.1f} {stub.bytes / count / 1024:>11.1f} {elapsed / count * 1000:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=20, help="Number of lookups of each kind")
+    parser.add_argument("--results", type=int, default=300, help="Number of results of each search on the mock server")
+    parser.add_argument("--latency", type=float, default=0.02, help="Latency of the mock server per request, in seconds")
+    args = parser.parse_args()
+
+    stub = start_stub(results=args.results, latency=args.latency)
+
+    titles = [f"Synthetic title number {i}" for i in range(args.lookups)]
+    dois = [f"10.1000/synth.{i}" for i in range(args.lookups)]
+    print(f"{args.lookups} lookups of each kind, {args.results} results per search, {args.latency * 1000:.0f} ms latency per request")
+    print(f"{'lookup':<22} {'requests/lookup':>13} {'KB/lookup':>11} {'ms/lookup':>10}")
+    run(stub, "title, all pages", legacy_search, titles)
+    run(stub, "title, bounded", lambda title: openalex_data.get_openalex_data(title=title, use_cache=False), titles)
+    run(stub, "DOI, full work", legacy_doi, dois)
+    run(stub, "DOI, selected fields", lambda doi: openalex_data.get_openalex_data(doi=doi, use_cache=False), dois)
+    for title in titles:
+        openalex_data.get_openalex_data(title=title)
+    run(stub, "title, cached", lambda title: openalex_data.get_openalex_data(title=title.upper()), titles)
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
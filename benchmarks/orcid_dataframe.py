@@ -0,0 +1,79 @@
+# Benchmark of the publications DataFrame construction in src/orcid_data.py.
+# Compares the columnar builder with the previous row-oriented builder on a synthetic record.
+#
+# Run from the repository root:
+#   python -m benchmarks.orcid_dataframe [--works 10000] [--repeat 5]
+
+from typing import Any, Dict, Iterable, List
+import argparse
+import time
+import pandas as pd
+from src.orcid_data import (
+    PUBLICATION_COLUMNS,
+    _extract_external_ids,
+    _publications_dataframe,
+    _safe_get_title,
+    format_timestamp,
+    parse_orcid_record,
+)
+from benchmarks.synthetic import synth_orcid_record
+
+
+# Row-oriented builder used before the columnar one, kept as the reference output
+def row_dataframe(summaries: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    publications: List[Dict[str, Any]] = []
+    for summary in summaries:
+        external_ids = _extract_external_ids(summary)
+        dois = [e["doi"] for e in external_ids if e.get("doi")]
+        publications.append({
+            "put-code": summary.get("put-code"),
+            "modified-date": format_timestamp(summary.get("last-modified-date", {}).get("value")) if summary.get("last-modified-date") else None,
+            "modified-by": summary.get("source", {}).get("source-name", {}).get("value"),
+            "title": _safe_get_title(summary),
+            "type": summary.get("type"),
+            "journal-title": summary.get("journal-title", {}).get("value") if summary.get("journal-title") else None,
+            "publication-year": summary.get("publication-date", {}).get("year", {}).get("value") if summary.get("publication-date") else None,
+            "external-ids": _extract_external_ids(summary),
+            "visibility": summary.get("visibility"),
+            "url": summary.get("url", {}).get("value") if summary.get("url") else None,
+            "doi": dois[0] if dois else None,
+        })
+    df = pd.DataFrame(publications)
+    if df.empty:
+        df = pd.DataFrame(columns=PUBLICATION_COLUMNS)
+    return df
+
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--works", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    record = synth_orcid_record("0000-0000-0000-0000", works=args.works)
+    summaries = [group["work-summary"][0] for group in record["activities-summary"]["works"]["group"]]
+
+    # Same values, only the type and visibility dtypes differ
+    expected = row_dataframe(summaries)
+    actual, _ = parse_orcid_record(record)
+    pd.testing.assert_frame_equal(actual.astype({"type": object, "visibility": object}), expected)
+
+    row_time = best_of(args.repeat, row_dataframe, summaries)
+    columnar_time = best_of(args.repeat, _publications_dataframe, summaries)
+    print(f"{args.works} works, best of {args.repeat}")
+    print(f"  row-oriented: {row_time * 1000:8.1f} ms")
+    print(f"  columnar:     {columnar_time * 1000:8.1f} ms  ({row_time / columnar_time:.1f}x)")
+    print(f"  memory: {expected.memory_usage(deep=True).sum() / 1e6:.1f} MB -> {actual.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Coverage, speed and accuracy of the rule-based extractor of src/reference_rules.py used by the tiered extraction mode.
+# Reports how many references of a file would skip the NER model, the extraction time per reference, and,
+# when the NER model is available (transformers installed), the entity F1 of the rule-based entities against the model on these references
+# (title, year, journal and DOI only, the fields used for matching).
+#
+# Run from the repository root:
+#   python -m benchmarks.rule_extraction [--references benchmarks/data/references.txt] [--no-ner]
+
+import argparse
+import importlib.util
+import time
+from src.reference_rules import RULES_MIN_CONFIDENCE, extract_rule_entities
+from src.references_matching import extract_ner_entities_batch, extract_references_from_text
+from benchmarks.ner_backends import REFERENCES_PATH, entity_f1
+
+MATCHING_FIELDS = ("TITLE", "PUBLICATION_YEAR", "JOURNAL", "DOI")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--references", default=REFERENCES_PATH, help="Text file of references, split as in the app")
+    parser.add_argument("--no-ner", action="store_true", help="Do not compare with the NER model")
+    args = parser.parse_args()
+
+    with open(args.references, encoding="utf-8") as f:
+        texts = [ref["text"] for ref in extract_references_from_text(f.read())]
+
+    started = time.perf_counter()
+    results = [extract_rule_entities(text) for text in texts]
+    elapsed = time.perf_counter() - started
+    rules_texts = [text for text, (_, confidence) in zip(texts, results) if confidence >= RULES_MIN_CONFIDENCE]
+    print(f"{len(texts)} references: {len(rules_texts)} parsed by rules, {len(texts) - len(rules_texts)} sent to the NER model")
+    print(f"Rule-based extraction: {elapsed / max(1, len(texts)) * 1e6:.0f} µs per reference")
+
+    if args.no_ner or not rules_texts:
+        return
+    if importlib.util.find_spec("transformers") is None:
+        print("transformers is not installed, skipping the comparison with the NER model")
+        return
+    expected = [{field: entities.get(field, []) for field in MATCHING_FIELDS} for entities in extract_ner_entities_batch(rules_texts)]
+    predicted = [{field: entities[field] for field in MATCHING_FIELDS} for entities, confidence in results if confidence >= RULES_MIN_CONFIDENCE]
+    precision, recall, f1 = entity_f1(expected, predicted)
+    print(f"Against the NER model on the references parsed by rules: precision {precision:.3f}, recall {recall:.3f}, F1 {f1:.3f}")
+
+
+if __name__ == "__main__":
+    main()
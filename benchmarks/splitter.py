@@ -0,0 +1,96 @@
+# Benchmark of the reference splitter extract_references_from_text in src/references_matching.py.
+# Compares it with the previous implementation on a synthetic bibliography (time, and peak memory of iterating
+# over the references), checks that both give the same reference texts and that the offsets of the references
+# point to their source, then times the splitter on inputs of increasing size to show that it runs in linear time.
+#
+# Run from the repository root:
+#   python -m benchmarks.splitter [--lines 50000] [--repeat 5]
+
+from typing import Dict, List
+import argparse
+import re
+import time
+import tracemalloc
+from src.references_matching import extract_references_from_text, iter_references_from_text
+from benchmarks.synthetic import synth_bibliography
+
+
+# Splitter used before the single-pass one, kept as the reference output for texts
+def legacy_split(text: str) -> List[Dict]:
+    references = []
+    lines = text.split('\n')
+    current_ref = []
+    ref_number = 0
+    for line in lines:
+        stripped_line = line.strip()
+        if not stripped_line:
+            if current_ref:
+                ref_text = ' '.join(current_ref)
+                ref_number += 1
+                references.append({'text': ref_text, 'ref_number': ref_number, 'start': 0, 'end': len(ref_text)})
+                current_ref = []
+            continue
+        match = re.match(r'^[\[\(]?(\d+)[\]\)\.]\s*(.+)', stripped_line)
+        if match:
+            if current_ref:
+                ref_text = ' '.join(current_ref)
+                references.append({'text': ref_text, 'ref_number': ref_number, 'start': 0, 'end': len(ref_text)})
+            ref_number = int(match.group(1))
+            current_ref = [match.group(2)]
+        elif current_ref:
+            current_ref.append(stripped_line)
+        else:
+            ref_number += 1
+            current_ref = [stripped_line]
+    if current_ref:
+        ref_text = ' '.join(current_ref)
+        references.append({'text': ref_text, 'ref_number': ref_number, 'start': 0, 'end': len(ref_text)})
+    return references
+
+
+def best_time(func, text: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = synth_bibliography(args.lines)
+    references = extract_references_from_text(text)
+    assert [ref["text"] for ref in references] == [ref["text"] for ref in legacy_split(text)]
+    assert all(" ".join(line.strip() for line in text[ref["start"]:ref["end"]].split("\n") if line.strip()) == ref["text"] for ref in references)
+    print(f"{args.lines} lines, {len(text) / 1e6:.1f} MB, {len(references)} references")
+
+    legacy = best_time(legacy_split, text, args.repeat)
+    current = best_time(extract_references_from_text, text, args.repeat)
+
+    tracemalloc.start()
+    legacy_split(text)
+    legacy_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    for _ in iter_references_from_text(text):
+        pass
+    current_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"{'':<20} {'time (ms)':>10} {'peak (MB)':>10}")
+    print(f"{'previous splitter':<20} {legacy * 1000:>10.1f} {legacy_peak / 1e6:>10.2f}")
+    print(f"{'single-pass splitter':<20} {current * 1000:>10.1f} {current_peak / 1e6:>10.2f}")
+
+    print(f"{'lines':>8} {'MB':>6} {'time (ms)':>10} {'ns/char':>8}")
+    for factor in (1, 2, 4, 8):
+        scaled = synth_bibliography(args.lines * factor)
+        elapsed = best_time(extract_references_from_text, scaled, max(1, args.repeat // 2))
+        print(f"{args.lines * factor:>8} {len(scaled) / 1e6:>6.1f} {elapsed * 1000:>10.1f} {elapsed / len(scaled) * 1e9:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
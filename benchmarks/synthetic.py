@@ -0,0 +1,266 @@
+# Synthetic ORCID records and OpenAlex works for benchmarks, shaped like the responses of the public ORCID API (v3)
+# and of the OpenAlex API.
+#
+# Provided functions:
+# - synth_orcid_record(orcid, works=100, seed=0): Returns a full /record payload with the given number of works.
+# - synth_references(record, count=100, matched_ratio=0.7, seed=0): Returns extracted references, part of them noisy copies of the works of a record.
+# - synth_bibliography(lines=50000, seed=0): Returns a plain-text bibliography of about the given number of lines.
+# - synth_openalex_work(index, seed=0, authors=8, references=40): Returns a full OpenAlex work object.
+
+from typing import Any, Dict, List, Optional
+import random
+
+WORK_TYPES = ["journal-article", "book-chapter", "conference-paper", "book", "report", "other"]
+JOURNALS = [
+    "Canadian Journal of Behavioural Science",
+    "Psychology of Popular Media Culture",
+    "Vivre le primaire",
+    "Journal of Documentation",
+    "Scientometrics",
+    "PLOS ONE",
+]
+# Title vocabulary: a few very common words, and a few thousand rarer pseudo-words picked with a Zipf-like
+# distribution, so that titles overlap like real titles of a profile do
+COMMON_WORDS = "the of and in a for on with study analysis".split()
+_vocabulary_rng = random.Random("vocabulary")
+WORDS = sorted({"".join(_vocabulary_rng.choices("abcdefghijklmnopqrstuvwxyz", k=_vocabulary_rng.randint(3, 11))) for _ in range(5000)})
+_WORD_WEIGHTS = [1 / (rank + 10) for rank in range(len(WORDS))]
+
+
+def _title(rng: random.Random) -> str:
+    words = rng.choices(WORDS, weights=_WORD_WEIGHTS, k=rng.randint(4, 12))
+    for _ in range(rng.randint(0, 3)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(COMMON_WORDS))
+    return " ".join(words).capitalize()
+
+
+BASE_TIMESTAMP = 1500000000000
+DAY_MS = 86400000
+
+
+def _value(value: Any) -> Optional[Dict[str, Any]]:
+    return {"value": value} if value is not None else None
+
+
+def _external_ids(rng: random.Random, index: int) -> List[Dict[str, Any]]:
+    ids = []
+    if rng.random() < 0.8:
+        doi = f"10.{1000 + index % 9000}/synth.{index}"
+        ids.append({
+            "external-id-type": "doi",
+            "external-id-value": doi if rng.random() < 0.7 else f"https://doi.org/{doi.upper()}",
+            "external-id-normalized": _value(doi) if rng.random() < 0.8 else None,
+            "external-id-url": _value(f"https://doi.org/{doi}"),
+            "external-id-relationship": "self",
+        })
+    if rng.random() < 0.3:
+        ids.append({
+            "external-id-type": "eid",
+            "external-id-value": f"2-s2.0-{850000000 + index}",
+            "external-id-normalized": None,
+            "external-id-url": None,
+            "external-id-relationship": "self",
+        })
+    return ids
+
+
+def _work_summary(rng: random.Random, orcid: str, index: int, put_code: int) -> Dict[str, Any]:
+    title = _title(rng)
+    year = rng.randint(1990, 2025)
+    return {
+        "put-code": put_code,
+        "created-date": _value(BASE_TIMESTAMP + index * DAY_MS // 2),
+        "last-modified-date": _value(BASE_TIMESTAMP + index * DAY_MS) if rng.random() < 0.95 else None,
+        "source": {"source-orcid": None, "source-client-id": _value("0000-0001-9884-1913"), "source-name": _value("Crossref")},
+        "title": {"title": _value(title), "subtitle": None, "translated-title": None} if rng.random() < 0.98 else None,
+        "external-ids": {"external-id": _external_ids(rng, index)},
+        "url": _value(f"https://example.org/works/{index}") if rng.random() < 0.5 else None,
+        "type": rng.choice(WORK_TYPES),
+        "publication-date": {"year": _value(str(year)), "month": _value(f"{rng.randint(1, 12):02d}"), "day": None} if rng.random() < 0.9 else None,
+        "journal-title": _value(rng.choice(JOURNALS)) if rng.random() < 0.7 else None,
+        "visibility": "public",
+        "path": f"/{orcid}/work/{put_code}",
+        "display-index": "0",
+    }
+
+
+def _affiliations(rng: random.Random, count: int, kind: str) -> Dict[str, Any]:
+    return {
+        "last-modified-date": _value(BASE_TIMESTAMP + rng.randint(0, 3000) * DAY_MS) if count else None,
+        "affiliation-group": [
+            {"summaries": [{f"{kind}-summary": {"put-code": i, "department-name": "Sciences", "role-title": "Professor"}}]}
+            for i in range(count)
+        ],
+    }
+
+
+# Full /record payload for an ORCID iD, with `works` works groups (some groups hold several versions of a work)
+def synth_orcid_record(orcid: str, works: int = 100, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(f"{orcid}-{seed}")
+    groups = []
+    for index in range(works):
+        put_code = 100000 + index * 3
+        summaries = [_work_summary(rng, orcid, index, put_code)]
+        if rng.random() < 0.1:
+            summaries.append(_work_summary(rng, orcid, index, put_code + 1))
+        groups.append({
+            "last-modified-date": summaries[0]["last-modified-date"],
+            "external-ids": summaries[0]["external-ids"],
+            "work-summary": summaries,
+        })
+    last_modified = BASE_TIMESTAMP + (works + 10) * DAY_MS
+    return {
+        "orcid-identifier": {"uri": f"https://orcid.org/{orcid}", "path": orcid, "host": "orcid.org"},
+        "preferences": {"locale": "fr"},
+        "history": {
+            "creation-method": "MEMBER-REFERRED",
+            "submission-date": _value(BASE_TIMESTAMP - 1000 * DAY_MS),
+            "last-modified-date": _value(last_modified),
+            "claimed": True,
+            "verified-email": True,
+        },
+        "person": {
+            "last-modified-date": _value(BASE_TIMESTAMP),
+            "name": {
+                "given-names": _value(rng.choice(["Marie", "Jean", "Zoë", "Amir", "Lin"])),
+                "family-name": _value(rng.choice(["Tremblay", "Gagnon", "Roy", "Côté", "Bouchard"])),
+            },
+        },
+        "activities-summary": {
+            "last-modified-date": _value(last_modified),
+            "educations": _affiliations(rng, rng.randint(0, 3), "education"),
+            "employments": _affiliations(rng, rng.randint(0, 4), "employment"),
+            "fundings": {"last-modified-date": _value(BASE_TIMESTAMP) if works else None, "group": []},
+            "peer-reviews": {"last-modified-date": None, "group": []},
+            "works": {"last-modified-date": _value(last_modified) if works else None, "group": groups, "path": f"/{orcid}/works"},
+        },
+        "path": f"/{orcid}",
+    }
+
+
+def _perturb(rng: random.Random, text: str) -> str:
+    words = text.split()
+    if len(words) > 4 and rng.random() < 0.3:
+        del words[rng.randrange(len(words))]
+    if rng.random() < 0.4:
+        i = rng.randrange(len(words))
+        word = words[i]
+        if len(word) > 3:
+            j = rng.randrange(len(word))
+            words[i] = word[:j] + rng.choice("aeiourst") + word[j + 1:]
+    return " ".join(words)
+
+
+# Screened references shaped like the output of extract_and_process_references, with NER entities.
+# About matched_ratio of them are noisy copies of works of the record (some with their DOI),
+# the others are references to works missing from the record.
+def synth_references(record: Dict[str, Any], count: int = 100, matched_ratio: float = 0.7, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    summaries = [group["work-summary"][0] for group in record["activities-summary"]["works"]["group"]]
+    refs = []
+    for number in range(1, count + 1):
+        if summaries and rng.random() < matched_ratio:
+            summary = rng.choice(summaries)
+            title = ((summary.get("title") or {}).get("title") or {}).get("value") or "Untitled"
+            year = ((summary.get("publication-date") or {}).get("year") or {}).get("value")
+            journal = (summary.get("journal-title") or {}).get("value")
+            dois = [e.get("external-id-value") for e in summary["external-ids"]["external-id"] if e["external-id-type"] == "doi"]
+            title = _perturb(rng, title)
+            doi = dois[0] if dois and rng.random() < 0.5 else None
+        else:
+            title = _title(rng)
+            year = str(rng.randint(1990, 2025))
+            journal = rng.choice(JOURNALS)
+            doi = f"10.9999/missing.{number}" if rng.random() < 0.3 else None
+        text = f"Author, A. ({year}). {title}. {journal or ''}." + (f" https://doi.org/{doi}" if doi else "")
+        refs.append({
+            "text": text,
+            "ref_number": number,
+            "ner": {
+                "TITLE": [title],
+                "PUBLICATION_YEAR": [year] if year else [],
+                "JOURNAL": [journal] if journal else [],
+                "DOI": [doi] if doi else [],
+            },
+        })
+    return refs
+
+
+# Plain-text bibliography of about `lines` lines in the layouts handled by extract_references_from_text:
+# numbered references ([1], (1), 1.), references wrapped on several lines, blank-line separated references
+def synth_bibliography(lines: int = 50000, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    output: List[str] = []
+    number = 0
+    while len(output) < lines:
+        number += 1
+        title = _title(rng)
+        year = rng.randint(1980, 2025)
+        journal = rng.choice(JOURNALS)
+        layout = rng.random()
+        if layout < 0.6:
+            prefix = rng.choice(["[{}] ", "({}) ", "{}. "]).format(number)
+            output.append(f"{prefix}Author, A., & Other, B. ({year}). {title}. {journal}, {rng.randint(1, 90)}({rng.randint(1, 12)}),")
+            output.append(f"    {rng.randint(1, 400)}-{rng.randint(401, 900)}. https://doi.org/10.{rng.randint(1000, 9999)}/{number}")
+        else:
+            output.append(f"Author A, Other B. {title}.")
+            output.append(f"{journal}. {year};{rng.randint(1, 90)}:{rng.randint(1, 400)}-{rng.randint(401, 900)}.")
+            output.append("")
+    return "\n".join(output)
+
+
+# Full OpenAlex work object, with the heavy members of real ones (authorships, abstract, references, concepts)
+def synth_openalex_work(index: int, seed: int = 0, authors: int = 8, references: int = 40) -> Dict[str, Any]:
+    rng = random.Random(f"openalex-{index}-{seed}")
+    title = _title(rng)
+    year = rng.randint(1990, 2025)
+    doi = f"https://doi.org/10.{1000 + index % 9000}/synth.{index}"
+    journal = rng.choice(JOURNALS)
+    source = {
+        "id": f"https://openalex.org/S{1000 + JOURNALS.index(journal)}",
+        "display_name": journal,
+        "issn_l": f"{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+        "is_oa": rng.random() < 0.3,
+        "host_organization_name": "Synthetic Publisher",
+        "type": "journal",
+    }
+    abstract = " ".join(rng.choices(WORDS, weights=_WORD_WEIGHTS, k=rng.randint(80, 200)))
+    abstract_index: Dict[str, List[int]] = {}
+    for position, word in enumerate(abstract.split()):
+        abstract_index.setdefault(word, []).append(position)
+    return {
+        "id": f"https://openalex.org/W{100000000 + index}",
+        "doi": doi,
+        "title": title,
+        "display_name": title,
+        "publication_year": year,
+        "publication_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "ids": {"openalex": f"https://openalex.org/W{100000000 + index}", "doi": doi},
+        "language": "en",
+        "primary_location": {"is_oa": source["is_oa"], "landing_page_url": doi, "pdf_url": None, "source": source, "version": "publishedVersion"},
+        "locations": [{"is_oa": source["is_oa"], "landing_page_url": doi, "source": source}],
+        "type": "article",
+        "open_access": {"is_oa": source["is_oa"], "oa_status": "gold" if source["is_oa"] else "closed", "oa_url": None},
+        "authorships": [
+            {
+                "author_position": "first" if i == 0 else "middle",
+                "author": {"id": f"https://openalex.org/A{rng.randint(10**9, 10**10)}", "display_name": f"{rng.choice(['Marie', 'Jean', 'Amir', 'Lin'])} {rng.choice(['Tremblay', 'Gagnon', 'Roy', 'Bouchard'])}", "orcid": None},
+                "institutions": [{"id": f"https://openalex.org/I{rng.randint(10**6, 10**7)}", "display_name": "Université Synthétique", "country_code": "CA", "type": "education"}],
+                "raw_author_name": "Author",
+                "raw_affiliation_strings": ["Université Synthétique, Montréal, Canada"],
+            }
+            for i in range(authors)
+        ],
+        "cited_by_count": rng.randint(0, 500),
+        "biblio": {"volume": str(rng.randint(1, 90)), "issue": str(rng.randint(1, 12)), "first_page": "1", "last_page": str(rng.randint(2, 30))},
+        "concepts": [
+            {"id": f"https://openalex.org/C{rng.randint(10**6, 10**7)}", "display_name": rng.choice(WORDS), "level": rng.randint(0, 3), "score": round(rng.random(), 4)}
+            for _ in range(rng.randint(5, 15))
+        ],
+        "referenced_works": [f"https://openalex.org/W{rng.randint(10**9, 4 * 10**9)}" for _ in range(references)],
+        "related_works": [f"https://openalex.org/W{rng.randint(10**9, 4 * 10**9)}" for _ in range(10)],
+        "abstract_inverted_index": abstract_index,
+        "counts_by_year": [{"year": y, "cited_by_count": rng.randint(0, 50)} for y in range(max(year, 2012), 2026)],
+        "updated_date": "2025-01-01T00:00:00.000000",
+        "created_date": "2020-01-01",
+    }
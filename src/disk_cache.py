@@ -0,0 +1,175 @@
+# Persistent key-value cache stored in a local SQLite database.
+# Used to keep API responses across sessions and restarts of the app.
+#
+# Provided functions:
+# - DiskCache(path, max_entries=None, max_bytes=None): JSON cache with per-entry TTL and LRU eviction.
+#   get_many() and set_many() read and store a batch of values in a single transaction.
+# - default_cache_path(name): Location of a named cache file in the app cache directory.
+
+from typing import Any, Dict, Iterable, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Maximum number of keys per query of get_many, below the default limit of SQLite on bound parameters
+GET_MANY_CHUNK_SIZE = 500
+
+# Directory holding the persistent caches, can be changed with the ORCID_TOOLBOX_CACHE_DIR environment variable.
+# Setting it to an empty string disables the persistent caches.
+CACHE_DIR = os.environ.get("ORCID_TOOLBOX_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "orcid-toolbox"))
+
+
+# Return the path of a named cache file, or None if persistent caches are disabled
+def default_cache_path(name: str) -> Optional[str]:
+    if not CACHE_DIR:
+        return None
+    return os.path.join(CACHE_DIR, f"{name}.sqlite")
+
+
+# JSON-serializable values stored in SQLite, compressed with zlib.
+# Each entry has its own expiry time; expired entries are still returned by get() (flagged as expired)
+# so that callers can revalidate them instead of downloading them again.
+# When max_entries or max_bytes is exceeded, the least recently used entries are evicted. The number of entries
+# and their total size are kept up to date in memory, so that writes do not scan the table to check the limits
+# (stats() counts them again, e.g. after another process wrote to the same file).
+# A single instance can be shared by any number of threads.
+class DiskCache:
+    def __init__(self, path: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB, meta TEXT, "
+                "stored_at REAL, expires_at REAL, accessed_at REAL, size INTEGER)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+            self._count, self._bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+
+    # Return the entry stored for a key as a dict with keys value, meta, stored_at, expires_at and expired,
+    # or None if there is no entry for this key
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([key]).get(key)
+
+    # Return the entries stored for several keys, as a dict from key to entry (see get) without the missing keys.
+    # Reads them and marks them as used with one query of each kind per GET_MANY_CHUNK_SIZE keys.
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        rows = []
+        with self._lock, self._conn:
+            for i in range(0, len(keys), GET_MANY_CHUNK_SIZE):
+                chunk = keys[i:i + GET_MANY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                found = self._conn.execute(
+                    f"SELECT key, value, meta, stored_at, expires_at FROM entries WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                if found:
+                    self._conn.execute(
+                        f"UPDATE entries SET accessed_at = ? WHERE key IN ({','.join('?' * len(found))})",
+                        [now, *(row[0] for row in found)],
+                    )
+                rows.extend(found)
+        return {
+            key: {
+                "value": json.loads(zlib.decompress(value)),
+                "meta": json.loads(meta) if meta else {},
+                "stored_at": stored_at,
+                "expires_at": expires_at,
+                "expired": expires_at is not None and expires_at <= now,
+            }
+            for key, value, meta, stored_at, expires_at in rows
+        }
+
+    # Store a value for ttl seconds (forever if ttl is None), with optional metadata
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        self.set_many({key: value}, ttl, meta)
+
+    # Store several values (a dict from key to value) in a single transaction, all with the same ttl and metadata
+    def set_many(self, values: Dict[str, Any], ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        if not values:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        meta_json = json.dumps(meta or {})
+        rows = []
+        for key, value in values.items():
+            blob = zlib.compress(json.dumps(value).encode("utf-8"))
+            rows.append((key, blob, meta_json, now, expires_at, now, len(blob)))
+        with self._lock, self._conn:
+            replaced = 0
+            replaced_bytes = 0
+            for row in rows:
+                old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (row[0],)).fetchone()
+                if old is not None:
+                    replaced += 1
+                    replaced_bytes += old[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, meta, stored_at, expires_at, accessed_at, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._count += len(rows) - replaced
+            self._bytes += sum(row[6] for row in rows) - replaced_bytes
+            self._evict()
+
+    # Extend the lifetime of an entry after it was revalidated, optionally replacing its metadata
+    def touch(self, key: str, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            if meta is None:
+                self._conn.execute(
+                    "UPDATE entries SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                    (now + ttl if ttl is not None else None, now, key),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE entries SET expires_at = ?, accessed_at = ?, meta = ? WHERE key = ?",
+                    (now + ttl if ttl is not None else None, now, json.dumps(meta), key),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._count -= 1
+                self._bytes -= old[0]
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._count = self._bytes = 0
+
+    # Number of entries and total compressed size in bytes
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._count, self._bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            return {"entries": self._count, "bytes": self._bytes}
+
+    # Drop least recently used entries until the cache fits its limits. Must be called with the lock held.
+    # Only reads the oldest entries, and only when a limit is exceeded.
+    def _evict(self) -> None:
+        excess_entries = self._count - self.max_entries if self.max_entries is not None else 0
+        excess_bytes = self._bytes - self.max_bytes if self.max_bytes is not None else 0
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+        freed = 0
+        keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+            if len(keys) >= excess_entries and freed >= excess_bytes:
+                break
+            keys.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+        self._count -= len(keys)
+        self._bytes -= freed
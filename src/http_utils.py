@@ -0,0 +1,74 @@
+# Shared helpers for the HTTP clients talking to external APIs (ORCID, OpenAlex).
+#
+# Provided functions:
+# - RateLimiter(rate, burst): Thread-safe token bucket limiting the number of requests per second.
+# - get_rate_limiter(host, rate, burst): Returns the rate limiter shared by every request to a given host.
+# - parse_retry_after(value): Delay in seconds requested by a Retry-After header.
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import threading
+import time
+
+# HTTP status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+# Token bucket rate limiter.
+# Allows bursts of up to `burst` requests, then `rate` requests per second on average.
+# A single instance can be shared by any number of threads.
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Block until a request may be sent
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# One rate limiter per host, shared by every session of the app running in this process
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+# Return the rate limiter for a host, creating it with the given quota on first use
+def get_rate_limiter(host: str, rate: float, burst: int = 1) -> RateLimiter:
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(host)
+        if limiter is None:
+            limiter = RateLimiter(rate, burst)
+            _rate_limiters[host] = limiter
+        return limiter
+
+
+# Parse a Retry-After header, given either in seconds or as an HTTP date. Returns a delay in seconds.
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,165 @@
+# Cache of NER results, so that references already seen are not run through the model again.
+# Entries are keyed by the normalized reference text and the id/version of the model that produced them.
+#
+# Provided functions:
+# - NERCache(max_entries, disk_cache=None): In-memory LRU cache of entity dicts, optionally backed by a DiskCache.
+# - get_ner_cache(): Returns the NER cache shared by every session of the app running in this process.
+# - normalize_reference_text(text): Text used to build the cache key of a reference.
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import copy
+import hashlib
+import re
+import sqlite3
+import threading
+import unicodedata
+from src.disk_cache import DiskCache, default_cache_path
+
+# Number of entity dicts kept in memory
+NER_CACHE_MAX_ENTRIES = 50000
+
+# Limits of the persistent NER cache
+NER_DISK_CACHE_MAX_ENTRIES = 500000
+NER_DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+# Unicode NFC form with whitespace runs collapsed, so that reformatting a bibliography
+# (line breaks, indentation, trailing spaces) does not invalidate its cached references
+def normalize_reference_text(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+# LRU cache from (model id, reference text) to the entity dict produced by the model.
+# Memory is looked up first, then the optional disk cache; disk hits are copied to memory.
+# Hit and miss counts are kept to help sizing the cache. A single instance can be shared by any number of threads.
+class NERCache:
+    def __init__(self, max_entries: int = NER_CACHE_MAX_ENTRIES, disk_cache: Optional[DiskCache] = None):
+        self.max_entries = max_entries
+        self.disk_cache = disk_cache
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(text: str, model_id: str) -> str:
+        return hashlib.sha256(f"{model_id}\0{normalize_reference_text(text)}".encode("utf-8")).hexdigest()
+
+    # Return a copy of the cached entity dict for a reference, or None
+    def get(self, text: str, model_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([text], model_id)[0]
+
+    # Return copies of the cached entity dicts of several references (None for those not cached),
+    # reading the ones not found in memory from the disk cache at once
+    def get_many(self, texts: List[str], model_id: str) -> List[Optional[Dict[str, Any]]]:
+        keys = [self.key(text, model_id) for text in texts]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+        with self._lock:
+            for i, key in enumerate(keys):
+                entities = self._entries.get(key)
+                if entities is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    results[i] = copy.deepcopy(entities)
+        missing = [key for key, entities in zip(keys, results) if entities is None]
+        entries = self.disk_cache.get_many(f"ner:{key}" for key in missing) if self.disk_cache is not None and missing else {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                if results[i] is not None:
+                    continue
+                entry = entries.get(f"ner:{key}")
+                if entry is None:
+                    self._misses += 1
+                    continue
+                self._hits += 1
+                self._disk_hits += 1
+                self._store(key, entry["value"])
+                results[i] = copy.deepcopy(entry["value"])
+        return results
+
+    def set(self, text: str, model_id: str, entities: Dict[str, Any]) -> None:
+        self.set_many({text: entities}, model_id)
+
+    # Store the entity dicts of several references (a dict from text to entity dict), in a single disk transaction
+    def set_many(self, entities_by_text: Dict[str, Dict[str, Any]], model_id: str) -> None:
+        keys = {self.key(text, model_id): entities for text, entities in entities_by_text.items()}
+        with self._lock:
+            for key, entities in keys.items():
+                self._store(key, copy.deepcopy(entities))
+        if self.disk_cache is not None:
+            self.disk_cache.set_many({f"ner:{key}": entities for key, entities in keys.items()})
+
+    # Must be called with the lock held
+    def _store(self, key: str, entities: Dict[str, Any]) -> None:
+        self._entries[key] = entities
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # Return the entity dicts of a list of references, only running compute (a function from a list of texts
+    # to the list of their entity dicts) on the texts that are not cached yet. Identical texts are computed once.
+    # Empty results (failed extractions) are returned but not cached.
+    # If counts is given, its "hits" entry is increased by the number of texts served without running compute
+    # (cached, or identical to another text of the call) and its "misses" entry by the number of texts computed.
+    def get_or_compute(self, texts: List[str], model_id: str, compute, counts: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        results = self.get_many(texts, model_id)
+        missing: Dict[str, List[int]] = {}
+        for i, (text, entities) in enumerate(zip(texts, results)):
+            if entities is None:
+                missing.setdefault(text, []).append(i)
+        if counts is not None:
+            counts["hits"] = counts.get("hits", 0) + len(texts) - len(missing)
+            counts["misses"] = counts.get("misses", 0) + len(missing)
+        if missing:
+            computed = list(compute(list(missing)))
+            self.set_many({text: entities for text, entities in zip(missing, computed) if entities}, model_id)
+            for positions, entities in zip(missing.values(), computed):
+                results[positions[0]] = entities
+                for i in positions[1:]:
+                    results[i] = copy.deepcopy(entities)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            stats = {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+        if self.disk_cache is not None:
+            stats["disk"] = self.disk_cache.stats()
+        return stats
+
+    # Empty the in-memory cache and reset the counters (the disk cache is kept)
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._disk_hits = self._misses = 0
+
+
+_ner_cache: Optional[NERCache] = None
+_ner_cache_lock = threading.Lock()
+
+
+# Return the NER cache shared by this process, persisted in the app cache directory unless persistent caches are disabled
+def get_ner_cache() -> NERCache:
+    global _ner_cache
+    with _ner_cache_lock:
+        if _ner_cache is None:
+            disk_cache = None
+            cache_path = default_cache_path("ner_entities")
+            if cache_path:
+                try:
+                    disk_cache = DiskCache(cache_path, max_entries=NER_DISK_CACHE_MAX_ENTRIES, max_bytes=NER_DISK_CACHE_MAX_BYTES)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Persistent NER cache disabled: {e}")
+            _ner_cache = NERCache(disk_cache=disk_cache)
+        return _ner_cache
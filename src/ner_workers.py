@@ -0,0 +1,118 @@
+# Pool of worker processes running the NER model, so that reference extraction can use every core of the host
+# and does not hold the GIL of the Streamlit server process.
+#
+# Provided functions:
+# - NERWorkerPool(workers, torch_threads, backend): Worker processes each holding their own warm NER model.
+# - get_ner_worker_pool(): Returns the worker pool configured through environment variables, or None.
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+import multiprocessing
+import os
+import threading
+
+# Number of NER worker processes, can be changed with the ORCID_TOOLBOX_NER_WORKERS environment variable.
+# 0 (the default) runs the model in the app process.
+NER_WORKERS = int(os.environ.get("ORCID_TOOLBOX_NER_WORKERS", "0") or 0)
+
+# Number of torch intra-op threads per worker, can be changed with the ORCID_TOOLBOX_NER_TORCH_THREADS environment
+# variable. 0 (the default) shares the cores of the host evenly between the workers.
+NER_TORCH_THREADS = int(os.environ.get("ORCID_TOOLBOX_NER_TORCH_THREADS", "0") or 0)
+
+NER_BACKENDS = ("transformers", "references_tractor")
+
+# State of a worker process, set by _init_worker
+_worker_backend: Optional[str] = None
+
+
+# Runs once in each worker process: limit the number of threads used by torch, then load the model
+def _init_worker(backend: str, torch_threads: int) -> None:
+    global _worker_backend
+    _worker_backend = backend
+    # Must be set before torch is imported to also limit the OpenMP/MKL thread pools
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(torch_threads)
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    from src import references_matching
+    if backend == "references_tractor":
+        references_matching.get_references_tractor()
+    else:
+        references_matching.get_ner_pipeline()
+
+
+# Entity dicts of a chunk of references, computed in a worker process
+def _extract_chunk(texts: List[str], batch_size: int) -> List[Dict[str, List[str]]]:
+    from src import references_matching
+    if _worker_backend == "references_tractor":
+        return references_matching._process_ner_entities_batch(references_matching.get_references_tractor(), texts, batch_size)
+    return references_matching.extract_ner_entities_batch(texts, batch_size)
+
+
+# Id of the model loaded in the worker processes, as used in NER cache keys
+def _worker_model_id() -> str:
+    from src import references_matching
+    if _worker_backend == "references_tractor":
+        return references_matching._references_tractor_model_id()
+    return references_matching._transformers_model_id()
+
+
+# Worker processes each holding a warm NER model (transformers pipeline or ReferencesTractor instance).
+# References are dispatched in chunks of batch_size and the entity dicts are collected back in order.
+# Workers are started with the "spawn" method, which is safe with torch and with the threads of the app.
+class NERWorkerPool:
+    def __init__(self, workers: int, torch_threads: int = 0, backend: str = "transformers"):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if backend not in NER_BACKENDS:
+            raise ValueError(f"Unknown NER backend '{backend}', expected one of {', '.join(NER_BACKENDS)}")
+        self.workers = workers
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // workers)
+        self.backend = backend
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(backend, self.torch_threads),
+        )
+        self._model_id: Optional[str] = None
+
+    # Entity dicts of a list of references, in the same order
+    def extract(self, texts: List[str], batch_size: int) -> List[Dict[str, List[str]]]:
+        chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = []
+        for chunk_results in self._executor.map(_extract_chunk, chunks, [batch_size] * len(chunks)):
+            results.extend(chunk_results)
+        return results
+
+    def model_id(self) -> str:
+        if self._model_id is None:
+            self._model_id = self._executor.submit(_worker_model_id).result()
+        return self._model_id
+
+    # Start every worker process and load its model ahead of time
+    def warm_up(self) -> None:
+        list(self._executor.map(_extract_chunk, [["warm-up"]] * self.workers, [1] * self.workers))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_ner_worker_pool: Optional[NERWorkerPool] = None
+_ner_worker_pool_lock = threading.Lock()
+
+
+# Return the worker pool shared by this process for the given backend, or None when NER_WORKERS is 0
+def get_ner_worker_pool(backend: str = "transformers") -> Optional[NERWorkerPool]:
+    global _ner_worker_pool
+    if NER_WORKERS < 1:
+        return None
+    with _ner_worker_pool_lock:
+        if _ner_worker_pool is None or _ner_worker_pool.backend != backend:
+            if _ner_worker_pool is not None:
+                _ner_worker_pool.shutdown()
+            _ner_worker_pool = NERWorkerPool(NER_WORKERS, NER_TORCH_THREADS, backend)
+        return _ner_worker_pool
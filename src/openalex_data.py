@@ -1,6 +1,219 @@
-from pyalex import Works
+# Helper functions to look up works in OpenAlex.
+# Queries are built with pyalex and sent through a pooled session, only requesting the fields used by the app.
+# Lookups by DOI and by title are kept in a persistent cache, including the ones that found nothing.
+#
+# Provided functions:
+# - get_openalex_data(doi=None, title=None, journal=None, author=None): Best OpenAlex work for a DOI or a title search.
+# - search_openalex_works(title, journal=None, author=None, limit): Top results of a title search, in a single request.
+# - resolve_openalex_dois(dois, batch_size, max_workers): OpenAlex works of many DOIs, resolved in batches of concurrent requests.
+# - get_openalex_cache(): Returns the persistent cache of OpenAlex lookups, or None if persistent caches are disabled.
 
-def get_openalex_data(doi=None, title=None, journal=None, author=None):
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from pyalex import Works, config
+from src.disk_cache import DiskCache, default_cache_path
+from src.http_utils import RETRY_STATUS_CODES, get_rate_limiter, parse_retry_after
+from src.ner_cache import normalize_reference_text
+from src.orcid_data import normalize_doi
+
+# Base URL of the OpenAlex API, can be changed with the ORCID_TOOLBOX_OPENALEX_API_URL environment variable
+# (e.g. to point the app at the mock server of benchmarks/mock_server.py)
+OPENALEX_API_URL = os.environ.get("ORCID_TOOLBOX_OPENALEX_API_URL", "https://api.openalex.org") or "https://api.openalex.org"
+
+# OpenAlex polite pool quota: 10 requests per second
+OPENALEX_RATE_LIMIT = 10
+OPENALEX_RATE_BURST = 10
+
+# Fields of a work requested from OpenAlex, the only ones used by the app
+OPENALEX_WORK_FIELDS = ["id", "doi", "title", "publication_year", "type", "primary_location", "authorships"]
+
+# Number of results requested by a title search (get_openalex_data keeps the first one)
+OPENALEX_SEARCH_LIMIT = 5
+
+# Number of DOIs resolved by a single request of resolve_openalex_dois: OpenAlex accepts up to 100 values
+# in an OR filter (doi:a|b|c)
+OPENALEX_DOI_BATCH_SIZE = 100
+
+# Maximum number of OpenAlex requests in flight at once in resolve_openalex_dois
+OPENALEX_MAX_WORKERS = 4
+
+# Retries of a request rate limited by OpenAlex or failing with a transient server error
+OPENALEX_MAX_RETRIES = 3
+OPENALEX_BACKOFF_FACTOR = 0.5
+
+# Persistent cache of lookups: works found are kept for OPENALEX_CACHE_TTL seconds, lookups that found nothing
+# for OPENALEX_NEGATIVE_CACHE_TTL seconds, as the work may be added to OpenAlex in the meantime.
+# The least recently used lookups are evicted past the size limits.
+OPENALEX_CACHE_TTL = 30 * 24 * 3600
+OPENALEX_NEGATIVE_CACHE_TTL = 24 * 3600
+OPENALEX_CACHE_MAX_ENTRIES = 200000
+OPENALEX_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+# Pooled session shared by every OpenAlex request of this process
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+        return _session
+
+
+# Send a GET request to the API, path being relative to OPENALEX_API_URL (e.g. "works?search=...").
+# Rate limited and transient failures are retried with exponential backoff and jitter, honouring Retry-After.
+# Returns the decoded JSON response, or None if the API answered 404.
+def _get_json(path: str, params: Optional[Dict[str, Any]] = None, timeout: int = 10) -> Optional[Dict[str, Any]]:
+    base_url = OPENALEX_API_URL.rstrip("/")
+    params = dict(params or {})
+    headers = {}
+    # Same credentials as pyalex: the email address gives access to the polite pool
+    if config.email:
+        params["mailto"] = config.email
+    if config.api_key:
+        params["api_key"] = config.api_key
+    if config.user_agent:
+        headers["User-Agent"] = config.user_agent
+
+    rate_limiter = get_rate_limiter(urlsplit(base_url).netloc, OPENALEX_RATE_LIMIT, OPENALEX_RATE_BURST)
+    url = f"{base_url}/{path.lstrip('/')}"
+    attempt = 0
+    while True:
+        rate_limiter.acquire()
+        try:
+            resp = _get_session().get(url, params=params, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= OPENALEX_MAX_RETRIES:
+                raise
+            time.sleep(random.uniform(0, OPENALEX_BACKOFF_FACTOR * (2 ** attempt)))
+            attempt += 1
+            continue
+        if resp.status_code in RETRY_STATUS_CODES and attempt < OPENALEX_MAX_RETRIES:
+            delay = parse_retry_after(resp.headers.get("Retry-After"))
+            resp.close()
+            time.sleep(delay if delay is not None else random.uniform(0, OPENALEX_BACKOFF_FACTOR * (2 ** attempt)))
+            attempt += 1
+            continue
+        break
+
+    if resp.status_code == 404:
+        return None
+    try:
+        resp.raise_for_status()
+    except requests.HTTPError:
+        raise requests.HTTPError(f"OpenAlex API error {resp.status_code}: {resp.text}")
+    return resp.json()
+
+
+_openalex_cache: Optional[DiskCache] = None
+_openalex_cache_lock = threading.Lock()
+
+
+# Return the cache of OpenAlex lookups shared by this process, or None if persistent caches are disabled
+def get_openalex_cache() -> Optional[DiskCache]:
+    global _openalex_cache
+    with _openalex_cache_lock:
+        if _openalex_cache is None:
+            cache_path = default_cache_path("openalex_works")
+            if cache_path:
+                try:
+                    _openalex_cache = DiskCache(cache_path, max_entries=OPENALEX_CACHE_MAX_ENTRIES, max_bytes=OPENALEX_CACHE_MAX_BYTES)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"OpenAlex cache disabled: {e}")
+        return _openalex_cache
+
+
+# Cache key of a lookup: its kind ("doi" or "search") and normalized arguments, with the requested fields
+# so that changing OPENALEX_WORK_FIELDS does not serve incomplete works
+def _cache_key(kind: str, *values: Optional[str]) -> str:
+    payload = json.dumps([OPENALEX_WORK_FIELDS, *values], ensure_ascii=False)
+    return f"{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def _doi_cache_key(doi: str) -> str:
+    return _cache_key("doi", normalize_doi(doi) or doi.strip().lower())
+
+
+# Titles, journals and author names are compared case-insensitively, whitespace collapsed
+def _search_cache_key(title: str, journal: Optional[str], author: Optional[str]) -> str:
+    return _cache_key("search", *(normalize_reference_text(value).casefold() if value else None for value in (title, journal, author)))
+
+
+# Cached value of a lookup: (True, work or None) if it is cached and fresh, (False, None) otherwise
+def _cache_lookup(cache: Optional[DiskCache], key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    entry = cache.get(key) if cache is not None else None
+    if entry is None or entry["expired"]:
+        return False, None
+    return True, entry["value"]
+
+
+# Cached values of several lookups, as a dict from key to work or None, without the keys not cached or expired
+def _cache_lookup_many(cache: Optional[DiskCache], keys: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    if cache is None:
+        return {}
+    return {key: entry["value"] for key, entry in cache.get_many(keys).items() if not entry["expired"]}
+
+
+def _cache_store(cache: Optional[DiskCache], key: str, work: Optional[Dict[str, Any]]) -> None:
+    _cache_store_many(cache, {key: work})
+
+
+# Store the results of several lookups (a dict from cache key to work or None) in two transactions,
+# works found and works not found having different lifetimes
+def _cache_store_many(cache: Optional[DiskCache], works: Dict[str, Optional[Dict[str, Any]]]) -> None:
+    if cache is None:
+        return
+    cache.set_many({key: work for key, work in works.items() if work is not None}, OPENALEX_CACHE_TTL)
+    cache.set_many({key: work for key, work in works.items() if work is None}, OPENALEX_NEGATIVE_CACHE_TTL)
+
+
+# Path and query string of a pyalex query, relative to the API base URL
+def _query_path(query: Works) -> str:
+    url = urlsplit(query.url)
+    return f"{url.path}?{url.query}" if url.query else url.path
+
+
+def search_openalex_works(title: str, journal: Optional[str] = None, author: Optional[str] = None, limit: int = OPENALEX_SEARCH_LIMIT) -> List[Dict[str, Any]]:
+    """
+    Searches OpenAlex for works matching a title, optionally filtered by journal and author.
+
+    Only the first page of results is requested, with at most `limit` results (1 to 200)
+    and only the fields listed in OPENALEX_WORK_FIELDS: a lookup costs a single request.
+
+    Returns:
+    list: The top results, best first.
+    """
+    if not 1 <= limit <= 200:
+        raise ValueError("limit must be between 1 and 200")
+
+    query = Works().search(title)
+    if journal:
+        query = query.filter(host_venue={'display_name': journal})
+    if author:
+        query = query.filter(author={'search': author})
+    query = query.select(OPENALEX_WORK_FIELDS)
+
+    data = _get_json(_query_path(query), params={"per-page": limit})
+    return data.get("results", []) if data else []
+
+
+def get_openalex_data(doi=None, title=None, journal=None, author=None, use_cache=True):
     """
     Fetches data from OpenAlex for a given DOI or title/journal/author combination.
 
@@ -9,33 +222,104 @@ def get_openalex_data(doi=None, title=None, journal=None, author=None):
     title (str, optional): The title of the work.
     journal (str, optional): The journal name.
     author (str, optional): The author name.
+    use_cache (bool, optional): Whether to use the persistent cache of lookups (see get_openalex_cache).
 
     Returns:
-    dict: A dictionary containing the work's data, or None if not found.
-    
+    dict: A dictionary containing the work's data (the fields listed in OPENALEX_WORK_FIELDS), or None if not found.
+
     Note:
     - If DOI is provided, it will be used directly.
     - If DOI is not provided, you must provide at least a title.
     - Journal and author are optional filters to narrow down results.
+    - A lookup sends a single request: a title search only asks for the first result.
+    - Cached lookups send no request, whether they found a work or not.
     """
+    if not doi and not title:
+        raise ValueError("Either 'doi' or 'title' must be provided")
+
+    cache = get_openalex_cache() if use_cache else None
+    key = _doi_cache_key(doi) if doi else _search_cache_key(title, journal, author)
+    cached, work = _cache_lookup(cache, key)
+    if cached:
+        return work
+
     if doi:
         # Use DOI directly
-        work = Works()[doi]
-        return work if work else None
-    
-    if not title:
-        raise ValueError("Either 'doi' or 'title' must be provided")
-    
-    # Build search query using title, journal, and/or author
-    query = Works().search(title)
-    
-    # Apply filters if provided
-    if journal:
-        query = query.filter(host_venue={'display_name': journal})
-    
-    if author:
-        query = query.filter(author={'search': author})
-    
-    # Get the first result
-    results = list(query)
-    return results[0] if results else None
\ No newline at end of file
+        doi = normalize_doi(doi) or doi
+        work = _get_json(f"works/doi:{quote(doi, safe='/')}", params={"select": ",".join(OPENALEX_WORK_FIELDS)})
+    else:
+        # Get the first result only
+        results = search_openalex_works(title, journal=journal, author=author, limit=1)
+        work = results[0] if results else None
+
+    _cache_store(cache, key, work)
+    return work
+
+
+# OpenAlex works of a batch of normalized DOIs, resolved with a single OR-filter request
+def _resolve_doi_batch(dois: List[str], timeout: int) -> Dict[str, Dict[str, Any]]:
+    params = {
+        "filter": "doi:" + "|".join(dois),
+        "select": ",".join(OPENALEX_WORK_FIELDS),
+        # Room for duplicate works sharing a DOI
+        "per-page": min(200, 2 * len(dois)),
+    }
+    data = _get_json("works", params=params, timeout=timeout)
+    works: Dict[str, Dict[str, Any]] = {}
+    for work in (data or {}).get("results", []):
+        # A DOI can be shared by several OpenAlex works (e.g. duplicates): keep the first, most relevant one
+        works.setdefault(normalize_doi(work.get("doi")), work)
+    return works
+
+
+def resolve_openalex_dois(dois: Iterable[str], batch_size: int = OPENALEX_DOI_BATCH_SIZE, max_workers: int = OPENALEX_MAX_WORKERS, timeout: int = 10, use_cache: bool = True) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Fetches the OpenAlex works of many DOIs, grouping them in OR-filter requests (filter=doi:a|b|c).
+
+    Each request resolves up to `batch_size` DOIs (1 to 100), and up to `max_workers` requests are sent
+    at once, within the polite pool rate limit: resolving the 1,500 DOIs of a profile takes 15 requests.
+    DOIs found in the cache of lookups (see get_openalex_cache) are not requested again.
+
+    Parameters:
+    dois (iterable of str): DOIs in any form accepted by normalize_doi (URL, "doi:" prefix, any case).
+    batch_size (int, optional): Number of DOIs per request.
+    max_workers (int, optional): Maximum number of requests in flight at once.
+    timeout (int, optional): Request timeout in seconds.
+    use_cache (bool, optional): Whether to use the persistent cache of lookups.
+
+    Returns:
+    dict: The work found for each input DOI (the fields listed in OPENALEX_WORK_FIELDS), or None if not found.
+    The keys are the DOIs as given.
+    """
+    if not 1 <= batch_size <= 100:
+        raise ValueError("batch_size must be between 1 and 100")
+
+    cache = get_openalex_cache() if use_cache else None
+    dois = list(dois)
+    normalized = {doi: normalize_doi(doi) for doi in dois}
+
+    works: Dict[str, Optional[Dict[str, Any]]] = {}
+    missing: List[str] = []
+    keys = {value: _doi_cache_key(value) for value in normalized.values() if value}
+    cached = _cache_lookup_many(cache, keys.values())
+    for value, key in keys.items():
+        if key in cached:
+            works[value] = cached[key]
+        else:
+            missing.append(value)
+
+    # DOIs that can be put in a filter: "|" separates the values of the filter and "," the filters
+    batchable = [value for value in missing if not any(c in value for c in "|,")]
+    batches = [batchable[i:i + batch_size] for i in range(0, len(batchable), batch_size)]
+    if batches:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+            for batch, batch_works in zip(batches, executor.map(_resolve_doi_batch, batches, [timeout] * len(batches))):
+                for value in batch:
+                    works[value] = batch_works.get(value)
+                _cache_store_many(cache, {_doi_cache_key(value): works[value] for value in batch})
+
+    for value in missing:
+        if value not in works:
+            works[value] = get_openalex_data(doi=value, use_cache=use_cache)
+
+    return {doi: works.get(value) if value else None for doi, value in normalized.items()}
@@ -3,13 +3,64 @@
 #
 # Provided functions:
 # - fetch_orcid_data(orcid, timeout=10): Fetches publication data for a given ORCID iD.
+# - fetch_orcid_data_many(orcids, max_workers=8, timeout=10): Fetches several ORCID iDs concurrently, yielding results as they complete.
 # - format_timestamp(timestamp, freshness=False): Formats a timestamp to human readable string.
+# - normalize_doi(value): Normalizes a DOI (prefixes, case, trailing punctuation) for comparisons.
+# - parse_orcid_record(data): Extracts the researcher name and publications from a raw ORCID record.
+# - parse_orcid_record_stream(fp): Same as parse_orcid_record, parsing the record incrementally from a file-like object (requires ijson).
+# - ORCIDClient: Pooled HTTP client for the ORCID API with rate limiting and retries, see get_orcid_client().
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from urllib.parse import urlparse
+import importlib.util
+import json
+import os
+import random
 import re
+import sqlite3
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
+from src.disk_cache import DiskCache, default_cache_path
+from src.http_utils import RETRY_STATUS_CODES, RateLimiter, get_rate_limiter, parse_retry_after
+
+# Base URL of the public ORCID API, can be changed with the ORCID_TOOLBOX_ORCID_API_URL environment variable
+# (e.g. to point the app at the mock server of benchmarks/mock_server.py)
+ORCID_API_URL = os.environ.get("ORCID_TOOLBOX_ORCID_API_URL", "https://pub.orcid.org/v3.0") or "https://pub.orcid.org/v3.0"
+
+# ORCID public API quotas: 24 requests per second, with bursts of up to 40 requests
+ORCID_RATE_LIMIT = 24
+ORCID_RATE_BURST = 40
+
+# Maximum number of ORCID requests in flight at once in fetch_orcid_data_many
+ORCID_MAX_WORKERS = 8
+
+# Persistent cache of raw ORCID records: records are served from the cache for ORCID_CACHE_TTL seconds,
+# then revalidated. The least recently used records are evicted past the size limits.
+ORCID_CACHE_TTL = 24 * 3600
+ORCID_CACHE_MAX_ENTRIES = 20000
+ORCID_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Revalidation only reads the head of a response (e.g. the history section, which comes before the person and
+# activities in a record): the members looked for must appear within the first ORCID_HEAD_SCAN_BYTES bytes
+ORCID_HEAD_SCAN_BYTES = 256 * 1024
+
+# Path of the works groups in a record, as seen by the streaming parser
+_WORK_GROUP_PREFIX = "activities-summary.works.group.item"
+
+# Sections of a record kept by the incremental sync, with the endpoint they are fetched from.
+# The person section is at the top of the record, the others in activities-summary.
+ORCID_SYNC_SECTIONS = ["person", "employments", "educations", "fundings", "works"]
+
+# Estimated size of the headers of a request and of its response, to compare the cost of fetching the sections
+# of a record one by one with the cost of fetching the record at once
+ORCID_REQUEST_OVERHEAD_BYTES = 1024
 
 # Format a timestamp (in milliseconds since epoch) to a human-readable date string.
 # If freshness is True, append a colored dot indicating how recent the date is.
@@ -36,6 +87,25 @@ def format_timestamp(timestamp: str, freshness: bool = False, return_status: boo
 	return output_string
 
 _DOI_RE = re.compile(r"(10\.\d{4,9}/\S+)", re.IGNORECASE)
+_DOI_PREFIX_RE = re.compile(r"^(?:https?://)?(?:www\.)?(?:dx\.)?doi\.org/|^doi:\s*", re.IGNORECASE)
+_DOI_BRACKETS = {")": "(", "]": "[", "}": "{"}
+
+# Normalize a DOI for comparisons: strips URL and "doi:" prefixes, surrounding punctuation and whitespace,
+# and lowercases it (DOIs are case insensitive). Returns an empty string if the value does not look like a DOI.
+# A trailing closing bracket is only stripped when it has no opening one in the DOI, as DOIs such as
+# 10.1016/0010-0277(93)90060-3 or 10.1002/(sici)1097-4571(199806)49:8<693::aid-asi4>3.0.co;2-0 contain brackets.
+def normalize_doi(value: Optional[str]) -> str:
+	if not value or not isinstance(value, str):
+		return ""
+	doi = _DOI_PREFIX_RE.sub("", value.strip().lstrip("."))
+	while doi:
+		doi = doi.rstrip(".,;:>\"'")
+		opening = _DOI_BRACKETS.get(doi[-1:])
+		if opening is None or doi.count(opening) >= doi.count(doi[-1]):
+			break
+		doi = doi[:-1]
+	doi = doi.lower()
+	return doi if re.match(r"10\.\d+/", doi) else ""
 
 def _safe_get_title(summary: Dict[str, Any]) -> Optional[str]:
 	# ORCID v3 JSON: title -> title -> value
@@ -90,95 +160,521 @@ def _extract_external_ids(summary: Dict[str, Any]) -> List[Dict[str, str]]:
 		})
 	return out
 
-# Fetches ORCID data including publications for a given ORCID iD.
-# Args:
-#   orcid: ORCID iD in dashed 16-digit form.
-#   timeout: Request timeout in seconds.
-# Returns:
-#   A tuple of (DataFrame, raw_json) where:
-#   - DataFrame contains publication data
-#   - raw_json is the full API response JSON object (or None if error)
-def fetch_orcid_data(orcid: str, timeout: int = 10) -> tuple[pd.DataFrame, Optional[Dict[str, Any]], Optional[str], Optional[str]]:
-	url = f"https://pub.orcid.org/v3.0/{orcid}/record"
-	headers = {"Accept": "application/json"}
+# Columns of the publications DataFrame returned by fetch_orcid_data
+PUBLICATION_COLUMNS = [
+	"put-code",
+	"modified-date",
+	"modified-by",
+	"title",
+	"type",
+	"journal-title",
+	"publication-year",
+	"external-ids",
+	"visibility",
+	"url",
+	"doi"
+]
 
-	resp = requests.get(url, headers=headers, timeout=timeout)
-	if resp.status_code == 404:
-		# No record found for ORCID -> return empty result
-		empty_df = pd.DataFrame(
-			columns=[
-				"put-code",
-				"modified-date",
-				"modified-by",
-				"title",
-				"type",
-				"journal-title",
-				"publication-date",
-				"external-ids",
-				"visibility",
-				"url",
-				"doi"
-			]
-		)
-		return (empty_df, None)
+# Client for the public ORCID API.
+# Owns a pooled requests session (keep-alive, gzip) shared by all threads, applies the ORCID rate limit
+# to every request, and retries transient failures with exponential backoff and jitter, honouring Retry-After.
+# Per-request latency and retry counts are kept in request_log, see stats() for a summary.
+class ORCIDClient:
+	def __init__(
+		self,
+		base_url: str = ORCID_API_URL,
+		timeout: int = 10,
+		max_retries: int = 5,
+		backoff_factor: float = 0.5,
+		max_backoff: float = 30.0,
+		pool_size: int = ORCID_MAX_WORKERS * 2,
+		rate_limiter: Optional[RateLimiter] = None,
+		log_size: int = 1000,
+		cache: Optional[DiskCache] = None,
+		cache_ttl: float = ORCID_CACHE_TTL,
+	):
+		self.base_url = base_url.rstrip("/")
+		self.cache = cache
+		self.cache_ttl = cache_ttl
+		self.timeout = timeout
+		self.max_retries = max_retries
+		self.backoff_factor = backoff_factor
+		self.max_backoff = max_backoff
+		if rate_limiter is None:
+			rate_limiter = get_rate_limiter(urlparse(self.base_url).netloc, ORCID_RATE_LIMIT, ORCID_RATE_BURST)
+		self.rate_limiter = rate_limiter
+
+		self.session = requests.Session()
+		# Retries are handled in get(), the adapter only provides connection pooling
+		adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+		self.session.mount("https://", adapter)
+		self.session.mount("http://", adapter)
+		self.session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+
+		self.request_log: deque = deque(maxlen=log_size)
+		self._log_lock = threading.Lock()
+
+	# Delay before the next attempt: Retry-After if the server sent one, exponential backoff with full jitter otherwise
+	def _retry_delay(self, attempt: int, resp: Optional[requests.Response] = None) -> float:
+		retry_after = parse_retry_after(resp.headers.get("Retry-After")) if resp is not None else None
+		if retry_after is not None:
+			return min(retry_after, self.max_backoff * 4)
+		return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+	# latency is the duration of the last attempt, elapsed includes retries and backoff delays
+	def _log_request(self, url: str, status: Optional[int], latency: float, elapsed: float, retries: int) -> None:
+		with self._log_lock:
+			self.request_log.append({"url": url, "status": status, "latency": latency, "elapsed": elapsed, "retries": retries})
+
+	# Send a GET request to the API, path being relative to base_url (e.g. "0000-0002-5210-7083/record").
+	# Returns the last response, which may still be an error if all retries were used.
+	# Raises requests.RequestException if the last attempt failed at the network level.
+	def get(self, path: str, timeout: Optional[int] = None, **kwargs) -> requests.Response:
+		url = f"{self.base_url}/{path.lstrip('/')}"
+		timeout = timeout if timeout is not None else self.timeout
+		attempt = 0
+		first_started = time.perf_counter()
+		while True:
+			self.rate_limiter.acquire()
+			started = time.perf_counter()
+			try:
+				resp = self.session.get(url, timeout=timeout, **kwargs)
+			except (requests.ConnectionError, requests.Timeout):
+				if attempt >= self.max_retries:
+					now = time.perf_counter()
+					self._log_request(url, None, now - started, now - first_started, attempt)
+					raise
+				time.sleep(self._retry_delay(attempt))
+				attempt += 1
+				continue
+
+			if resp.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+				delay = self._retry_delay(attempt, resp)
+				resp.close()
+				time.sleep(delay)
+				attempt += 1
+				continue
+
+			now = time.perf_counter()
+			self._log_request(url, resp.status_code, now - started, now - first_started, attempt)
+			return resp
+
+	# Fetch the full record of an ORCID iD. Returns None if the record does not exist.
+	# With a cache, records younger than cache_ttl are served without any request. Older ones are revalidated:
+	# with a conditional request if the server sent ETag/Last-Modified headers, otherwise by reading only the
+	# head of the record, up to its history section, and comparing its last-modified-date with the cached copy.
+	def get_record(self, orcid: str, timeout: Optional[int] = None) -> Optional[Dict[str, Any]]:
+		if self.cache is None:
+			return self._download_record(orcid, timeout)
+
+		entry = self.cache.get(orcid)
+		if entry is not None and not entry["expired"]:
+			return entry["value"]
+
+		headers = {}
+		if entry is not None:
+			if entry["meta"].get("etag"):
+				headers["If-None-Match"] = entry["meta"]["etag"]
+			if entry["meta"].get("last-modified"):
+				headers["If-Modified-Since"] = entry["meta"]["last-modified"]
+
+		resp = self.get(f"{orcid}/record", timeout=timeout, headers=headers, stream=True)
+		with resp:
+			if resp.status_code == 304 and entry is not None:
+				self.cache.touch(orcid, self.cache_ttl)
+				return entry["value"]
+			if resp.status_code == 404:
+				return None
+			_raise_for_status(resp)
+
+			body = bytearray()
+			chunks = resp.iter_content(chunk_size=16384)
+			if entry is not None and entry["meta"].get("history-last-modified"):
+				# Read until the history section is found, and stop there if the record did not change
+				head = _read_json_head(chunks, body, ["history"])
+				if "history" in head and _history_last_modified(head) == entry["meta"]["history-last-modified"]:
+					self.cache.touch(orcid, self.cache_ttl)
+					return entry["value"]
+			for chunk in chunks:
+				body += chunk
+			data = json.loads(bytes(body))
+
+		self.cache.set(orcid, data, self.cache_ttl, {
+			"etag": resp.headers.get("ETag"),
+			"last-modified": resp.headers.get("Last-Modified"),
+			"history-last-modified": _history_last_modified(data),
+		})
+		return data
+
+	# Download the full record of an ORCID iD, without going through the cache. Returns None if the record does not exist.
+	def _download_record(self, orcid: str, timeout: Optional[int] = None) -> Optional[Dict[str, Any]]:
+		status, data, _, _ = self._get_json(f"{orcid}/record", timeout)
+		return data if status == 200 else None
+
+	# Send a GET request for a JSON document, conditional if etag is given, and read the whole response so that the
+	# connection goes back to the pool. Returns a tuple (status, data, etag, size) where status is 200, 304 or 404,
+	# data the decoded document (None unless status is 200) and size the length of the body in bytes.
+	def _get_json(self, path: str, timeout: Optional[int] = None, etag: Optional[str] = None) -> tuple[int, Optional[Any], Optional[str], int]:
+		headers = {"If-None-Match": etag} if etag else {}
+		with self.get(path, timeout=timeout, headers=headers) as resp:
+			if resp.status_code in (304, 404):
+				return (resp.status_code, None, etag, 0)
+			_raise_for_status(resp)
+			return (200, resp.json(), resp.headers.get("ETag"), len(resp.content))
+
+	# Incremental variant of get_record, keeping a snapshot of the parts of the record used by the app:
+	# its identifier, history, person, and the works, employments, educations and fundings summaries.
+	# The first call downloads the full record, only keeping its snapshot in the cache, with the ETag and size of
+	# the record and the size of each section. Once the snapshot is older than cache_ttl, it is revalidated with:
+	# - a conditional request for the record, if the server sent an ETag for it;
+	# - otherwise, requests for the section summary endpoints (conditional for the sections that came with an ETag),
+	#   if they cost less than the record: the sections at the last sync plus ORCID_REQUEST_OVERHEAD_BYTES per request;
+	# - otherwise, a download of the full record.
+	# A section missing from the record or not found keeps its previous value, or an empty dict.
+	# Without a cache, this is the same as get_record.
+	def sync_record(self, orcid: str, timeout: Optional[int] = None) -> Optional[Dict[str, Any]]:
+		if self.cache is None:
+			return self.get_record(orcid, timeout)
+
+		key = f"sync:{orcid}"
+		entry = self.cache.get(key)
+		if entry is not None and not entry["expired"]:
+			return entry["value"]
+
+		etag = None
+		if entry is not None:
+			meta = entry["meta"]
+			if meta.get("etag"):
+				etag = meta["etag"]
+			elif meta.get("size") and _sections_cost(meta) < meta["size"]:
+				return self._sync_sections(orcid, key, entry["value"], meta, timeout)
+
+		status, record, etag, size = self._get_json(f"{orcid}/record", timeout, etag)
+		if status == 304:
+			self.cache.touch(key, self.cache_ttl)
+			return entry["value"]
+		if status == 404:
+			self.cache.delete(key)
+			return None
+
+		snapshot = _record_snapshot(record)
+		activities = snapshot["activities-summary"]
+		self.cache.set(key, snapshot, self.cache_ttl, {
+			"etag": etag,
+			"size": size,
+			"sections": {
+				section: {"etag": None, "size": len(json.dumps(snapshot[section] if section == "person" else activities[section]))}
+				for section in ORCID_SYNC_SECTIONS
+			},
+		})
+		return snapshot
+
+	# Revalidate each section of a snapshot with its summary endpoint, see sync_record
+	def _sync_sections(self, orcid: str, key: str, snapshot: Dict[str, Any], meta: Dict[str, Any], timeout: Optional[int] = None) -> Dict[str, Any]:
+		activities = snapshot.setdefault("activities-summary", {})
+		sections = dict(meta.get("sections") or {})
+		for section in ORCID_SYNC_SECTIONS:
+			parent = snapshot if section == "person" else activities
+			previous = sections.get(section) or {}
+			status, data, etag, size = self._get_json(f"{orcid}/{section}", timeout, previous.get("etag"))
+			if status == 200 and data is not None:
+				parent[section] = data
+				sections[section] = {"etag": etag, "size": size}
+			else:
+				parent[section] = parent.get(section) or {}
+		self.cache.set(key, snapshot, self.cache_ttl, {**meta, "sections": sections})
+		return snapshot
+
+	# Summary of the requests sent so far (within the last log_size requests)
+	def stats(self) -> Dict[str, Any]:
+		with self._log_lock:
+			log = list(self.request_log)
+		latencies = sorted(entry["latency"] for entry in log)
+		return {
+			"requests": len(log),
+			"retries": sum(entry["retries"] for entry in log),
+			"errors": sum(1 for entry in log if entry["status"] is None or entry["status"] >= 400),
+			"mean_latency": sum(latencies) / len(latencies) if latencies else None,
+			"max_latency": latencies[-1] if latencies else None,
+			"total_elapsed": sum(entry["elapsed"] for entry in log),
+		}
+
+
+def _raise_for_status(resp: requests.Response) -> None:
 	try:
 		resp.raise_for_status()
 	except requests.HTTPError:
 		# Attach response text for easier debugging
 		raise requests.HTTPError(f"ORCID API error {resp.status_code}: {resp.text}")
 
-	data = resp.json()
 
+# Last modification of a record according to its history section, in milliseconds since epoch
+def _history_last_modified(data: Dict[str, Any]) -> Optional[int]:
+	value = ((data.get("history") or {}).get("last-modified-date") or {}).get("value")
+	return int(value) if value is not None else None
+
+
+# Decode top-level members of a JSON object from the start of a streamed body, without reading the rest of it.
+# Chunks are appended to body until every member in keys has been decoded or max_bytes have been read,
+# so that the caller can keep reading the remaining chunks if it needs the whole document.
+# Members that could not be found in the head are missing from the returned dict.
+def _read_json_head(chunks: Iterator[bytes], body: bytearray, keys: List[str], max_bytes: int = ORCID_HEAD_SCAN_BYTES) -> Dict[str, Any]:
+	decoder = json.JSONDecoder()
+	members: Dict[str, Any] = {}
+	for chunk in chunks:
+		body += chunk
+		for key in keys:
+			if key in members:
+				continue
+			match = re.search(rb'"' + re.escape(key.encode("utf-8")) + rb'"\s*:\s*', body)
+			if match is None:
+				continue
+			try:
+				members[key], _ = decoder.raw_decode(body[match.end():].decode("utf-8", errors="replace"))
+			except json.JSONDecodeError:
+				# Value not fully received yet
+				continue
+		if len(members) == len(keys) or len(body) >= max_bytes:
+			break
+	return members
+
+
+# Keep only the parts of a record used by the app, see ORCIDClient.sync_record
+def _record_snapshot(record: Dict[str, Any]) -> Dict[str, Any]:
+	activities = record.get("activities-summary") or {}
+	return {
+		"orcid-identifier": record.get("orcid-identifier"),
+		"history": record.get("history"),
+		"person": record.get("person") or {},
+		"activities-summary": {section: activities.get(section) or {} for section in ORCID_SYNC_SECTIONS if section != "person"},
+	}
+
+
+# Expected number of bytes downloaded to revalidate the sections of a snapshot one by one, from their sizes at the last sync
+def _sections_cost(meta: Dict[str, Any]) -> int:
+	sections = meta.get("sections") or {}
+	return sum((sections.get(section) or {}).get("size", 0) + ORCID_REQUEST_OVERHEAD_BYTES for section in ORCID_SYNC_SECTIONS)
+
+
+# Client shared by every session of the app running in this process
+_orcid_client: Optional[ORCIDClient] = None
+_orcid_client_lock = threading.Lock()
+
+# Return the ORCID client shared by this process, creating it on first use.
+# It keeps records in the persistent cache unless caches are disabled or the cache cannot be opened.
+def get_orcid_client() -> ORCIDClient:
+	global _orcid_client
+	with _orcid_client_lock:
+		if _orcid_client is None:
+			cache = None
+			cache_path = default_cache_path("orcid_records")
+			if cache_path:
+				try:
+					cache = DiskCache(cache_path, max_entries=ORCID_CACHE_MAX_ENTRIES, max_bytes=ORCID_CACHE_MAX_BYTES)
+				except (OSError, sqlite3.Error) as e:
+					print(f"ORCID record cache disabled: {e}")
+			_orcid_client = ORCIDClient(cache=cache)
+		return _orcid_client
+
+
+# Full name of the researcher, from the person section of a record
+def _researcher_name(data: Dict[str, Any]) -> str:
 	researcher_givenname = data.get("person", {}).get("name", {}).get("given-names", {}).get("value", "")
 	researcher_familyname = data.get("person", {}).get("name", {}).get("family-name", {}).get("value", "")
-	researcher_name = f"{researcher_givenname} {researcher_familyname}".strip()
+	return f"{researcher_givenname} {researcher_familyname}".strip()
 
-	groups = data.get("activities-summary", {}).get("works", {}).get("group", {}) if isinstance(data, dict) else []
-	publications: List[Dict[str, Any]] = []
 
-	for group in groups or []:
-		# Each group contains grouped work objects. The first one is the one picked by the user.
-		summaries = group.get("work-summary") or []
-		if not summaries:
-			continue
-		summary = summaries[0]
+# UTC offsets of the local timezone, in seconds, at the given Unix times (in seconds).
+# Vectorized equivalent of datetime.fromtimestamp: the local offset is sampled once a day over the range
+# of the input, each change (DST or zone rule) is then located to the second by bisection.
+def _local_utc_offsets(seconds: np.ndarray) -> np.ndarray:
+	day = 86400
+	grid = np.arange(int(seconds.min()) // day * day - day, int(seconds.max()) + 2 * day, day)
+	grid_offsets = np.array([time.localtime(t).tm_gmtoff for t in grid.tolist()])
+	transitions = [int(grid[0])]
+	transition_offsets = [int(grid_offsets[0])]
+	for i in np.flatnonzero(grid_offsets[1:] != grid_offsets[:-1]).tolist():
+		low, high = int(grid[i]), int(grid[i + 1])
+		while high - low > 1:
+			middle = (low + high) // 2
+			if time.localtime(middle).tm_gmtoff == grid_offsets[i]:
+				low = middle
+			else:
+				high = middle
+		transitions.append(high)
+		transition_offsets.append(int(grid_offsets[i + 1]))
+	index = np.searchsorted(np.array(transitions), seconds, side="right") - 1
+	return np.array(transition_offsets)[index]
+
+
+# Format timestamps (in milliseconds since epoch, or None) as local dates, same output as format_timestamp
+def _local_dates(timestamps: List[Optional[float]]) -> List[Optional[str]]:
+	values = pd.to_numeric(pd.Series(timestamps, dtype=object), errors="coerce").to_numpy(dtype="float64")
+	present = ~np.isnan(values)
+	dates: List[Optional[str]] = [None] * len(values)
+	if present.any():
+		seconds = np.floor(values[present] / 1000).astype("int64")
+		local_days = (seconds + _local_utc_offsets(seconds)) // 86400
+		for i, date in zip(np.flatnonzero(present).tolist(), np.datetime_as_string(local_days.astype("datetime64[D]")).tolist()):
+			dates[i] = date
+	return dates
 
+
+# Build the publications DataFrame from work summaries, consumed one at a time.
+# Values are collected column by column in a single pass; modification dates are converted all at once
+# (same result as format_timestamp), and the type and visibility columns are stored as categoricals.
+def _publications_dataframe(summaries: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+	columns: Dict[str, List[Any]] = {column: [] for column in PUBLICATION_COLUMNS}
+	modified_timestamps: List[Optional[float]] = []
+
+	for summary in summaries:
 		external_ids = _extract_external_ids(summary)
-		dois = [e["doi"] for e in external_ids if e.get("doi")]
-
-		pub: Dict[str, Any] = {
-			"put-code": summary.get("put-code"),
-			"modified-date": format_timestamp(summary.get("last-modified-date", {}).get("value")) if summary.get("last-modified-date") else None,
-			"modified-by": summary.get("source", {}).get("source-name", {}).get("value"),
-			"title": _safe_get_title(summary),
-			"type": summary.get("type"),
-			"journal-title": summary.get("journal-title", {}).get("value") if summary.get("journal-title") else None,
-			"publication-year": summary.get("publication-date", {}).get("year", {}).get("value") if summary.get("publication-date") else None,
-			"external-ids": _extract_external_ids(summary),
-			"visibility": summary.get("visibility"),
-			"url": summary.get("url", {}).get("value") if summary.get("url") else None,
-			"doi": dois[0] if dois else None,
-		}
-		publications.append(pub)
+		doi = next((e["doi"] for e in external_ids if e.get("doi")), None)
+		modified = summary.get("last-modified-date")
 
-	# Build a DataFrame from the extracted publications
-	df = pd.DataFrame(publications)
+		columns["put-code"].append(summary.get("put-code"))
+		modified_timestamps.append(modified.get("value") if modified else None)
+		columns["modified-by"].append(summary.get("source", {}).get("source-name", {}).get("value"))
+		columns["title"].append(_safe_get_title(summary))
+		columns["type"].append(summary.get("type"))
+		columns["journal-title"].append(summary.get("journal-title", {}).get("value") if summary.get("journal-title") else None)
+		columns["publication-year"].append(summary.get("publication-date", {}).get("year", {}).get("value") if summary.get("publication-date") else None)
+		columns["external-ids"].append(external_ids)
+		columns["visibility"].append(summary.get("visibility"))
+		columns["url"].append(summary.get("url", {}).get("value") if summary.get("url") else None)
+		columns["doi"].append(doi)
 
-	if df.empty:
+	if not modified_timestamps:
 		# Ensure an empty DataFrame has the expected columns
-		df = pd.DataFrame(
-			columns=[
-				"put-code",
-				"modified-date",
-				"modified-by",
-				"title",
-				"type",
-				"journal-title",
-				"publication-year",
-				"external-ids",
-				"visibility",
-				"url",
-				"doi"
-			]
-		)
-	return (df, data, orcid, researcher_name)
\ No newline at end of file
+		return pd.DataFrame(columns=PUBLICATION_COLUMNS)
+
+	columns["modified-date"] = _local_dates(modified_timestamps)
+
+	df = pd.DataFrame(columns)
+	df["type"] = df["type"].astype("category")
+	df["visibility"] = df["visibility"].astype("category")
+	return df
+
+
+# Extracts the researcher name and publications from an ORCID record.
+# Returns a tuple of (DataFrame, researcher_name).
+def parse_orcid_record(data: Dict[str, Any]) -> tuple[pd.DataFrame, str]:
+	groups = data.get("activities-summary", {}).get("works", {}).get("group", {}) if isinstance(data, dict) else []
+
+	def work_summaries() -> Iterator[Dict[str, Any]]:
+		for group in groups or []:
+			# Each group contains grouped work objects. The first one is the one picked by the user.
+			summaries = group.get("work-summary") or []
+			if summaries:
+				yield summaries[0]
+
+	return (_publications_dataframe(work_summaries()), _researcher_name(data))
+
+
+# Streaming parse of a raw ORCID record read from a binary file-like object, requires the optional ijson package.
+# Yields the first work summary of each works group as soon as its group has been parsed, so that only one
+# group is held in memory at a time. The rest of the record is assembled into skeleton, with an empty list in
+# place of activities-summary.works.group; it is complete once the generator is exhausted.
+def iter_record_work_summaries(fp: Any, skeleton: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+	import ijson
+	from ijson.common import ObjectBuilder
+
+	record_builder = ObjectBuilder()
+	group_builder: Optional[ObjectBuilder] = None
+	for prefix, event, value in ijson.parse(fp, use_float=True):
+		if prefix == _WORK_GROUP_PREFIX or prefix.startswith(_WORK_GROUP_PREFIX + "."):
+			if group_builder is None:
+				group_builder = ObjectBuilder()
+			group_builder.event(event, value)
+			if prefix == _WORK_GROUP_PREFIX and event in ("end_map", "end_array"):
+				group = group_builder.value
+				group_builder = None
+				# Each group contains grouped work objects. The first one is the one picked by the user.
+				summaries = group.get("work-summary") if isinstance(group, dict) else None
+				if summaries:
+					yield summaries[0]
+			continue
+		record_builder.event(event, value)
+
+	skeleton.clear()
+	if isinstance(getattr(record_builder, "value", None), dict):
+		skeleton.update(record_builder.value)
+
+
+# Streaming variant of parse_orcid_record, reading the record from a binary file-like object (see iter_record_work_summaries).
+# Returns a tuple of (DataFrame, record, researcher_name), where record is the raw record without its works groups.
+def parse_orcid_record_stream(fp: Any) -> tuple[pd.DataFrame, Dict[str, Any], str]:
+	skeleton: Dict[str, Any] = {}
+	df = _publications_dataframe(iter_record_work_summaries(fp, skeleton))
+	return (df, skeleton, _researcher_name(skeleton))
+
+
+# Fetches ORCID data including publications for a given ORCID iD.
+# Args:
+#   orcid: ORCID iD in dashed 16-digit form.
+#   timeout: Request timeout in seconds.
+#   client: ORCID API client to use, defaults to the client shared by this process.
+#   incremental: Use the incremental sync (see ORCIDClient.sync_record): raw_json then only holds the
+#     identifier, history, person, works, employments, educations and fundings sections of the record.
+#   stream: Parse the response as it is downloaded instead of loading the whole JSON document first, if the
+#     ijson package is available. Meant for very large records: the cache is bypassed, and the works groups
+#     are left out of raw_json (the DataFrame is the same).
+# Returns:
+#   A tuple of (DataFrame, raw_json, orcid, researcher_name) where:
+#   - DataFrame contains publication data
+#   - raw_json is the full API response JSON object (or None if no record was found)
+def fetch_orcid_data(orcid: str, timeout: int = 10, client: Optional[ORCIDClient] = None, incremental: bool = False, stream: bool = False) -> tuple[pd.DataFrame, Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+	if client is None:
+		client = get_orcid_client()
+
+	if stream and not incremental and importlib.util.find_spec("ijson"):
+		with client.get(f"{orcid}/record", timeout=timeout, stream=True) as resp:
+			if resp.status_code == 404:
+				return (pd.DataFrame(columns=PUBLICATION_COLUMNS), None, orcid, None)
+			_raise_for_status(resp)
+			resp.raw.decode_content = True
+			df, data, researcher_name = parse_orcid_record_stream(resp.raw)
+		return (df, data, orcid, researcher_name)
+
+	if incremental:
+		data = client.sync_record(orcid, timeout=timeout)
+	else:
+		data = client.get_record(orcid, timeout=timeout)
+	if data is None:
+		# No record found for ORCID -> return empty result
+		return (pd.DataFrame(columns=PUBLICATION_COLUMNS), None, orcid, None)
+
+	df, researcher_name = parse_orcid_record(data)
+	return (df, data, orcid, researcher_name)
+
+# Fetches several ORCID iDs concurrently.
+# Args:
+#   orcids: ORCID iDs in dashed 16-digit form.
+#   max_workers: Maximum number of requests in flight at once.
+#   timeout: Request timeout in seconds.
+#   client: ORCID API client to use, defaults to the client shared by this process.
+#     The client applies the ORCID API rate limit to every request.
+#   incremental: Use the incremental sync, see fetch_orcid_data.
+# Yields:
+#   A tuple (orcid, result, error) for each ORCID iD, in order of completion, where result is the
+#   tuple returned by fetch_orcid_data (or None if the request failed) and error the raised exception (or None).
+def fetch_orcid_data_many(orcids: List[str], max_workers: int = ORCID_MAX_WORKERS, timeout: int = 10, client: Optional[ORCIDClient] = None, incremental: bool = False) -> Iterator[tuple[str, Optional[tuple], Optional[Exception]]]:
+	if not orcids:
+		return
+	if client is None:
+		client = get_orcid_client()
+
+	# When the caller stops iterating (e.g. a Streamlit rerun), the requests not started yet are cancelled
+	# and the generator returns without waiting for the ones in progress
+	executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(orcids))))
+	try:
+		futures = {executor.submit(fetch_orcid_data, orcid, timeout, client, incremental): orcid for orcid in orcids}
+		for future in as_completed(futures):
+			# Drop the future once its result is handed over, so results do not pile up in memory
+			orcid = futures.pop(future)
+			try:
+				yield (orcid, future.result(), None)
+			except Exception as e:
+				yield (orcid, None, e)
+	finally:
+		executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,219 @@
+# Bulk export of the works of many ORCID profiles to a columnar dataset (Parquet or Arrow IPC files).
+# Reuses the fetching and parsing of src/orcid_data.py; profiles are written to disk in parts as they
+# arrive, so memory use stays flat whatever the number of profiles.
+#
+# Provided functions:
+# - export_orcid_works(orcids, path, format="parquet", profiles_per_part=200, overwrite=False): Fetches the ORCID iDs and writes their works under path.
+# - works_table(orcid, person_name, df): Converts the publications DataFrame of a profile to an Arrow table.
+#
+# Command line, from the repository root:
+#   python -m src.orcid_export orcids.txt output_dir [--format parquet|arrow] [--overwrite]
+
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import pandas as pd
+import pyarrow as pa
+from src.orcid_data import ORCID_MAX_WORKERS, ORCIDClient, fetch_orcid_data_many
+
+EXPORT_FORMATS = {"parquet": "parquet", "arrow": "arrow"}
+
+# One entry of the external-ids column, as built by _extract_external_ids
+EXTERNAL_ID_TYPE = pa.struct([
+    ("type", pa.string()),
+    ("value", pa.string()),
+    ("url", pa.string()),
+    ("doi", pa.string()),
+])
+
+# Schema of the exported works, one row per work, keyed by ORCID iD
+WORKS_SCHEMA = pa.schema([
+    ("orcid", pa.string()),
+    ("person-name", pa.string()),
+    ("put-code", pa.int64()),
+    ("modified-date", pa.date32()),
+    ("modified-by", pa.string()),
+    ("title", pa.string()),
+    ("type", pa.dictionary(pa.int32(), pa.string())),
+    ("journal-title", pa.string()),
+    ("publication-year", pa.string()),
+    ("external-ids", pa.list_(EXTERNAL_ID_TYPE)),
+    ("visibility", pa.dictionary(pa.int32(), pa.string())),
+    ("url", pa.string()),
+    ("doi", pa.string()),
+])
+
+
+def _column(df: pd.DataFrame, name: str) -> List[Any]:
+    return [value if value is not None and not (isinstance(value, float) and pd.isna(value)) else None for value in df[name].tolist()]
+
+
+# Convert the publications DataFrame of a profile (see fetch_orcid_data) to an Arrow table following WORKS_SCHEMA
+def works_table(orcid: str, person_name: Optional[str], df: pd.DataFrame) -> pa.Table:
+    rows = len(df)
+    if rows == 0:
+        return WORKS_SCHEMA.empty_table()
+
+    external_ids = [
+        [{key: entry.get(key) for key in ("type", "value", "url", "doi")} for entry in ids] if isinstance(ids, list) else None
+        for ids in df["external-ids"].tolist()
+    ]
+    modified_dates = pd.to_datetime(pd.Series(_column(df, "modified-date"), dtype=object), format="%Y-%m-%d").dt.date
+    columns = {
+        "orcid": pa.array([orcid] * rows, pa.string()),
+        "person-name": pa.array([person_name] * rows, pa.string()),
+        "put-code": pa.array([int(value) if value is not None else None for value in _column(df, "put-code")], pa.int64()),
+        "modified-date": pa.array(modified_dates.where(modified_dates.notna(), None).tolist(), pa.date32()),
+        "modified-by": pa.array(_column(df, "modified-by"), pa.string()),
+        "title": pa.array(_column(df, "title"), pa.string()),
+        "type": pa.array(_column(df, "type"), pa.string()).dictionary_encode(),
+        "journal-title": pa.array(_column(df, "journal-title"), pa.string()),
+        "publication-year": pa.array(_column(df, "publication-year"), pa.string()),
+        "external-ids": pa.array(external_ids, pa.list_(EXTERNAL_ID_TYPE)),
+        "visibility": pa.array(_column(df, "visibility"), pa.string()).dictionary_encode(),
+        "url": pa.array(_column(df, "url"), pa.string()),
+        "doi": pa.array(_column(df, "doi"), pa.string()),
+    }
+    return pa.table(columns, schema=WORKS_SCHEMA)
+
+
+def _write_part(tables: List[pa.Table], path: str, part: int, format: str) -> str:
+    # Dictionaries differ between profiles, unify them so the part has a single dictionary per column
+    table = pa.concat_tables(tables).unify_dictionaries().combine_chunks()
+    filename = os.path.join(path, f"part-{part:05d}.{EXPORT_FORMATS[format]}")
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, filename, compression="zstd")
+    else:
+        with pa.OSFile(filename, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return filename
+
+
+# Fetches the works of many ORCID iDs and writes them as a columnar dataset.
+# Args:
+#   orcids: ORCID iDs in dashed 16-digit form.
+#   path: Output directory, created if needed; one part-NNNNN file is written per profiles_per_part profiles.
+#     The parts are written to a temporary directory next to it and only moved there once the export is complete.
+#   format: "parquet" (zstd compressed) or "arrow" (Arrow IPC file format).
+#   profiles_per_part: Number of profiles buffered in memory before a part is written.
+#   max_workers, client, incremental: Passed to fetch_orcid_data_many.
+#   progress_callback: Called with (done, total) after each profile.
+#   overwrite: Replace the part-* files of a previous export in path. Without it, a path that is not an empty
+#     directory raises FileExistsError, so that two exports are never read back as one dataset.
+# Returns:
+#   A dict with the number of exported profiles and works, the written files, and the ORCID iDs that failed.
+# The files can be read back as one dataset, e.g. with pyarrow.dataset.dataset(path, format=format).
+def export_orcid_works(
+    orcids: List[str],
+    path: str,
+    format: str = "parquet",
+    profiles_per_part: int = 200,
+    max_workers: int = ORCID_MAX_WORKERS,
+    client: Optional[ORCIDClient] = None,
+    incremental: bool = False,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{format}', expected one of {', '.join(EXPORT_FORMATS)}")
+    if os.path.exists(path) and not overwrite and (not os.path.isdir(path) or os.listdir(path)):
+        raise FileExistsError(f"Export directory '{path}' is not empty, use overwrite=True to replace its contents")
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(os.path.abspath(path))}-", dir=parent)
+    # mkdtemp creates a private directory, which becomes the output directory if path does not exist yet
+    os.chmod(staging, 0o755)
+    try:
+        summary = _export_parts(orcids, staging, format, profiles_per_part, max_workers, client, incremental, progress_callback)
+        summary["files"] = _publish_parts(staging, path, summary["files"])
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return summary
+
+
+# Move the parts written in the staging directory to path, removing the part files of a previous export
+def _publish_parts(staging: str, path: str, files: List[str]) -> List[str]:
+    if not os.path.exists(path):
+        os.rename(staging, path)
+        return [os.path.join(path, os.path.basename(filename)) for filename in files]
+    published = []
+    for filename in files:
+        target = os.path.join(path, os.path.basename(filename))
+        os.replace(filename, target)
+        published.append(target)
+    for stale in set(glob.glob(os.path.join(path, "part-*"))) - set(published):
+        os.remove(stale)
+    return published
+
+
+def _export_parts(
+    orcids: List[str],
+    path: str,
+    format: str,
+    profiles_per_part: int,
+    max_workers: int,
+    client: Optional[ORCIDClient],
+    incremental: bool,
+    progress_callback: Optional[Callable[[int, int], None]],
+) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"profiles": 0, "works": 0, "files": [], "failed": []}
+    pending: List[pa.Table] = []
+    done = 0
+    for orcid, result, error in fetch_orcid_data_many(orcids, max_workers=max_workers, client=client, incremental=incremental):
+        done += 1
+        if error is not None or result[1] is None:
+            summary["failed"].append(orcid)
+        else:
+            df, raw, orcid_output, person_name = result
+            pending.append(works_table(orcid, person_name, df))
+            summary["profiles"] += 1
+            summary["works"] += len(df)
+            if len(pending) >= profiles_per_part:
+                summary["files"].append(_write_part(pending, path, len(summary["files"]), format))
+                pending = []
+        if progress_callback:
+            progress_callback(done, len(orcids))
+
+    if pending or not summary["files"]:
+        summary["files"].append(_write_part(pending or [WORKS_SCHEMA.empty_table()], path, len(summary["files"]), format))
+    return summary
+
+
+# Read ORCID iDs from a text file, separated by commas or newlines, ignoring comments starting with #
+def read_orcid_file(filename: str) -> List[str]:
+    orcids: List[str] = []
+    with open(filename, encoding="utf-8") as f:
+        for line in f:
+            for orcid in line.split("#")[0].split(","):
+                if orcid.strip() and orcid.strip() not in orcids:
+                    orcids.append(orcid.strip())
+    return orcids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the works of a list of ORCID profiles to Parquet or Arrow files.")
+    parser.add_argument("orcid_file", help="Text file with ORCID iDs, separated by commas or one per line")
+    parser.add_argument("output", help="Output directory")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="parquet")
+    parser.add_argument("--profiles-per-part", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=ORCID_MAX_WORKERS)
+    parser.add_argument("--overwrite", action="store_true", help="Replace a previous export in the output directory")
+    args = parser.parse_args()
+
+    orcids = read_orcid_file(args.orcid_file)
+    summary = export_orcid_works(
+        orcids, args.output, format=args.format, profiles_per_part=args.profiles_per_part, max_workers=args.workers,
+        progress_callback=lambda done, total: print(f"\r{done}/{total}", end="", flush=True), overwrite=args.overwrite,
+    )
+    print(f"\n{summary['profiles']} profiles, {summary['works']} works written to {len(summary['files'])} file(s) in {args.output}")
+    if summary["failed"]:
+        print(f"Failed: {', '.join(summary['failed'])}")
+
+
+if __name__ == "__main__":
+    main()
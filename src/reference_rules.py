@@ -0,0 +1,118 @@
+# Fast deterministic extraction of the main entities of a reference (title, year, journal, volume, pages, DOI),
+# for the common APA and Vancouver layouts of journal articles.
+# Used by the tiered extraction mode of references_matching to skip the NER model for references it parses reliably.
+#
+# Provided functions:
+# - extract_rule_entities(text): Entity dict in the format of the NER stage, and a confidence between 0 and 1.
+# - find_doi(text): First DOI found in a text.
+
+from typing import Dict, List, Tuple
+import re
+import time
+
+# Minimum confidence of extract_rule_entities for a reference to skip the NER model
+RULES_MIN_CONFIDENCE = 0.9
+
+# Minimum number of words of a title for the reference to be parsed reliably
+RULES_MIN_TITLE_WORDS = 3
+
+# Confidence of a reference following a supported layout whose title contains a sentence break: the title may as well
+# end at that break, with an abbreviated journal name ("J. Educ. Psychol.") making up the rest, so the NER model decides
+RULES_AMBIGUOUS_CONFIDENCE = 0.6
+
+_DOI_RE = re.compile(r"\b10\.\d{4,9}/[^\s\"<>]+")
+_DOI_TRAILING = ".,;:)]}>'\""
+
+# Title: at least 10 characters, ending with ., ? or ! after a lowercase letter, a digit or a closing bracket
+# (so that author initials or abbreviations do not end it)
+_TITLE = r"(?P<title>.{10,}?[a-z0-9)\]][.?!])"
+_VOLUME_ISSUE = r"(?P<volume>\d+)(?:\s*\((?P<issue>[^)]+)\))?"
+_PAGES = r"(?P<page_first>[A-Za-z]?\d+)(?:\s*[-–—]\s*(?P<page_last>[A-Za-z]?\d+))?"
+_DOI_SUFFIX = r"(?:\s+(?:https?://(?:dx\.)?doi\.org/|doi:\s*)\S+)?"
+# End of a sentence followed by another one: a journal name never contains one, so that a title with a subtitle
+# sentence ("Question? Subtitle." or "Title. Subtitle.") is not split between the title and the journal
+_SENTENCE_BREAK = r"[.?!]\s+[A-Z]"
+_SENTENCE_BREAK_RE = re.compile(_SENTENCE_BREAK)
+
+# Author, A., & Author, B. (2020). Title. Journal, 12(3), 45–67. https://doi.org/...
+_APA_RE = re.compile(
+    r"^(?P<authors>[^()]+?)\s*\((?P<year>(?:1[89]|20)\d{2})[a-z]?\)\.?\s+" + _TITLE + r"\s+"
+    r"(?P<journal>[A-Z](?:(?!" + _SENTENCE_BREAK + r")[^,])*?),\s*" + _VOLUME_ISSUE + r"(?:,\s*" + _PAGES + r")?\.?" + _DOI_SUFFIX + r"\s*$"
+)
+
+# Author A, Author B. Title. Journal. 2020 Jan 5;12(3):45-67. doi:...
+_VANCOUVER_RE = re.compile(
+    r"^(?P<authors>[^.]+?)\.\s+" + _TITLE + r"\s+"
+    r"(?P<journal>[A-Z](?:(?!" + _SENTENCE_BREAK + r")[^;])*?)\.?\s+(?P<year>(?:1[89]|20)\d{2})(?:\s+[A-Z][a-z]{2}(?:\s+\d{1,2})?)?;\s*"
+    + _VOLUME_ISSUE + r":\s*" + _PAGES + r"\.?" + _DOI_SUFFIX + r"\s*$"
+)
+
+_LAYOUTS = (_APA_RE, _VANCOUVER_RE)
+
+# Containers that are not journals: chapters ("In Editor (Ed.), Book") and conference proceedings,
+# whose pages and volume do not follow the journal layouts even when the reference looks like one
+_NON_JOURNAL_RE = re.compile(r"^In\b|\b(?:Proceedings|Conference|Symposium|Workshop|Congress)\b")
+
+# A volume that looks like a year is more likely a year misplaced by the layout than a real volume
+_YEAR_RE = re.compile(r"(?:1[89]|20)\d{2}")
+
+
+# First DOI found in a text, without trailing punctuation, or an empty string
+def find_doi(text: str) -> str:
+    match = _DOI_RE.search(text)
+    return match.group(0).rstrip(_DOI_TRAILING) if match else ""
+
+
+# Entities of a reference in the format of the NER stage (see _process_ner_results in references_matching),
+# with a confidence: 1.0 when the reference follows one of the supported layouts with a plausible title, year,
+# journal (not a book or proceedings) and volume (not a year),
+# RULES_AMBIGUOUS_CONFIDENCE when it does but the title could end at an earlier sentence break,
+# 0.5 when only a DOI or a year could be found, 0.0 otherwise
+def extract_rule_entities(text: str) -> Tuple[Dict[str, List[str]], float]:
+    entities: Dict[str, List[str]] = {
+        'TITLE': [],
+        'AUTHORS': [],
+        'VOLUME': [],
+        'ISSUE': [],
+        'PUBLICATION_YEAR': [],
+        'DOI': [],
+        'ISSN': [],
+        'ISBN': [],
+        'PAGE_FIRST': [],
+        'PAGE_LAST': [],
+        'JOURNAL': [],
+        'EDITOR': []
+    }
+    text = " ".join(text.split())
+    doi = find_doi(text)
+    if doi:
+        entities['DOI'] = [doi]
+
+    for layout in _LAYOUTS:
+        match = layout.match(text)
+        if match is None:
+            continue
+        title = match.group('title').rstrip('.').strip()
+        year = match.group('year')
+        journal = match.group('journal').strip()
+        if (
+            len(title.split()) < RULES_MIN_TITLE_WORDS
+            or int(year) > time.localtime().tm_year + 1
+            or _NON_JOURNAL_RE.search(journal)
+            or _YEAR_RE.fullmatch(match.group('volume'))
+        ):
+            break
+        entities['TITLE'] = [title]
+        entities['AUTHORS'] = [match.group('authors').strip().rstrip(',')]
+        entities['PUBLICATION_YEAR'] = [year]
+        entities['JOURNAL'] = [journal]
+        entities['VOLUME'] = [match.group('volume')]
+        for group, label in (('issue', 'ISSUE'), ('page_first', 'PAGE_FIRST'), ('page_last', 'PAGE_LAST')):
+            if match.group(group):
+                entities[label] = [match.group(group).strip()]
+        return entities, RULES_AMBIGUOUS_CONFIDENCE if _SENTENCE_BREAK_RE.search(title) else 1.0
+
+    year = re.search(r"\b(?:1[89]|20)\d{2}\b", text)
+    if year:
+        entities['PUBLICATION_YEAR'] = [year.group(0)]
+    return entities, 0.5 if doi or year else 0.0
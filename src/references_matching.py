@@ -4,200 +4,423 @@
 import pandas as pd
 import re
 from thefuzz import fuzz
-from typing import List, Dict, Tuple, Any
+from thefuzz import utils as thefuzz_utils
+from rapidfuzz import fuzz as rapidfuzz_fuzz, process
+import numpy as np
+from typing import List, Dict, Tuple, Any, Optional, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import itertools
+import importlib.metadata
 import importlib.util
+import json
+import os
+import threading
+from src.orcid_data import normalize_doi
+from src.ner_cache import get_ner_cache
+from src.ner_workers import NERWorkerPool, get_ner_worker_pool
+from src.disk_cache import CACHE_DIR
+from src.reference_rules import RULES_MIN_CONFIDENCE, extract_rule_entities
+from src.openalex_data import get_openalex_data, resolve_openalex_dois
+
+# Citation parser model from SIRIS lab used by the transformers-based extraction
+NER_MODEL = "SIRIS-Lab/citation-parser-ENTITY"
+
+# Number of references sent to the NER model at once
+NER_BATCH_SIZE = 16
+
+# Inference backend of the citation parser model, see get_ner_pipeline. Can be changed with the
+# ORCID_TOOLBOX_NER_BACKEND environment variable; the cheaper backends help on CPU-only servers.
+NER_INFERENCE_BACKENDS = ("transformers", "quantized", "onnx")
+NER_INFERENCE_BACKEND = os.environ.get("ORCID_TOOLBOX_NER_BACKEND", "transformers") or "transformers"
+
+# Extraction mode, can be changed with the ORCID_TOOLBOX_EXTRACTION_MODE environment variable:
+# "ner" runs every reference through the NER model, "tiered" first tries the rule-based extractor of
+# src/reference_rules.py and only runs the model on the references it cannot parse reliably
+NER_EXTRACTION_MODES = ("ner", "tiered")
+NER_EXTRACTION_MODE = os.environ.get("ORCID_TOOLBOX_EXTRACTION_MODE", "ner") or "ner"
+
+# Version of the post-processing in _process_ner_results, part of the NER cache key: bump it when the output changes
+NER_PROCESSING_VERSION = 1
+
+# Scoring engines of match_references_to_orcid, and number of references scored at once by the cdist engine
+MATCH_ENGINES = ("loop", "cdist")
+MATCH_CDIST_CHUNK = 256
+
+# Maximum number of OpenAlex title searches in flight at once in iter_openalex_candidates
+# (all requests also go through the OpenAlex rate limiter)
+OPENALEX_CANDIDATE_WORKERS = 8
+
+
+# One line of a bibliography: optional reference number ([1], (1), 1), 1. etc.) followed by the reference text,
+# without the surrounding whitespace. The content group is missing on blank lines.
+_REF_LINE_RE = re.compile(r"^[^\S\n]*(?:[\[\(]?(?P<number>\d+)[\]\)\.][^\S\n]*(?=\S))?(?P<content>\S(?:[^\n]*\S)?)?[^\S\n]*$", re.MULTILINE)
+
+# Process-wide registry of loaded NER pipelines, keyed by model name and inference backend.
+# Streamlit serves every session and rerun from the same process, so a model loaded here stays warm for all of them.
+_ner_pipelines: Dict[Tuple[str, str], Any] = {}
+_ner_pipelines_lock = threading.Lock()
+
+# Process-wide ReferencesTractor instance, see get_references_tractor()
+_references_tractor: Any = None
+_references_tractor_lock = threading.Lock()
+_references_tractor_batch_lock = threading.Lock()
+
+# Split an iterable into lists of up to size items
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 
 # Extract individual references from large text block
 def extract_references_from_text(text: str) -> List[Dict]:
-    references = []
-    
-    # Common patterns: [1], (1), 1., etc. at start of line
-    lines = text.split('\n')
-    current_ref = []
+    return list(iter_references_from_text(text))
+
+
+# Reference text made of its lines (stripped and joined with spaces), with the offsets of its first and last
+# characters in the source text: text[start:end] is the whole reference, as written in the source
+def _split_reference(pieces: List[str], ref_number: int, start: int, end: int) -> Dict:
+    return {
+        'text': ' '.join(pieces),
+        'ref_number': ref_number,
+        'start': start,
+        'end': end
+    }
+
+
+# Yield the individual references of a large text block one at a time, in a single pass over its lines.
+# A reference starts with a numbered line ([1], (1), 1. etc.) or after a blank line, and continues on the
+# following lines. Numbered references keep their number, the others are numbered after the previous reference.
+def iter_references_from_text(text: str) -> Iterator[Dict]:
+    pieces: List[str] = []
     ref_number = 0
-    
-    for line in lines:
-        stripped_line = line.strip()
-        
+    ref_start = ref_end = 0
+
+    for line in _REF_LINE_RE.finditer(text):
+        content = line.group('content')
+
         # Blank line separates references
-        if not stripped_line:
-            if current_ref:
-                # Save current reference
-                ref_text = ' '.join(current_ref)
-                ref_number += 1
-                references.append({
-                    'text': ref_text,
-                    'ref_number': ref_number,
-                    'start': 0,
-                    'end': len(ref_text)
-                })
-                current_ref = []
+        if content is None:
+            if pieces:
+                yield _split_reference(pieces, ref_number, ref_start, ref_end)
+                pieces = []
             continue
-            
-        # Check if line starts with a reference number
-        match = re.match(r'^[\[\(]?(\d+)[\]\)\.]\s*(.+)', stripped_line)
-        if match:
-            # Save previous reference if exists
-            if current_ref:
-                ref_text = ' '.join(current_ref)
-                references.append({
-                    'text': ref_text,
-                    'ref_number': ref_number,
-                    'start': 0,
-                    'end': len(ref_text)
-                })
-            # Start new reference
-            ref_number = int(match.group(1))
-            current_ref = [match.group(2)]
-        elif current_ref:
+
+        number = line.group('number')
+        if number is not None:
+            # Save previous reference if exists, then start a new one after the number
+            if pieces:
+                yield _split_reference(pieces, ref_number, ref_start, ref_end)
+            ref_number = int(number)
+            ref_start = line.start('content')
+            pieces = [content]
+        elif pieces:
             # Continue current reference
-            current_ref.append(stripped_line)
+            pieces.append(content)
         else:
             # Start a new reference without numbering
             ref_number += 1
-            current_ref = [stripped_line]
-    
+            ref_start = line.start('content')
+            pieces = [content]
+        ref_end = line.end('content')
+
     # Add last reference
-    if current_ref:
-        ref_text = ' '.join(current_ref)
-        references.append({
-            'text': ref_text,
-            'ref_number': ref_number,
-            'start': 0,
-            'end': len(ref_text)
-        })
-    
-    return references
+    if pieces:
+        yield _split_reference(pieces, ref_number, ref_start, ref_end)
+
+
+# Return the NER pipeline for the given model and inference backend, loading it only the first time it is requested in this process
+def get_ner_pipeline(model: str = NER_MODEL, backend: Optional[str] = None) -> Any:
+    backend = backend or NER_INFERENCE_BACKEND
+    citation_parser = _ner_pipelines.get((model, backend))
+    if citation_parser is None:
+        with _ner_pipelines_lock:
+            # Another thread may have loaded the model while we were waiting for the lock
+            citation_parser = _ner_pipelines.get((model, backend))
+            if citation_parser is None:
+                citation_parser = _load_ner_pipeline(model, backend)
+                _ner_pipelines[(model, backend)] = citation_parser
+    return citation_parser
+
+
+# Build the NER pipeline of a model with one of the NER_INFERENCE_BACKENDS:
+# - transformers: the full-precision torch model
+# - quantized: the torch model with its linear layers dynamically quantized to int8
+# - onnx: the model exported to ONNX and run by ONNX Runtime (needs optimum[onnxruntime]); the export is
+#   kept in the app cache directory so that it only happens once
+# All of them give the same raw output format, post-processed by _process_ner_results.
+def _load_ner_pipeline(model: str, backend: str) -> Any:
+    if backend not in NER_INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown NER inference backend '{backend}', expected one of {', '.join(NER_INFERENCE_BACKENDS)}")
 
-# Run individual references through NER model and process entities
-# Inspired by https://github.com/sirisacademic/references-tractor
-def extract_ner_entities(text: str) -> Dict[str, List[str]]:
     # Lazy imports to avoid loading models before they are needed
     from transformers import pipeline
+    if backend == "transformers":
+        return pipeline("ner", model=model, aggregation_strategy="simple")
 
-    # Load the citation parser model from SIRIS lab
-    citation_parser = pipeline("ner", model="SIRIS-Lab/citation-parser-ENTITY", aggregation_strategy="simple")
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(model)
+    if backend == "quantized":
+        import torch
+        from transformers import AutoModelForTokenClassification
+        torch_model = AutoModelForTokenClassification.from_pretrained(model)
+        torch_model = torch.ao.quantization.quantize_dynamic(torch_model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("ner", model=torch_model, tokenizer=tokenizer, aggregation_strategy="simple")
 
-    try:
-        # Run NER pipeline
-        raw_results = citation_parser(text)
+    from optimum.onnxruntime import ORTModelForTokenClassification
+    export_dir = os.path.join(CACHE_DIR, "onnx", model.replace("/", "--")) if CACHE_DIR else None
+    if export_dir and os.path.isfile(os.path.join(export_dir, "model.onnx")):
+        ort_model = ORTModelForTokenClassification.from_pretrained(export_dir)
+    else:
+        ort_model = ORTModelForTokenClassification.from_pretrained(model, export=True)
+        if export_dir:
+            ort_model.save_pretrained(export_dir)
+    return pipeline("ner", model=ort_model, tokenizer=tokenizer, aggregation_strategy="simple")
 
-        # Init result structure
-        entities = {
-            'TITLE': [],
-            'AUTHORS': [],
-            'VOLUME': [],
-            'ISSUE': [],
-            'PUBLICATION_YEAR': [],
-            'DOI': [],
-            'ISSN': [],
-            'ISBN': [],
-            'PAGE_FIRST': [],
-            'PAGE_LAST': [],
-            'JOURNAL': [],
-            'EDITOR': []
-        }
-
-        # STEP 1 — sort entities by start index
-        raw_results = sorted(raw_results, key=lambda x: x["start"])
-
-        merged = []
-        current = None
-
-        def flush():
-            nonlocal current, merged
-            if current:
-                merged.append(current)
-                current = None
-
-        for ent in raw_results:
-            group = ent["entity_group"]
-            word = ent["word"]
-            start = ent["start"]
-            end = ent["end"]
-
-            if current is None:
-                current = {
-                    "entity_group": group,
-                    "word": word,
-                    "start": start,
-                    "end": end,
-                    "score": ent["score"]
-                }
-                continue
 
-            # Check if mergeable:
-            same_group = (group == current["entity_group"])
-            touching = (start <= current["end"] + 1)
-
-            if same_group and touching and not group in ["VOLUME", "ISSUE"]:
-                # merge text
-                current["word"] += word
-                current["end"] = end
-                current["score"] = max(current["score"], ent["score"])
-            else:
-                flush()
-                current = {
-                    "entity_group": group,
-                    "word": word,
-                    "start": start,
-                    "end": end,
-                    "score": ent["score"]
-                }
-
-        flush()
-
-        # STEP 2 — convert into dict and populate entities
-        for ent in merged:
-            label = ent["entity_group"]
-            entity_text = ent["word"].strip()
-            if label in entities:
-                entities[label].append(entity_text)
-        
-        # STEP 3 — clean up special cases
-        # Merge DOI fragments and extract just the DOI identifier
-        if 'DOI' in entities and entities['DOI']:
-            if len(entities['DOI']) > 1:
-                # Join all DOI parts
-                merged_doi = ''.join(entities['DOI'])
-            else:
-                merged_doi = entities['DOI'][0]
-            
-            # Extract just the DOI identifier (e.g., 10.1037/cbs0000411)
-            # Remove URL prefixes and clean up
-            merged_doi = merged_doi.lstrip('.')
-            # Remove common URL prefixes
-            merged_doi = re.sub(r'^.*?://doi\.org/', '', merged_doi)
-            merged_doi = re.sub(r'^.*?://dx\.doi\.org/', '', merged_doi)
-            merged_doi = re.sub(r'^doi\.org/', '', merged_doi)
-            merged_doi = re.sub(r'^dx\.doi\.org/', '', merged_doi)
-            
-            # Keep only if it matches DOI pattern (10.xxxxx/...)
-            if merged_doi and re.match(r'10\.\d+/', merged_doi):
-                entities['DOI'] = [merged_doi]
-            else:
-                entities['DOI'] = []
+# Load the NER model used by extract_and_process_references ahead of time,
+# so that the first comparison does not pay the model loading cost
+# (in the NER worker processes too, if there are any)
+def warm_up_ner_models() -> None:
+    if importlib.util.find_spec("references_tractor"):
+        # Span extraction and prescreening always run in this process
+        get_references_tractor()
+        pool = get_ner_worker_pool("references_tractor")
+        if pool is not None:
+            pool.warm_up()
+    elif importlib.util.find_spec("transformers"):
+        pool = get_ner_worker_pool("transformers")
+        if pool is not None:
+            pool.warm_up()
+        else:
+            get_ner_pipeline()
+
+
+# Merge and clean the raw output of the NER pipeline for one reference into an entity dict
+# Inspired by https://github.com/sirisacademic/references-tractor
+def _process_ner_results(raw_results: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    # Init result structure
+    entities = {
+        'TITLE': [],
+        'AUTHORS': [],
+        'VOLUME': [],
+        'ISSUE': [],
+        'PUBLICATION_YEAR': [],
+        'DOI': [],
+        'ISSN': [],
+        'ISBN': [],
+        'PAGE_FIRST': [],
+        'PAGE_LAST': [],
+        'JOURNAL': [],
+        'EDITOR': []
+    }
+
+    # STEP 1 — sort entities by start index
+    raw_results = sorted(raw_results, key=lambda x: x["start"])
+
+    merged = []
+    current = None
+
+    def flush():
+        nonlocal current, merged
+        if current:
+            merged.append(current)
+            current = None
+
+    for ent in raw_results:
+        group = ent["entity_group"]
+        word = ent["word"]
+        start = ent["start"]
+        end = ent["end"]
+
+        if current is None:
+            current = {
+                "entity_group": group,
+                "word": word,
+                "start": start,
+                "end": end,
+                "score": ent["score"]
+            }
+            continue
+
+        # Check if mergeable:
+        same_group = (group == current["entity_group"])
+        touching = (start <= current["end"] + 1)
+
+        if same_group and touching and not group in ["VOLUME", "ISSUE"]:
+            # merge text
+            current["word"] += word
+            current["end"] = end
+            current["score"] = max(current["score"], ent["score"])
+        else:
+            flush()
+            current = {
+                "entity_group": group,
+                "word": word,
+                "start": start,
+                "end": end,
+                "score": ent["score"]
+            }
+
+    flush()
+
+    # STEP 2 — convert into dict and populate entities
+    for ent in merged:
+        label = ent["entity_group"]
+        entity_text = ent["word"].strip()
+        if label in entities:
+            entities[label].append(entity_text)
+    
+    # STEP 3 — clean up special cases
+    # Merge DOI fragments and extract just the DOI identifier
+    if 'DOI' in entities and entities['DOI']:
+        if len(entities['DOI']) > 1:
+            # Join all DOI parts
+            merged_doi = ''.join(entities['DOI'])
+        else:
+            merged_doi = entities['DOI'][0]
         
-        # Split VOLUME and ISSUE if both are detected together
-        if 'VOLUME' in entities and len(entities['VOLUME']) == 2:
-            entities['ISSUE'] = [entities['VOLUME'][1]]
-            entities['VOLUME'] = [entities['VOLUME'][0]]
+        # Extract just the DOI identifier (e.g., 10.1037/cbs0000411)
+        # Remove URL prefixes and clean up
+        merged_doi = merged_doi.lstrip('.')
+        # Remove common URL prefixes
+        merged_doi = re.sub(r'^.*?://doi\.org/', '', merged_doi)
+        merged_doi = re.sub(r'^.*?://dx\.doi\.org/', '', merged_doi)
+        merged_doi = re.sub(r'^doi\.org/', '', merged_doi)
+        merged_doi = re.sub(r'^dx\.doi\.org/', '', merged_doi)
         
-        # Remove hyphens from page numbers
-        if 'PAGE_FIRST' in entities and entities['PAGE_FIRST']:
-            entities['PAGE_FIRST'] = [p.strip('-') for p in entities['PAGE_FIRST']]
-        if 'PAGE_LAST' in entities and entities['PAGE_LAST']:
-            entities['PAGE_LAST'] = [p.strip('-') for p in entities['PAGE_LAST']]
-
-        return entities
+        # Keep only if it matches DOI pattern (10.xxxxx/...)
+        if merged_doi and re.match(r'10\.\d+/', merged_doi):
+            entities['DOI'] = [merged_doi]
+        else:
+            entities['DOI'] = []
     
+    # Split VOLUME and ISSUE if both are detected together
+    if 'VOLUME' in entities and len(entities['VOLUME']) == 2:
+        entities['ISSUE'] = [entities['VOLUME'][1]]
+        entities['VOLUME'] = [entities['VOLUME'][0]]
+    
+    # Remove hyphens from page numbers
+    if 'PAGE_FIRST' in entities and entities['PAGE_FIRST']:
+        entities['PAGE_FIRST'] = [p.strip('-') for p in entities['PAGE_FIRST']]
+    if 'PAGE_LAST' in entities and entities['PAGE_LAST']:
+        entities['PAGE_LAST'] = [p.strip('-') for p in entities['PAGE_LAST']]
+
+    return entities
+
+
+# Run individual references through NER model and process entities
+# backend is one of NER_INFERENCE_BACKENDS, NER_INFERENCE_BACKEND by default
+def extract_ner_entities(text: str, backend: Optional[str] = None) -> Dict[str, List[str]]:
+    # Reuse the citation parser model from SIRIS lab loaded for this process
+    citation_parser = get_ner_pipeline(backend=backend)
+
+    try:
+        # Run NER pipeline
+        raw_results = citation_parser(text)
+        return _process_ner_results(raw_results)
+
     except Exception as e:
         print(f"Error during NER extraction: {e}")
         return {}
 
 
+# Run a list of references through the NER model in batches and process entities.
+# The pipeline tokenizes and pads each batch together, which is much faster than one reference at a time on CPU.
+# Returns one entity dict per input text, in the same order.
+def extract_ner_entities_batch(texts: List[str], batch_size: int = NER_BATCH_SIZE, backend: Optional[str] = None) -> List[Dict[str, List[str]]]:
+    if not texts:
+        return []
+
+    citation_parser = get_ner_pipeline(backend=backend)
+
+    try:
+        raw_batches = citation_parser(list(texts), batch_size=batch_size)
+    except Exception as e:
+        # Fall back to one reference at a time so a single bad reference does not fail the whole batch
+        print(f"Error during batched NER extraction, retrying one reference at a time: {e}")
+        return [extract_ner_entities(text, backend) for text in texts]
+
+    results = []
+    for raw_results in raw_batches:
+        try:
+            results.append(_process_ner_results(raw_results))
+        except Exception as e:
+            print(f"Error during NER extraction: {e}")
+            results.append({})
+    return results
+
+
+# Id of the model behind extract_transformer, used in NER cache keys:
+# model name, revision, inference backend and post-processing version
+def _transformers_model_id(backend: Optional[str] = None) -> str:
+    backend = backend or NER_INFERENCE_BACKEND
+    config = getattr(getattr(get_ner_pipeline(backend=backend), "model", None), "config", None)
+    revision = getattr(config, "_commit_hash", None) or "unknown"
+    return f"{NER_MODEL}@{revision}/{backend}/{NER_PROCESSING_VERSION}"
+
+
+# Entity dicts of a batch of references, computed by the NER worker processes if there is a pool,
+# otherwise (or if the pool fails) by extract_locally in this process
+def _run_ner_batch(texts: List[str], batch_size: int, pool: Optional[NERWorkerPool], extract_locally) -> List[Dict[str, List[str]]]:
+    if pool is not None:
+        try:
+            return pool.extract(texts, batch_size)
+        except Exception as e:
+            print(f"Error in the NER worker pool, extracting in the app process: {e}")
+    return extract_locally(texts)
+
+
+# NER stage shared by both extraction backends: set the entities of each reference and yield it as soon as its
+# batch has been processed. In tiered mode, references parsed reliably by extract_rule_entities skip the model.
+# The others are served from the NER cache when the same model (get_model_id) already processed them, or sent to the
+# model with extract_locally, or to the NER worker processes if there are any (batch_size references per worker).
+# The path taken by each reference is stored in ref['extraction']: 'rules' or 'ner'.
+# If ner_counts is given, the NER cache hits and misses of these references are added to it (see NERCache.get_or_compute).
+def _iter_ner_stage(refs: Iterable[Dict], batch_size: int, pool: Optional[NERWorkerPool], get_model_id, extract_locally, ner_counts: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    ner_cache = get_ner_cache()
+    model_id = None
+    for batch in _batched(refs, batch_size * (pool.workers if pool else 1)):
+        model_refs = []
+        for ref in batch:
+            if NER_EXTRACTION_MODE == "tiered":
+                entities, confidence = extract_rule_entities(ref["text"])
+                if confidence >= RULES_MIN_CONFIDENCE:
+                    ref['ner'] = entities
+                    ref['extraction'] = 'rules'
+                    continue
+            model_refs.append(ref)
+
+        if model_refs:
+            if model_id is None:
+                model_id = get_model_id()
+            batch_ner = ner_cache.get_or_compute(
+                [ref["text"] for ref in model_refs], model_id,
+                lambda texts: _run_ner_batch(texts, batch_size, pool, extract_locally),
+                ner_counts)
+            for ref, ref_ner in zip(model_refs, batch_ner):
+                ref['ner'] = ref_ner
+                ref['extraction'] = 'ner'
+        yield from batch
+
+
+# NER stage of the transformers-based extraction, see _iter_ner_stage
+def _iter_transformer_ner(refs: Iterable[Dict], batch_size: int = NER_BATCH_SIZE, ner_counts: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    pool = get_ner_worker_pool("transformers")
+    return _iter_ner_stage(
+        refs, batch_size, pool,
+        lambda: pool.model_id() if pool else _transformers_model_id(),
+        lambda texts: extract_ner_entities_batch(texts, batch_size),
+        ner_counts)
+
+
 # Main function to extract and process references
-def extract_transformer(text: str, progress_callback=None) -> Tuple[List[Dict], List[Dict]]:
+# References are sent to the NER model batch_size at a time, progress is reported after each batch.
+def extract_transformer(text: str, progress_callback=None, batch_size: int = NER_BATCH_SIZE) -> Tuple[List[Dict], List[Dict]]:
 
     screened_refs = extract_references_from_text(text)
     invalid_refs = []
@@ -205,26 +428,120 @@ def extract_transformer(text: str, progress_callback=None) -> Tuple[List[Dict],
 
     for i, ref in enumerate(screened_refs):
         ref['ref_number'] = i
-        ref_text = ref["text"]
-        ref_ner = extract_ner_entities(ref_text)
-        ref['ner'] = ref_ner
-        
+
+    for done, ref in enumerate(_iter_transformer_ner(screened_refs, batch_size), start=1):
         # Report progress if callback is provided
-        if progress_callback:
-            progress_callback(i + 1, total_refs)
+        if progress_callback and (done % batch_size == 0 or done == total_refs):
+            progress_callback(done, total_refs)
     
     return screened_refs, invalid_refs
 
 
-def extract_references_tractor(text: str, progress_callback=None) -> Tuple[List[Dict], List[Dict]]:
+# Return the ReferencesTractor instance shared by this process, creating it on first use.
+# Creating it loads the span, prescreening and NER pipelines, so it should only happen once.
+def get_references_tractor() -> Any:
+    global _references_tractor
+    if _references_tractor is None:
+        with _references_tractor_lock:
+            if _references_tractor is None:
+                # Lazy imports to avoid loading nltk at module import time
+                from references_tractor import ReferencesTractor
+                ref_tractor = ReferencesTractor()
+                if hasattr(ref_tractor, "ner_pipeline") and callable(getattr(ref_tractor, "process_ner_entities", None)):
+                    ref_tractor.ner_pipeline = _PrecomputedNERPipeline(ref_tractor.ner_pipeline)
+                else:
+                    print(f"{_references_tractor_model_id()} has no ner_pipeline or process_ner_entities, "
+                          "batched NER disabled: references are run one at a time")
+                _references_tractor = ref_tractor
+    return _references_tractor
+
+
+# Wraps the NER pipeline of a ReferencesTractor so that process_ner_entities can be served
+# raw results computed ahead of time for a whole batch of references.
+# Texts that were not precomputed go through the wrapped pipeline as usual.
+# This relies on internals of references-tractor (the ner_pipeline attribute, and process_ner_entities calling it
+# once with the unchanged reference text), which it does not publish releases for. When a batch shows that
+# process_ner_entities does not use the precomputed results, batching is disabled with a message, so that
+# the references are not run twice.
+class _PrecomputedNERPipeline:
+    def __init__(self, pipeline: Any):
+        self.pipeline = pipeline
+        self.precomputed: Dict[str, Any] = {}
+        self.enabled = True
+        self.used = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pipeline, name)
+
+    def __call__(self, text: Any, *args, **kwargs) -> Any:
+        if isinstance(text, str) and text in self.precomputed:
+            self.used += 1
+            return self.precomputed[text]
+        return self.pipeline(text, *args, **kwargs)
+
+    def precompute(self, texts: List[str], batch_size: int) -> None:
+        self.precomputed = dict(zip(texts, self.pipeline(list(texts), batch_size=batch_size)))
+        self.used = 0
+
+    # Disable batching if none of the precomputed results of the batch were used
+    def check(self) -> None:
+        if self.precomputed and not self.used:
+            self.enabled = False
+            print(f"{_references_tractor_model_id()} did not use the batched NER results, "
+                  "batched NER disabled: references are run one at a time")
+
+    def clear(self) -> None:
+        self.precomputed = {}
+
+
+# Run a list of references through the references-tractor NER stage in batches.
+# The raw NER output of each batch is computed in one pipeline call, then process_ner_entities
+# applies the references-tractor post-processing to each reference.
+def _process_ner_entities_batch(ref_tractor: Any, texts: List[str], batch_size: int = NER_BATCH_SIZE) -> List[Dict[str, List[str]]]:
+    ner_pipeline = getattr(ref_tractor, "ner_pipeline", None)
+    if not isinstance(ner_pipeline, _PrecomputedNERPipeline) or not ner_pipeline.enabled:
+        return [ref_tractor.process_ner_entities(text) for text in texts]
+
+    # The tractor instance is shared between sessions, only one batch can be precomputed at a time
+    with _references_tractor_batch_lock:
+        try:
+            ner_pipeline.precompute(texts, batch_size)
+        except Exception as e:
+            print(f"Error during batched NER extraction, retrying one reference at a time: {e}")
+            ner_pipeline.clear()
+        try:
+            results = [ref_tractor.process_ner_entities(text) for text in texts]
+            ner_pipeline.check()
+            return results
+        finally:
+            ner_pipeline.clear()
+
+
+# Id of the references-tractor NER stage, used in NER cache keys
+def _references_tractor_model_id() -> str:
+    try:
+        version = importlib.metadata.version("references_tractor")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return f"references_tractor=={version}"
+
+
+# NER stage of the references-tractor extraction, see _iter_ner_stage
+def _iter_references_tractor_ner(ref_tractor: Any, refs: Iterable[Dict], batch_size: int = NER_BATCH_SIZE, ner_counts: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    return _iter_ner_stage(
+        refs, batch_size, get_ner_worker_pool("references_tractor"),
+        _references_tractor_model_id,
+        lambda texts: _process_ner_entities_batch(ref_tractor, texts, batch_size),
+        ner_counts)
+
+
+# Span extraction and prescreening stages of references-tractor, which work on the whole text.
+# Returns the numbered screened references and the invalid ones.
+def _references_tractor_screen(ref_tractor: Any, text: str) -> Tuple[List[Dict], List[Dict]]:
     # Lazy imports to avoid loading nltk at module import time
-    from references_tractor import ReferencesTractor
     from references_tractor.utils.span import extract_references_and_mentions
     from references_tractor.utils.prescreening import prescreen_references
     
-    # Initialize References Tractor for reference extraction
-    ref_tractor = ReferencesTractor()
-    
     # Extract references and mentions
     extracted = extract_references_and_mentions(text, ref_tractor.span_pipeline)
     references = extracted["references"]
@@ -234,17 +551,23 @@ def extract_references_tractor(text: str, progress_callback=None) -> Tuple[List[
     screened_refs = prescreen_references(references, ref_tractor.prescreening_pipeline)
     invalid_refs = [r for r in references if r not in screened_refs]
     
-    total_refs = len(screened_refs)
-    # Add reference numbers and process NER
+    # Add reference numbers
     for i, ref in enumerate(screened_refs, start=1):
         ref['ref_number'] = i
-        ref_text = ref["text"]
-        ref_ner = ref_tractor.process_ner_entities(ref_text)
-        ref['ner'] = ref_ner
-        
+    return screened_refs, invalid_refs
+
+
+def extract_references_tractor(text: str, progress_callback=None, batch_size: int = NER_BATCH_SIZE) -> Tuple[List[Dict], List[Dict]]:
+    # Reuse the References Tractor instance loaded for this process
+    ref_tractor = get_references_tractor()
+    screened_refs, invalid_refs = _references_tractor_screen(ref_tractor, text)
+    total_refs = len(screened_refs)
+
+    # Process NER batch_size references at a time
+    for done, ref in enumerate(_iter_references_tractor_ner(ref_tractor, screened_refs, batch_size), start=1):
         # Report progress if callback is provided
-        if progress_callback:
-            progress_callback(i, total_refs)
+        if progress_callback and (done % batch_size == 0 or done == total_refs):
+            progress_callback(done, total_refs)
     
     return screened_refs, invalid_refs
 
@@ -258,6 +581,40 @@ def extract_and_process_references(text: str, progress_callback=None) -> Tuple[L
         raise ImportError("Erreur, une des bibliothèques nécessaires n'est pas installée. Veuillez installer 'references-tractor' ou 'transformers'.")
 
 
+# Streaming version of extract_and_process_references: yields each reference with its entities as soon as its
+# batch has been through the NER model, without keeping the whole list. With the transformers-based extraction,
+# the text is also split lazily; references-tractor splits and prescreens the whole text first.
+# If invalid_refs is given, the references rejected by prescreening are appended to it.
+# If ner_counts is given, the NER cache hits and misses of this text are added to its "hits" and "misses" entries.
+def iter_extract_and_process_references(text: str, batch_size: int = NER_BATCH_SIZE, invalid_refs: Optional[List[Dict]] = None, ner_counts: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    if importlib.util.find_spec("references_tractor"):
+        ref_tractor = get_references_tractor()
+        screened_refs, rejected_refs = _references_tractor_screen(ref_tractor, text)
+        if invalid_refs is not None:
+            invalid_refs.extend(rejected_refs)
+        yield from _iter_references_tractor_ner(ref_tractor, screened_refs, batch_size, ner_counts)
+    elif importlib.util.find_spec("transformers"):
+        # Same numbering as extract_transformer
+        refs = ({**ref, 'ref_number': i} for i, ref in enumerate(iter_references_from_text(text)))
+        yield from _iter_transformer_ner(refs, batch_size, ner_counts)
+    else:
+        raise ImportError("Erreur, une des bibliothèques nécessaires n'est pas installée. Veuillez installer 'references-tractor' ou 'transformers'.")
+
+
+# Normalized DOIs of an ORCID work: its main DOI and the DOIs found in all its external identifiers
+def _work_dois(row: pd.Series) -> List[str]:
+    dois = []
+    candidates = [row['doi']] if pd.notna(row['doi']) else []
+    external_ids = row.get('external-ids')
+    if isinstance(external_ids, list):
+        candidates += [e.get('doi') for e in external_ids if isinstance(e, dict)]
+    for candidate in candidates:
+        doi = normalize_doi(candidate)
+        if doi and doi not in dois:
+            dois.append(doi)
+    return dois
+
+
 def prepare_orcid_works(df: pd.DataFrame) -> List[Dict[str, str]]:
     orcid_works = []
     for idx, row in df.iterrows():
@@ -266,6 +623,7 @@ def prepare_orcid_works(df: pd.DataFrame) -> List[Dict[str, str]]:
             'year': str(row['publication-year']).strip() if pd.notna(row['publication-year']) else '',
             'journal': str(row['journal-title']).lower().strip() if pd.notna(row['journal-title']) else '',
             'doi': str(row['doi']).strip() if pd.notna(row['doi']) else '',
+            'dois': _work_dois(row),
             'original_title': str(row['title']) if pd.notna(row['title']) else 'Sans titre'
         })
     return orcid_works
@@ -279,6 +637,7 @@ def extract_reference_metadata(ref: Dict) -> Dict[str, str]:
         'journal': '',
         'number': ref.get('ref_number', 0),
         'doi': '',
+        'normalized_doi': '',
         'ner': ''
     }
     
@@ -304,6 +663,7 @@ def extract_reference_metadata(ref: Dict) -> Dict[str, str]:
     # Extract DOI
     if 'DOI' in ner and ner['DOI']:
         metadata['doi'] = ner['DOI'][0].strip()
+        metadata['normalized_doi'] = normalize_doi(metadata['doi'])
     
     return metadata
 
@@ -331,13 +691,15 @@ def calculate_match_score(ref_metadata: Dict[str, str], work: Dict[str, str]) ->
     if ref_metadata['journal'] and work['journal']:
         scores['journal'] = fuzz.partial_ratio(ref_metadata['journal'], work['journal'])
 
-    # Calculate DOI match (high weight when present)
-    if ref_metadata['doi'] and work['doi']:
-        scores['doi'] = 100 if ref_metadata['doi'].lower() == work['doi'].lower() else 0
+    # Calculate DOI match (high weight when present), against all the DOIs of the work
+    ref_doi = ref_metadata['normalized_doi'] if 'normalized_doi' in ref_metadata else normalize_doi(ref_metadata['doi'])
+    work_dois = work['dois'] if 'dois' in work else [normalize_doi(work['doi'])] if work['doi'] else []
+    if ref_doi and work_dois:
+        scores['doi'] = 100 if ref_doi in work_dois else 0
     
     # Dynamic weighted confidence score
     # When DOI is present, it gets 40% weight; otherwise distribute to other fields
-    if ref_metadata['doi'] and work['doi']:
+    if ref_doi and work_dois:
         confidence = (scores['title'] * 0.4 + scores['year'] * 0.1 + scores['journal'] * 0.1 + scores['doi'] * 0.4)
     else:
         confidence = (scores['title'] * 0.6 + scores['year'] * 0.2 + scores['journal'] * 0.2)
@@ -345,59 +707,193 @@ def calculate_match_score(ref_metadata: Dict[str, str], work: Dict[str, str]) ->
     return confidence, scores
 
 
-def match_references_to_orcid(
-    screened_refs: List[Dict],
-    orcid_works: List[Dict],
-    min_confidence: float = 70.0
-) -> Tuple[List[Dict], List[Dict]]:
-    matched_refs = []
-    unmatched_refs = []
+# Map each normalized DOI of the ORCID works (see prepare_orcid_works) to the indices of the works holding it
+def build_doi_index(orcid_works: List[Dict[str, str]]) -> Dict[str, List[int]]:
+    doi_index: Dict[str, List[int]] = {}
+    for i, work in enumerate(orcid_works):
+        if not work['title']:
+            continue
+        dois = work['dois'] if 'dois' in work else [normalize_doi(work['doi'])]
+        for doi in dois:
+            if doi:
+                doi_index.setdefault(doi, []).append(i)
+    return doi_index
+
+
+# Find the ORCID work with the highest confidence score for a reference.
+# Returns (best_match, best_confidence, best_scores), best_match being None if no work has a positive score.
+def _find_best_match(ref_metadata: Dict[str, str], orcid_works: List[Dict[str, str]]) -> Tuple[Dict[str, str] | None, float, Dict[str, float]]:
+    best_match = None
+    best_confidence = 0
+    best_scores = {'title': 0, 'year': 0, 'journal': 0, 'doi': 0}
     
-    for ref in screened_refs:
-        ref_metadata = extract_reference_metadata(ref)
-        
-        if not ref_metadata['title']:
+    for work in orcid_works:
+        if not work['title']:
             continue
         
-        # Find best match among ORCID works
-        best_match = None
-        best_confidence = 0
-        best_scores = {'title': 0, 'year': 0, 'journal': 0, 'doi': 0}
+        confidence, scores = calculate_match_score(ref_metadata, work)
         
-        for work in orcid_works:
-            if not work['title']:
+        if confidence > best_confidence:
+            best_confidence = confidence
+            best_match = work
+            best_scores = scores
+
+    return best_match, best_confidence, best_scores
+
+
+# Title processed as thefuzz.token_sort_ratio does (full_process, then words sorted)
+def _sorted_title(title: str) -> str:
+    return " ".join(sorted(thefuzz_utils.full_process(title, force_ascii=True).split()))
+
+
+# Work-side arrays used by _find_best_matches_cdist, computed once per list of works
+def _cdist_work_data(orcid_works: List[Dict[str, str]]) -> Dict[str, Any]:
+    # thefuzz.token_sort_ratio processes both strings (ASCII only, lowercase, alphanumeric), then compares them
+    # with their words sorted: sorting once per title and scoring with ratio gives the same scores
+    titles = [_sorted_title(work['title']) for work in orcid_works]
+    # Few distinct journals: score each pair of distinct names once
+    journals, journal_ids = np.unique(np.array([work['journal'] for work in orcid_works], dtype=object), return_inverse=True)
+    dois = [set(work['dois'] if 'dois' in work else [normalize_doi(work['doi'])] if work['doi'] else []) for work in orcid_works]
+    return {
+        'titles': titles,
+        'journals': journals,
+        'journal_ids': journal_ids,
+        'years': np.array([work['year'].strip() for work in orcid_works], dtype=object),
+        'dois': dois,
+        'has_title': np.array([bool(work['title']) for work in orcid_works]),
+        'has_journal': np.array([bool(work['journal']) for work in orcid_works]),
+        'has_year': np.array([bool(work['year']) for work in orcid_works]),
+        'has_doi': np.array([bool(work_dois) for work_dois in dois]),
+    }
+
+
+# Score a batch of references against all ORCID works at once with rapidfuzz.
+# The title and journal similarities of every reference/work pair are computed in one multi-threaded
+# cdist call each, with the same processing and rounding as thefuzz, then combined with the year and DOI
+# matrices using the weights of calculate_match_score. Returns one (best_match, best_confidence, best_scores)
+# tuple per reference, identical to what _find_best_match returns (restricted to the DOI hits, when there are any).
+def _find_best_matches_cdist(
+    refs_metadata: List[Dict[str, str]],
+    orcid_works: List[Dict[str, str]],
+    doi_index: Dict[str, List[int]],
+    work_data: Optional[Dict[str, Any]] = None
+) -> List[Tuple[Dict[str, str] | None, float, Dict[str, float]]]:
+    no_match = (None, 0, {'title': 0, 'year': 0, 'journal': 0, 'doi': 0})
+    if not refs_metadata:
+        return []
+    if not orcid_works:
+        return [no_match for _ in refs_metadata]
+
+    if work_data is None:
+        work_data = _cdist_work_data(orcid_works)
+    work_titles = work_data['titles']
+    work_journals = work_data['journals']
+    work_journal_ids = work_data['journal_ids']
+    work_years = work_data['years']
+    work_dois = work_data['dois']
+    has_title = work_data['has_title']
+    has_journal = work_data['has_journal']
+    has_year = work_data['has_year']
+    has_doi = work_data['has_doi']
+
+    results = []
+    for chunk_start in range(0, len(refs_metadata), MATCH_CDIST_CHUNK):
+        chunk = refs_metadata[chunk_start:chunk_start + MATCH_CDIST_CHUNK]
+        ref_titles = [_sorted_title(ref['title']) for ref in chunk]
+        titles = np.rint(process.cdist(ref_titles, work_titles, scorer=rapidfuzz_fuzz.ratio, dtype=np.float64, workers=-1))
+        titles[:, ~has_title] = 0
+
+        ref_journals, ref_journal_ids = np.unique(np.array([ref['journal'] for ref in chunk], dtype=object), return_inverse=True)
+        journal_scores = np.rint(process.cdist(ref_journals.tolist(), work_journals.tolist(), scorer=rapidfuzz_fuzz.partial_ratio, dtype=np.float64, workers=-1))
+        journals = journal_scores[np.ix_(ref_journal_ids, work_journal_ids)]
+        journals[np.array([not ref['journal'] for ref in chunk])] = 0
+        journals[:, ~has_journal] = 0
+
+        years = np.zeros_like(titles)
+        dois = np.zeros_like(titles)
+        with_doi = np.zeros(titles.shape, dtype=bool)
+        allowed = np.ones(titles.shape, dtype=bool)
+        for row, ref in enumerate(chunk):
+            if ref['year']:
+                years[row] = np.where(has_year & (work_years == ref['year'].strip()), 100, 0)
+            ref_doi = ref['normalized_doi'] if 'normalized_doi' in ref else normalize_doi(ref['doi'])
+            if ref_doi:
+                with_doi[row] = has_doi
+                dois[row] = [100 if ref_doi in work_doi else 0 for work_doi in work_dois]
+                doi_matches = doi_index.get(ref_doi)
+                if doi_matches:
+                    # Exact DOI hit: only the works holding this DOI are considered, as in match_references_to_orcid
+                    allowed[row] = False
+                    allowed[row, doi_matches] = True
+
+        # Dynamic weights, same expressions as calculate_match_score
+        confidence = np.where(
+            with_doi,
+            titles * 0.4 + years * 0.1 + journals * 0.1 + dois * 0.4,
+            titles * 0.6 + years * 0.2 + journals * 0.2,
+        )
+        confidence[:, ~has_title] = -1
+        confidence[~allowed] = -1
+
+        best = np.argmax(confidence, axis=1)
+        for row, column in enumerate(best.tolist()):
+            best_confidence = float(confidence[row, column])
+            if best_confidence <= 0:
+                results.append(no_match)
                 continue
-            
-            confidence, scores = calculate_match_score(ref_metadata, work)
-            
-            if confidence > best_confidence:
-                best_confidence = confidence
-                best_match = work
-                best_scores = scores
-        
-        # Store match if confidence exceeds threshold
-        if best_match and best_confidence >= min_confidence:
-            matched_refs.append({
-                'ref': ref,
-                'ref_ner': ref_metadata['ner'],
-                'ref_number': ref_metadata['number'],
-                'ref_title': ref_metadata['title'],
-                'ref_orig_title': ref_metadata['orig_title'],
-                'ref_year': ref_metadata['year'],
-                'ref_journal': ref_metadata['journal'],
-                'ref_doi': ref_metadata['doi'],
-                'orcid_title': best_match['original_title'],
-                'orcid_year': best_match['year'],
-                'orcid_journal': best_match['journal'],
-                'orcid_doi': best_match['doi'],
-                'confidence': best_confidence,
-                'title_score': best_scores['title'],
-                'year_score': best_scores['year'],
-                'journal_score': best_scores['journal'],
-                'doi_score': best_scores['doi']
-            })
+            results.append((orcid_works[column], best_confidence, {
+                'title': int(titles[row, column]),
+                'year': int(years[row, column]),
+                'journal': int(journals[row, column]),
+                'doi': int(dois[row, column]),
+            }))
+    return results
+
+
+# Stable hash of JSON-serializable data, e.g. an uploaded text, extracted references or prepared works
+def content_hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+# Finds the best ORCID work of each reference with a title, independently of any confidence threshold.
+# References whose DOI belongs to a work are resolved directly through a DOI index.
+# Otherwise every reference is scored against every work: one by one with engine="loop", or all at once by
+# _find_best_matches_cdist with engine="cdist" (same results, much faster on large inputs).
+# The indexes over the works are built once, so a scorer can score references in successive chunks.
+class ReferenceScorer:
+    def __init__(self, orcid_works: List[Dict], engine: str = "loop"):
+        if engine not in MATCH_ENGINES:
+            raise ValueError(f"Unknown matching engine '{engine}', expected one of {', '.join(MATCH_ENGINES)}")
+        self.orcid_works = orcid_works
+        self.engine = engine
+        self.doi_index = build_doi_index(orcid_works)
+        self.work_data = _cdist_work_data(orcid_works) if engine == "cdist" and orcid_works else None
+
+    # Returns one entry per reference with a title, with the reference metadata, the best work (empty fields if none)
+    # and the score breakdown. The result only depends on the references and works, so it can be cached and split
+    # with partition_matches.
+    def score(self, screened_refs: List[Dict]) -> List[Dict]:
+        orcid_works = self.orcid_works
+        refs_with_metadata = [(ref, extract_reference_metadata(ref)) for ref in screened_refs]
+        refs_with_metadata = [(ref, ref_metadata) for ref, ref_metadata in refs_with_metadata if ref_metadata['title']]
+
+        if self.engine == "cdist":
+            best_matches = _find_best_matches_cdist([ref_metadata for _, ref_metadata in refs_with_metadata], orcid_works, self.doi_index, self.work_data)
         else:
-            unmatched_refs.append({
+            best_matches = []
+            for ref, ref_metadata in refs_with_metadata:
+                # Find best match among the works with the same DOI, or among all ORCID works
+                doi_matches = self.doi_index.get(ref_metadata['normalized_doi']) if ref_metadata['normalized_doi'] else None
+                if doi_matches:
+                    # Exact DOI hit: title, year and journal are only scored to confirm it
+                    best_matches.append(_find_best_match(ref_metadata, [orcid_works[i] for i in doi_matches]))
+                else:
+                    best_matches.append(_find_best_match(ref_metadata, orcid_works))
+
+        scored_refs = []
+        for (ref, ref_metadata), (best_match, best_confidence, best_scores) in zip(refs_with_metadata, best_matches):
+            # A best match always has a positive confidence, references without one get 0
+            scored_refs.append({
                 'ref': ref,
                 'ref_ner': ref_metadata['ner'],
                 'ref_number': ref_metadata['number'],
@@ -416,5 +912,135 @@ def match_references_to_orcid(
                 'journal_score': best_scores['journal'],
                 'doi_score': best_scores['doi']
             })
-    
+        return scored_refs
+
+
+# Score a list of references against ORCID works, see ReferenceScorer
+def score_references(
+    screened_refs: List[Dict],
+    orcid_works: List[Dict],
+    engine: str = "loop"
+) -> List[Dict]:
+    return ReferenceScorer(orcid_works, engine=engine).score(screened_refs)
+
+
+# Streaming version of score_references: consumes references from any iterable (such as
+# iter_extract_and_process_references) and yields their scored entries chunk_size references at a time
+def iter_scored_references(
+    refs: Iterable[Dict],
+    orcid_works: List[Dict],
+    engine: str = "loop",
+    chunk_size: int = NER_BATCH_SIZE
+) -> Iterator[Dict]:
+    scorer = ReferenceScorer(orcid_works, engine=engine)
+    for chunk in _batched(refs, chunk_size):
+        yield from scorer.score(chunk)
+
+
+# Split the output of score_references into matched references (best match confidence >= min_confidence)
+# and unmatched ones, keeping their order
+def partition_matches(scored_refs: List[Dict], min_confidence: float = 70.0) -> Tuple[List[Dict], List[Dict]]:
+    matched_refs = []
+    unmatched_refs = []
+    for scored_ref in scored_refs:
+        if scored_ref['confidence'] > 0 and scored_ref['confidence'] >= min_confidence:
+            matched_refs.append(scored_ref)
+        else:
+            unmatched_refs.append(scored_ref)
     return matched_refs, unmatched_refs
+
+
+# Match references to ORCID works: score_references followed by partition_matches
+def match_references_to_orcid(
+    screened_refs: List[Dict],
+    orcid_works: List[Dict],
+    min_confidence: float = 70.0,
+    engine: str = "loop"
+) -> Tuple[List[Dict], List[Dict]]:
+    return partition_matches(score_references(screened_refs, orcid_works, engine=engine), min_confidence)
+
+
+# An OpenAlex work in the format of prepare_orcid_works, so that it can be scored with calculate_match_score
+def _openalex_work_as_orcid_work(work: Dict[str, Any]) -> Dict[str, Any]:
+    source = (work.get('primary_location') or {}).get('source') or {}
+    doi = normalize_doi(work.get('doi'))
+    return {
+        'title': (work.get('title') or '').lower().strip(),
+        'year': str(work['publication_year']) if work.get('publication_year') else '',
+        'journal': (source.get('display_name') or '').lower().strip(),
+        'doi': doi,
+        'dois': [doi] if doi else [],
+        'original_title': work.get('title') or 'Sans titre'
+    }
+
+
+# OpenAlex candidate of a reference: the main fields of the work, and its confidence as a match for the reference
+def _openalex_candidate(scored_ref: Dict, work: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not work:
+        return None
+    ref_metadata = {
+        'title': scored_ref['ref_title'],
+        'year': scored_ref['ref_year'],
+        'journal': scored_ref['ref_journal'],
+        'doi': scored_ref['ref_doi'],
+        'normalized_doi': normalize_doi(scored_ref['ref_doi'])
+    }
+    candidate = _openalex_work_as_orcid_work(work)
+    confidence, scores = calculate_match_score(ref_metadata, candidate)
+    source = (work.get('primary_location') or {}).get('source') or {}
+    return {
+        'id': work.get('id'),
+        'doi': candidate['doi'],
+        'title': candidate['original_title'],
+        'year': candidate['year'],
+        'journal': source.get('display_name') or '',
+        'type': work.get('type') or '',
+        'authors': [(authorship.get('author') or {}).get('display_name') for authorship in work.get('authorships') or []],
+        'confidence': confidence,
+        'scores': scores
+    }
+
+
+# Look up an OpenAlex work for each reference missing from ORCID, typically the unmatched references of
+# partition_matches, so that it can be proposed as a work to add to the profile.
+# References with a DOI are resolved in batches by DOI first; the others, and those whose DOI is not in OpenAlex,
+# by a title search in up to max_workers threads. The journal and year of the reference are not used as filters
+# but to score the candidate like an ORCID work (see calculate_match_score).
+# Every lookup goes through the OpenAlex cache. Yields a copy of each reference with an 'openalex' entry (None if
+# nothing was found) and an 'openalex_error' entry (None, or the message of the failed lookup), in order of completion.
+def iter_openalex_candidates(scored_refs: Iterable[Dict], max_workers: int = OPENALEX_CANDIDATE_WORKERS) -> Iterator[Dict]:
+    scored_refs = list(scored_refs)
+    works_by_doi: Dict[str, Optional[Dict[str, Any]]] = {}
+    doi_error = None
+    dois = [ref['ref_doi'] for ref in scored_refs if normalize_doi(ref['ref_doi'])]
+    if dois:
+        try:
+            works_by_doi = resolve_openalex_dois(dois)
+        except Exception as e:
+            doi_error = str(e)
+
+    searches = []
+    for ref in scored_refs:
+        work = works_by_doi.get(ref['ref_doi'])
+        if work is not None:
+            yield {**ref, 'openalex': _openalex_candidate(ref, work), 'openalex_error': None}
+        elif ref['ref_orig_title']:
+            searches.append(ref)
+        else:
+            yield {**ref, 'openalex': None, 'openalex_error': doi_error}
+
+    if not searches:
+        return
+    # When the caller stops iterating (e.g. a Streamlit rerun), the searches not started yet are cancelled
+    # and the generator returns without waiting for the ones in progress
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(searches))))
+    try:
+        futures = {executor.submit(get_openalex_data, title=ref['ref_orig_title']): ref for ref in searches}
+        for future in as_completed(futures):
+            ref = futures.pop(future)
+            try:
+                yield {**ref, 'openalex': _openalex_candidate(ref, future.result()), 'openalex_error': None}
+            except Exception as e:
+                yield {**ref, 'openalex': None, 'openalex_error': str(e)}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
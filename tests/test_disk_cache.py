@@ -0,0 +1,115 @@
+import time
+import pytest
+from src.disk_cache import DiskCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+def test_get_returns_stored_value_and_meta(cache_path):
+    cache = DiskCache(cache_path)
+    cache.set("key", {"title": "A work", "year": 2020}, meta={"etag": '"abc"'})
+    entry = cache.get("key")
+    assert entry["value"] == {"title": "A work", "year": 2020}
+    assert entry["meta"] == {"etag": '"abc"'}
+    assert entry["expires_at"] is None
+    assert not entry["expired"]
+    assert cache.get("missing") is None
+
+
+def test_ttl_expiry(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = DiskCache(cache_path)
+    cache.set("key", "value", ttl=60)
+    assert not cache.get("key")["expired"]
+    now[0] += 61
+    entry = cache.get("key")
+    # Expired entries are still returned, flagged, so that they can be revalidated
+    assert entry["expired"]
+    assert entry["value"] == "value"
+    cache.touch("key", ttl=60)
+    assert not cache.get("key")["expired"]
+
+
+def test_evicts_least_recently_used_entries(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = DiskCache(cache_path, max_entries=3)
+    for key in ("a", "b", "c"):
+        now[0] += 1
+        cache.set(key, key)
+    now[0] += 1
+    cache.get("a")
+    now[0] += 1
+    cache.set("d", "d")
+    assert cache.get("b") is None
+    assert [key for key in ("a", "c", "d") if cache.get(key) is not None] == ["a", "c", "d"]
+
+
+def test_evicts_by_size(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = DiskCache(cache_path)
+    cache.set("probe", "x")
+    size = cache.stats()["bytes"]
+    cache.clear()
+
+    cache = DiskCache(cache_path, max_bytes=size * 2)
+    for key in ("a", "b", "c"):
+        now[0] += 1
+        cache.set(key, "x")
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("c") is not None
+    assert cache.stats() == {"entries": 2, "bytes": size * 2}
+
+
+def test_running_totals_after_overwrite_and_delete(cache_path):
+    cache = DiskCache(cache_path)
+    cache.set("a", "x" * 10)
+    cache.set("b", "y" * 1000)
+    cache.set("a", "z" * 500)
+    cache.delete("b")
+    cache.delete("missing")
+    expected = (cache._count, cache._bytes)
+    # stats() counts the entries again from the database
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"]) == expected
+    assert stats["entries"] == 1
+
+    # A new instance starts from the totals of the file
+    reopened = DiskCache(cache_path)
+    assert (reopened._count, reopened._bytes) == expected
+    cache.clear()
+    assert (cache._count, cache._bytes) == (0, 0)
+    assert cache.stats() == {"entries": 0, "bytes": 0}
+
+
+def test_set_many_and_get_many(cache_path):
+    cache = DiskCache(cache_path, max_entries=100)
+    cache.set("a", "old")
+    cache.set_many({"a": "new", "b": [1, 2], "c": None}, ttl=60, meta={"source": "batch"})
+    entries = cache.get_many(["a", "b", "c", "missing"])
+    assert {key: entry["value"] for key, entry in entries.items()} == {"a": "new", "b": [1, 2], "c": None}
+    assert all(entry["meta"] == {"source": "batch"} and entry["expires_at"] is not None for entry in entries.values())
+    assert cache.stats()["entries"] == 3
+    assert (cache._count, cache._bytes) == tuple(cache.stats().values())
+    cache.set_many({})
+    assert cache.stats()["entries"] == 3
+
+
+def test_set_many_evicts_past_the_limits(cache_path):
+    cache = DiskCache(cache_path, max_entries=10)
+    cache.set_many({f"key{i}": i for i in range(25)})
+    assert cache.stats()["entries"] == 10
+    assert len(cache.get_many(f"key{i}" for i in range(25))) == 10
+
+
+def test_get_many_reads_more_keys_than_a_query_holds(cache_path):
+    cache = DiskCache(cache_path)
+    cache.set_many({f"key{i}": i for i in range(1200)})
+    entries = cache.get_many([f"key{i}" for i in range(1200)] + ["key0"])
+    assert len(entries) == 1200
+    assert entries["key1199"]["value"] == 1199
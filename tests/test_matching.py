@@ -0,0 +1,77 @@
+import pytest
+from src.orcid_data import parse_orcid_record
+from src.references_matching import partition_matches, prepare_orcid_works, score_references
+from benchmarks.synthetic import synth_orcid_record, synth_references
+
+
+def _ref(number, title=None, year=None, journal=None, doi=None):
+    return {
+        "text": f"Reference {number}",
+        "ref_number": number,
+        "ner": {
+            "TITLE": [title] if title is not None else [],
+            "PUBLICATION_YEAR": [year] if year else [],
+            "JOURNAL": [journal] if journal else [],
+            "DOI": [doi] if doi else [],
+        },
+    }
+
+
+@pytest.fixture(scope="module")
+def profile():
+    record = synth_orcid_record("0000-0000-0000-0000", works=300)
+    df, _ = parse_orcid_record(record)
+    orcid_works = prepare_orcid_works(df)
+    refs = synth_references(record, 150)
+    # A work without a title is never matched
+    orcid_works.append({**orcid_works[0], "title": "", "original_title": ""})
+    work = next(work for work in orcid_works if work["doi"])
+    refs += [
+        # No title, or a blank one: left out by both engines, even with the DOI of a work
+        _ref(1001, doi=work["doi"]),
+        _ref(1002, title="", year="2020", journal="Scientometrics"),
+        # DOI of a work, with an unrelated title: found through the DOI index
+        _ref(1003, title="An unrelated title", doi=f"https://doi.org/{work['doi'].upper()}"),
+        # DOI of no work
+        _ref(1004, title=work["original_title"], doi="10.9999/unknown"),
+        # Title only
+        _ref(1005, title=work["original_title"]),
+    ]
+    return refs, orcid_works
+
+
+def _comparable(scored_refs):
+    return [
+        (entry["ref_number"], entry["orcid_title"], entry["orcid_doi"], round(entry["confidence"], 6),
+         entry["title_score"], entry["year_score"], entry["journal_score"], entry["doi_score"])
+        for entry in scored_refs
+    ]
+
+
+def test_cdist_engine_matches_loop_engine(profile):
+    refs, orcid_works = profile
+    loop = score_references(refs, orcid_works, engine="loop")
+    cdist = score_references(refs, orcid_works, engine="cdist")
+    assert _comparable(cdist) == _comparable(loop)
+    for min_confidence in (50, 70, 90):
+        loop_matched, _ = partition_matches(loop, min_confidence)
+        cdist_matched, _ = partition_matches(cdist, min_confidence)
+        assert [entry["ref_number"] for entry in cdist_matched] == [entry["ref_number"] for entry in loop_matched]
+
+
+def test_edge_cases(profile):
+    refs, orcid_works = profile
+    scored = {entry["ref_number"]: entry for entry in score_references(refs, orcid_works, engine="cdist")}
+    assert 1001 not in scored and 1002 not in scored
+    work = next(work for work in orcid_works if work["doi"])
+    assert scored[1003]["orcid_doi"] == work["doi"]
+    assert scored[1003]["doi_score"] == 100
+    assert scored[1005]["orcid_title"] == work["original_title"]
+
+
+@pytest.mark.parametrize("engine", ["loop", "cdist"])
+def test_no_works(profile, engine):
+    refs, _ = profile
+    scored = score_references(refs[:10], [], engine=engine)
+    assert len(scored) == 10
+    assert all(entry["confidence"] == 0 and entry["orcid_title"] == "" for entry in scored)
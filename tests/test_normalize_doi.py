@@ -0,0 +1,29 @@
+import pytest
+from src.orcid_data import normalize_doi
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("10.1016/0010-0277(93)90060-3", "10.1016/0010-0277(93)90060-3"),
+    ("10.1016/0010-0277(93)90060-3)", "10.1016/0010-0277(93)90060-3"),
+    ("10.1016/0010-0277(93)90060-3).", "10.1016/0010-0277(93)90060-3"),
+    ("10.1002/(SICI)1097-4571(199806)49:8<693::AID-ASI4>3.0.CO;2-0", "10.1002/(sici)1097-4571(199806)49:8<693::aid-asi4>3.0.co;2-0"),
+    ("10.1234/abc(1)", "10.1234/abc(1)"),
+    ("10.1234/abc(1)),", "10.1234/abc(1)"),
+    ("10.1234/ABC.", "10.1234/abc"),
+    ("10.1234/abc];", "10.1234/abc"),
+    ("  10.1234/abc  ", "10.1234/abc"),
+    ("https://doi.org/10.1234/ABC", "10.1234/abc"),
+    ("http://dx.doi.org/10.1234/abc", "10.1234/abc"),
+    ("https://www.doi.org/10.1234/abc", "10.1234/abc"),
+    ("www.doi.org/10.1234/abc", "10.1234/abc"),
+    ("doi.org/10.1234/abc", "10.1234/abc"),
+    ("DOI: 10.1234/abc", "10.1234/abc"),
+    ("doi:10.1234/abc", "10.1234/abc"),
+])
+def test_normalize_doi(value, expected):
+    assert normalize_doi(value) == expected
+
+
+@pytest.mark.parametrize("value", [None, "", "   ", 42, "not a doi", "https://example.org/10.1234/abc", "10.abc/def"])
+def test_not_a_doi(value):
+    assert normalize_doi(value) == ""
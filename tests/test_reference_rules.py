@@ -0,0 +1,70 @@
+from src.reference_rules import RULES_MIN_CONFIDENCE, extract_rule_entities
+
+
+def test_apa_journal_article():
+    entities, confidence = extract_rule_entities(
+        "Grady, J. S., Her, M., Moreno, G., Perez, C., & Yelinek, J. (2019). Emotions in storybooks: A comparison of "
+        "storybooks that represent ethnic and racial groups in the United States. Psychology of Popular Media Culture, "
+        "8(3), 207–217. https://doi.org/10.1037/ppm0000185"
+    )
+    assert confidence >= RULES_MIN_CONFIDENCE
+    assert entities['TITLE'] == ["Emotions in storybooks: A comparison of storybooks that represent ethnic and racial groups in the United States"]
+    assert entities['JOURNAL'] == ["Psychology of Popular Media Culture"]
+    assert entities['PUBLICATION_YEAR'] == ["2019"]
+    assert entities['VOLUME'] == ["8"]
+    assert entities['ISSUE'] == ["3"]
+    assert entities['PAGE_FIRST'] == ["207"]
+    assert entities['PAGE_LAST'] == ["217"]
+    assert entities['DOI'] == ["10.1037/ppm0000185"]
+
+
+def test_vancouver_journal_article():
+    entities, confidence = extract_rule_entities(
+        "Bornmann L, Mutz R. Growth rates of modern science: a bibliometric analysis based on the number of "
+        "publications and cited references. J Assoc Inf Sci Technol. 2015;66(11):2215–22."
+    )
+    assert confidence >= RULES_MIN_CONFIDENCE
+    assert entities['JOURNAL'] == ["J Assoc Inf Sci Technol"]
+    assert entities['PUBLICATION_YEAR'] == ["2015"]
+    assert entities['VOLUME'] == ["66"]
+
+
+def test_subtitle_sentence_goes_to_ner():
+    for text in (
+        "Pope, J. P., & Wall, H. (2025). Is the goal intrinsic or extrinsic? Examining self-determination theory "
+        "researchers’ and the general publics’ perceptions of exercise goals. Canadian Journal of Behavioural "
+        "Science/Revue canadienne des sciences du comportement, 57(3), 239–248. https://doi.org/10.1037/cbs0000411",
+        "Lonigan CJ, Burgess SR, Anthony JL. Reading in the early years. A longitudinal study of phonological "
+        "sensitivity and early literacy skills. J Educ Psychol. 2020;112(3):412-29.",
+        "Smith, A. (2019). Reading in the early years of school. J. Educ. Psychol., 112(3), 401–415.",
+    ):
+        _, confidence = extract_rule_entities(text)
+        assert confidence < RULES_MIN_CONFIDENCE, text
+
+
+def test_proceedings_and_chapters_go_to_ner():
+    for text in (
+        "Smith, J., & Doe, A. (2020). Counting cats in the wild. In Proceedings of the Conference on Cats, 12, 45–67.",
+        "Smith J, Doe A. Counting cats in the wild. Proceedings of the Conference on Cats. 2020;12:45-67.",
+        "Smith, J. (2020). Counting cats in the wild. In Cat studies handbook, 3, 45–67.",
+    ):
+        _, confidence = extract_rule_entities(text)
+        assert confidence < RULES_MIN_CONFIDENCE, text
+
+
+def test_year_as_volume_goes_to_ner():
+    for text in (
+        "Smith, J. (2020). Counting cats in the wild. Journal of Cats, 2020, 45–67.",
+        "Smith J. Counting cats in the wild. J Cats. 2020;2019:45-67.",
+    ):
+        _, confidence = extract_rule_entities(text)
+        assert confidence < RULES_MIN_CONFIDENCE, text
+
+
+def test_unparsed_reference_keeps_doi_and_year():
+    entities, confidence = extract_rule_entities(
+        "Moed, H. F. (2005). Citation Analysis in Research Evaluation. Dordrecht: Springer. doi:10.1007/1-4020-3714-7"
+    )
+    assert confidence < RULES_MIN_CONFIDENCE
+    assert entities['DOI'] == ["10.1007/1-4020-3714-7"]
+    assert entities['PUBLICATION_YEAR'] == ["2005"]
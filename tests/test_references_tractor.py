@@ -0,0 +1,44 @@
+from src.references_matching import _PrecomputedNERPipeline, _process_ner_entities_batch
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=None):
+        self.calls.append(texts)
+        if isinstance(texts, list):
+            return [[{"entity_group": "TITLE", "word": text}] for text in texts]
+        return [{"entity_group": "TITLE", "word": texts}]
+
+
+# Stand-in for ReferencesTractor: process_ner_entities runs its NER pipeline on one reference
+class FakeTractor:
+    def __init__(self, preprocess=lambda text: text):
+        self.pipeline = FakePipeline()
+        self.ner_pipeline = _PrecomputedNERPipeline(self.pipeline)
+        self.preprocess = preprocess
+
+    def process_ner_entities(self, text):
+        return {"TITLE": [entity["word"] for entity in self.ner_pipeline(self.preprocess(text))]}
+
+
+def test_batched_results_are_used():
+    tractor = FakeTractor()
+    texts = ["first", "second", "third"]
+    assert _process_ner_entities_batch(tractor, texts) == [{"TITLE": [text]} for text in texts]
+    assert tractor.pipeline.calls == [texts]
+    assert tractor.ner_pipeline.enabled
+
+
+def test_batching_disabled_when_results_are_not_used(capsys):
+    # A version of references-tractor that changes the text before running the pipeline never hits the batch
+    tractor = FakeTractor(preprocess=str.upper)
+    assert _process_ner_entities_batch(tractor, ["first", "second"]) == [{"TITLE": ["FIRST"]}, {"TITLE": ["SECOND"]}]
+    assert not tractor.ner_pipeline.enabled
+    assert "batched NER disabled" in capsys.readouterr().out
+
+    # The next batches are not precomputed for nothing
+    tractor.pipeline.calls.clear()
+    assert _process_ner_entities_batch(tractor, ["third"]) == [{"TITLE": ["THIRD"]}]
+    assert tractor.pipeline.calls == ["THIRD"]
@@ -0,0 +1,86 @@
+import re
+
+import pytest
+from src.references_matching import extract_references_from_text, iter_references_from_text
+from benchmarks.synthetic import synth_bibliography
+
+
+# Frozen copy of the line-by-line splitter that the single-pass one replaced. It did not track offsets, and
+# bumped the number of a reference ending at a blank line, which the single-pass splitter no longer does.
+def legacy_split(text):
+    references = []
+    lines = text.split('\n')
+    current_ref = []
+    ref_number = 0
+    for line in lines:
+        stripped_line = line.strip()
+        if not stripped_line:
+            if current_ref:
+                ref_number += 1
+                references.append({'text': ' '.join(current_ref), 'ref_number': ref_number})
+                current_ref = []
+            continue
+        match = re.match(r'^[\[\(]?(\d+)[\]\)\.]\s*(.+)', stripped_line)
+        if match:
+            if current_ref:
+                references.append({'text': ' '.join(current_ref), 'ref_number': ref_number})
+            ref_number = int(match.group(1))
+            current_ref = [match.group(2)]
+        elif current_ref:
+            current_ref.append(stripped_line)
+        else:
+            ref_number += 1
+            current_ref = [stripped_line]
+    if current_ref:
+        references.append({'text': ' '.join(current_ref), 'ref_number': ref_number})
+    return references
+
+
+TEXTS = [
+    "",
+    "\n\n  \n",
+    "[1] First reference.\n[2] Second reference.",
+    "(1) First reference\n    wrapped on two lines.\n(2) Second reference.\n",
+    "1. First reference.\n2.Second reference without a space.\n\n3. Third after a blank line.",
+    "Unnumbered reference\nwrapped.\n\nAnother unnumbered one.\n\n\n",
+    "  [12] Indented, numbered from 12.\n\t[13] Tab-indented.\n   continuation  \n",
+    "Unnumbered first.\n[5] Then numbered.\n\nThen unnumbered again.",
+    "[1] Windows line endings.\r\n[2] Second one.\r\n\r\nThird one.\r\n",
+    "[1] 2020. A reference starting with a year.\n2020) Not a number prefix? It is one.",
+    "[1] Last reference without a trailing newline",
+]
+
+
+def _check(text):
+    refs = extract_references_from_text(text)
+    assert [ref['text'] for ref in refs] == [ref['text'] for ref in legacy_split(text)]
+    assert list(iter_references_from_text(text)) == refs
+    previous_end = 0
+    for ref in refs:
+        # The offsets span the whole reference as written in the text, which gives its text back line by line
+        assert previous_end <= ref['start'] < ref['end'] <= len(text)
+        source = text[ref['start']:ref['end']]
+        assert " ".join(line.strip() for line in source.split("\n") if line.strip()) == ref['text']
+        previous_end = ref['end']
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_legacy_splitter(text):
+    _check(text)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_legacy_splitter_on_synthetic_bibliography(seed):
+    _check(synth_bibliography(3000, seed=seed))
+
+
+def test_numbering():
+    text = "Unnumbered first.\n\n[5] Numbered.\nWrapped.\n\nUnnumbered after [5].\n\nAnd another.\n(1) Renumbered."
+    refs = extract_references_from_text(text)
+    assert [(ref['text'], ref['ref_number']) for ref in refs] == [
+        ("Unnumbered first.", 1),
+        ("Numbered. Wrapped.", 5),
+        ("Unnumbered after [5].", 6),
+        ("And another.", 7),
+        ("Renumbered.", 1),
+    ]